@@ -5,7 +5,9 @@ import json
 import pandas as pd
 import time
 from datetime import datetime
-from utils.file_manager import crear_directorios, guardar_log, cargar_log_existente
+from utils.file_manager import crear_directorios, guardar_log, cargar_log_existente, registrar_lote
+from utils.csv_loader import read_csv_robust
+from utils.skills_format import skills_to_json
 
 def generar_job_id(titulo, empresa, ubicacion, fecha):
     cadena = f"{titulo}_{empresa}_{ubicacion}_{fecha}"
@@ -95,7 +97,7 @@ def extraer_desde_coresignal(query, api_key, carrera):
         return
 
     # === Guardado ===
-    df = pd.DataFrame(trabajos_mapeados)
+    df = skills_to_json(pd.DataFrame(trabajos_mapeados))  # listas como JSON (ver skills_format.py)
 
     # Crear carpeta por carrera
     directorio = f"data/outputs/{fuente}/{carrera.replace(' ', '_')}"
@@ -103,11 +105,12 @@ def extraer_desde_coresignal(query, api_key, carrera):
     nombre_csv = f"{directorio}/{fuente}__{query.replace(' ', '_')}__{HOY}.csv"
 
     if os.path.exists(nombre_csv):
-        df_existente = pd.read_csv(nombre_csv)
+        df_existente = read_csv_robust(nombre_csv)
         df = pd.concat([df_existente, df], ignore_index=True)
         df.drop_duplicates(subset="job_id", inplace=True)
 
     df.to_csv(nombre_csv, index=False)
+    registrar_lote(fuente, carrera, HOY, nombre_csv, df)  # la unión diaria lo usa sin releer
     print(f"✅ Archivo guardado: {nombre_csv} ({len(df)} filas)")
 
     # Guardar log
@@ -4,7 +4,9 @@ import hashlib
 import json
 import pandas as pd
 from datetime import datetime
-from utils.file_manager import guardar_log, crear_directorios, cargar_log_existente
+from utils.file_manager import guardar_log, crear_directorios, cargar_log_existente, registrar_lote
+from utils.csv_loader import read_csv_robust
+from utils.skills_format import skills_to_json
 
 def generar_job_id(titulo, empresa, ubicacion, fecha):
     cadena = f"{titulo}_{empresa}_{ubicacion}_{fecha}"
@@ -80,7 +82,7 @@ def extraer_desde_jooble(query, api_key, carrera):
         return
 
     corpus = [normalizar(o, fuente, carrera, HOY) for o in ofertas_raw]
-    df = pd.DataFrame(corpus)
+    df = skills_to_json(pd.DataFrame(corpus))  # listas como JSON (ver skills_format.py)
 
     # === Crear carpeta por carrera ===
     directorio = f"data/outputs/{fuente}/{carrera.replace(' ', '_')}"
@@ -89,11 +91,12 @@ def extraer_desde_jooble(query, api_key, carrera):
 
     # === Si ya existe, unir y deduplicar ===
     if os.path.exists(nombre_csv):
-        df_existente = pd.read_csv(nombre_csv)
+        df_existente = read_csv_robust(nombre_csv)
         df = pd.concat([df_existente, df], ignore_index=True)
         df.drop_duplicates(subset="job_id", inplace=True)
 
     df.to_csv(nombre_csv, index=False)
+    registrar_lote(fuente, carrera, HOY, nombre_csv, df)  # la unión diaria lo usa sin releer
     print(f" Archivo actualizado: {nombre_csv} ({len(df)} filas totales)")
 
     # === Guardar log ===
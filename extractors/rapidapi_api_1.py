@@ -8,7 +8,10 @@ from utils.file_manager import (
     crear_directorios,
     guardar_log,
     cargar_log_existente,
+    registrar_lote,
 )
+from utils.csv_loader import read_csv_robust
+from utils.skills_format import skills_to_json
 
 def generar_job_id(titulo, empresa, ubicacion, fecha):
     cadena = f"{titulo}_{empresa}_{ubicacion}_{fecha}"
@@ -85,17 +88,18 @@ def extraer_desde_rapidapi_1(query, api_key, carrera):
         return
 
     corpus = [normalizar_oferta(job, fuente, carrera, HOY) for job in ofertas_raw]
-    df = pd.DataFrame(corpus)
+    df = skills_to_json(pd.DataFrame(corpus))  # listas como JSON (ver skills_format.py)
 
     directorio = f"data/outputs/{fuente}/{carrera.replace(' ', '_')}"
     os.makedirs(directorio, exist_ok=True)
     nombre_csv = f"{directorio}/{fuente}__{query.replace(' ', '_')}__{HOY}.csv"
 
     if os.path.exists(nombre_csv):
-        df_existente = pd.read_csv(nombre_csv)
+        df_existente = read_csv_robust(nombre_csv)
         df = pd.concat([df_existente, df], ignore_index=True).drop_duplicates(subset="job_id")
 
     df.to_csv(nombre_csv, index=False)
+    registrar_lote(fuente, carrera, HOY, nombre_csv, df)  # la unión diaria lo usa sin releer
     print(f"✅ Archivo guardado: {nombre_csv} ({len(df)} filas)")
 
     guardar_log(fuente, query, fecha=HOY, total=total, pagina=ultima_pagina)
@@ -5,7 +5,9 @@ import requests
 import hashlib
 import pandas as pd
 from datetime import datetime
-from utils.file_manager import guardar_log, crear_directorios, cargar_log_existente
+from utils.file_manager import guardar_log, crear_directorios, cargar_log_existente, registrar_lote
+from utils.csv_loader import read_csv_robust
+from utils.skills_format import skills_to_json
 
 # ===================== PARÁMETROS =====================
 PLAN_MAX_JOBS_PER_MONTH = 10_000
@@ -255,18 +257,19 @@ def extraer_desde_rapidapi_2(query, api_key, carrera, include_ai=False):
         print(" No se extrajeron nuevas ofertas de LinkedIn RapidAPI.")
         return
 
-    df = pd.DataFrame(all_results)
+    df = skills_to_json(pd.DataFrame(all_results))  # listas como JSON (ver skills_format.py)
 
     directorio = f"data/outputs/{fuente}/{carrera.replace(' ', '_')}"
     os.makedirs(directorio, exist_ok=True)
     nombre_csv = f"{directorio}/{fuente}__{query.replace(' ', '_')}__{HOY}.csv"
 
     if os.path.exists(nombre_csv):
-        df_existente = pd.read_csv(nombre_csv)
+        df_existente = read_csv_robust(nombre_csv)
         df = pd.concat([df_existente, df], ignore_index=True)
         df.drop_duplicates(subset="job_id", inplace=True)
 
     df.to_csv(nombre_csv, index=False)
+    registrar_lote(fuente, carrera, HOY, nombre_csv, df)  # la unión diaria lo usa sin releer
     print(f" Archivo actualizado: {nombre_csv} ({len(df)} filas totales)")
 
     # Guarda tu log como siempre (no toco firma)
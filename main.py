@@ -19,34 +19,6 @@ fecha_hoy = datetime.now().strftime("%Y-%m-%d")
 with open("config/platforms.yml", "r", encoding="utf-8") as f:
     config = yaml.safe_load(f)
 
-# === Mostrar plataformas disponibles habilitadas
-plataformas_disponibles = [k for k, v in config.items() if v.get("enabled")]
-print("Plataformas habilitadas:", ", ".join(plataformas_disponibles))
-
-seleccion = input(
-    " Escribe las plataformas a ejecutar (jooble,rapidapi1,rapidapi2,coresignal), "
-    "todas, ninguna, o 'unir' para solo unificar el corpus: "
-).strip().lower()
-
-# Nueva ruta: solo unir corpus acumulado por carrera y salir
-if seleccion in {"unir"}:
-    print("\n▶ Uniendo corpus acumulado por carrera en 'data/outputs/todas_las_plataformas' ...")
-    unir_corpus_acumulado_por_carrera()
-    print("\n Proceso de unión finalizado.")
-    exit()
-
-if seleccion == "ninguna":
-    print(" No se ejecutará ninguna plataforma.")
-    exit()
-
-if seleccion == "todas":
-    plataformas_seleccionadas = plataformas_disponibles
-else:
-    plataformas_seleccionadas = [p.strip() for p in seleccion.split(",") if p.strip() in plataformas_disponibles]
-    if not plataformas_seleccionadas:
-        print(" Ninguna plataforma válida fue seleccionada.")
-        exit()
-
 # === Función para ejecutar JOOBLE
 def ejecutar_jooble():
     api_key = config["jooble"]["api_key"]
@@ -149,16 +121,47 @@ def ejecutar_rapidapi_2():
         unir_corpus_por_carrera("rapidapi2", carrera, fecha_hoy)
         copiar_corpus_diario_a_global("rapidapi2", carrera, fecha_hoy)
 
-if "coresignal" in plataformas_seleccionadas:
-    ejecutar_coresignal()
+# === Selección y ejecución (solo como script: los procesos hijos de la unión
+# acumulada reimportan este módulo en Windows)
+if __name__ == "__main__":
+    # === Mostrar plataformas disponibles habilitadas
+    plataformas_disponibles = [k for k, v in config.items() if v.get("enabled")]
+    print("Plataformas habilitadas:", ", ".join(plataformas_disponibles))
+
+    seleccion = input(
+        " Escribe las plataformas a ejecutar (jooble,rapidapi1,rapidapi2,coresignal), "
+        "todas, ninguna, o 'unir' para solo unificar el corpus: "
+    ).strip().lower()
+
+    # Nueva ruta: solo unir corpus acumulado por carrera y salir
+    if seleccion in {"unir"}:
+        print("\n▶ Uniendo corpus acumulado por carrera en 'data/outputs/todas_las_plataformas' ...")
+        unir_corpus_acumulado_por_carrera()
+        print("\n Proceso de unión finalizado.")
+        exit()
+
+    if seleccion == "ninguna":
+        print(" No se ejecutará ninguna plataforma.")
+        exit()
+
+    if seleccion == "todas":
+        plataformas_seleccionadas = plataformas_disponibles
+    else:
+        plataformas_seleccionadas = [p.strip() for p in seleccion.split(",") if p.strip() in plataformas_disponibles]
+        if not plataformas_seleccionadas:
+            print(" Ninguna plataforma válida fue seleccionada.")
+            exit()
+
+    if "coresignal" in plataformas_seleccionadas:
+        ejecutar_coresignal()
 
-if "jooble" in plataformas_seleccionadas:
-    ejecutar_jooble()
+    if "jooble" in plataformas_seleccionadas:
+        ejecutar_jooble()
 
-if "rapidapi1" in plataformas_seleccionadas:
-    ejecutar_rapidapi_1()
+    if "rapidapi1" in plataformas_seleccionadas:
+        ejecutar_rapidapi_1()
 
-if "rapidapi2" in plataformas_seleccionadas:
-    ejecutar_rapidapi_2()
+    if "rapidapi2" in plataformas_seleccionadas:
+        ejecutar_rapidapi_2()
 
-print("\n Proceso finalizado.")
+    print("\n Proceso finalizado.")
@@ -0,0 +1,56 @@
+"""
+Configuración común de las pruebas: los scripts de utils se importan como módulos sueltos
+(igual que al ejecutarlos con 'python utils/<script>.py') y ninguna prueba toca la red ni
+la caché persistente del repositorio.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / "utils"
+if str(UTILS_DIR) not in sys.path:
+    sys.path.insert(0, str(UTILS_DIR))
+
+
+class FakeBackend:
+    """Backend de traducción local y determinista: devuelve el texto en mayúsculas."""
+    name = "fake"
+    remote = False
+    native_batch = False
+    batch_size = 1
+    calls: list = []           # textos recibidos (se reinicia en cada prueba)
+    fail_on: set = set()       # textos que fallan siempre
+    crash_after = None         # nº de llamadas tras el que se simula una caída (KeyboardInterrupt)
+
+    def __init__(self, src: str, tgt: str):
+        pass
+
+    def translate(self, text: str) -> str:
+        cls = type(self)
+        cls.calls.append(text)
+        if cls.crash_after is not None and len(cls.calls) > cls.crash_after:
+            raise KeyboardInterrupt("caída simulada")
+        if any(bad in text for bad in cls.fail_on):
+            raise RuntimeError("fallo simulado")
+        return text.upper()
+
+    def translate_batch(self, texts):
+        return [self.translate(t) for t in texts]
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Registra FakeBackend como 'fake' sin caché persistente ni esperas entre reintentos."""
+    import translation_backends
+    import translation_cache
+    import translation_batch
+
+    FakeBackend.calls = []
+    FakeBackend.fail_on = set()
+    FakeBackend.crash_after = None
+    monkeypatch.setitem(translation_backends.BACKENDS, "fake", FakeBackend)
+    monkeypatch.setattr(translation_backends, "_INSTANCES", {})
+    monkeypatch.setattr(translation_cache, "ENABLED", False)
+    monkeypatch.setattr(translation_batch, "RETRY_SLEEP_BASE", 0)
+    return FakeBackend
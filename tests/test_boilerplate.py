@@ -0,0 +1,68 @@
+"""Tabla de boilerplate (ver boilerplate.py): se aprende por bloques, se guarda y se reutiliza."""
+
+import pandas as pd
+import pytest
+
+import boilerplate
+import Traductor_Descripcion as td
+
+EEO = ("Somos una empresa que ofrece igualdad de oportunidades y valora la diversidad "
+       "de todas las personas candidatas.")
+
+
+def _corpus(base):
+    for carrera in ("Economía", "Software"):
+        cdir = base / carrera
+        cdir.mkdir(parents=True)
+        rows = [{"job_id": f"{carrera}-{i}", "job_title": f"Puesto {carrera} {i % 4}",
+                 "description": f"Buscamos analista {i} con experiencia en el área de {carrera}.\n{EEO}"}
+                for i in range(30)]
+        pd.DataFrame(rows).to_csv(cdir / f"{carrera}_Merged.csv", index=False)
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(boilerplate, "_TABLES", {})
+    monkeypatch.setattr(boilerplate, "CHUNK_ROWS", 7)      # varios bloques por archivo
+    _corpus(tmp_path)
+    return tmp_path
+
+
+def test_tabla_por_bloques_se_guarda_y_se_reutiliza(corpus, monkeypatch):
+    frames = [pd.read_csv(p) for p in sorted(corpus.glob("*/*_Merged.csv"))]
+    esperada = boilerplate.learn_table(pd.concat(frames, ignore_index=True), "description")
+
+    tabla = boilerplate.get_table("description", corpus_dir=corpus)
+    assert tabla == set(esperada.index[esperada >= boilerplate.MIN_TITLES].tolist())
+    assert len(tabla) == 1
+    assert (corpus / boilerplate.SIDECAR_DIRNAME / "boilerplate.description.paragraph.json").exists()
+
+    # otro proceso: la tabla se lee del disco sin recorrer el corpus
+    monkeypatch.setattr(boilerplate, "_TABLES", {})
+    monkeypatch.setattr(boilerplate, "_corpus_chunks", lambda *a: pytest.fail("corpus releído"))
+    assert boilerplate.get_table("description", corpus_dir=corpus) == tabla
+    propio = "Buscamos una persona analista de datos con experiencia en SQL, Python y visualización de resultados."
+    assert boilerplate.strip_text(f"{propio}\n{EEO}", tabla) == propio
+
+
+def test_cola_global_no_limpia_dos_veces(corpus, fake_backend, monkeypatch):
+    monkeypatch.setattr(td, "BACKEND_NAME", "fake")
+    monkeypatch.setattr(td, "PERSISTENT_CACHE", False)
+    monkeypatch.setattr(td, "LANG_FILTER", False)
+    monkeypatch.setattr(td, "STREAMING", False)
+    monkeypatch.setattr(td, "CHECKPOINT", False)
+    monkeypatch.setattr(td, "STRIP_BOILERPLATE", True)
+    monkeypatch.setattr(td, "_global_cache", {})
+    calls = []
+    strip = td.strip_series
+    monkeypatch.setattr(td, "strip_series", lambda s, *a, **k: calls.append(len(s)) or strip(s, *a, **k))
+
+    targets = sorted(corpus.glob("*/*_Merged.csv"))
+    queue = td.build_global_queue(targets)
+    for target in targets:
+        td.process_file(target, queue)
+    queue.finish()
+    assert calls == [30, 30]                 # una vez por archivo, al planificar la cola
+    assert not td._prepared
+    out = pd.read_csv(targets[0], dtype=str)["description_final"]
+    assert not out.str.contains("IGUALDAD").any()
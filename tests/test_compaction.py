@@ -0,0 +1,68 @@
+"""Compactación: un hardlink o una entrada de catálogo se archivan una sola vez (alias)."""
+
+import os
+from datetime import date, datetime
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import compaction
+import file_manager as fm
+
+
+def test_contenido_compartido_se_archiva_una_vez(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    frames = {}
+    for fuente, modo in (("jooble", "hardlink"), ("indeed", "catalogo")):
+        cdir = tmp_path / "data" / "outputs" / fuente / "Software" / "corpus_unido"
+        cdir.mkdir(parents=True)
+        frames[fuente] = pd.DataFrame({"job_title": [f"analista {fuente}", "dev"], "x": ["1", "2"]})
+        frames[fuente].to_csv(cdir / f"{fuente}__Software__2025-01-05__merged.csv", index=False)
+        fm.copiar_corpus_diario_a_global(fuente, "Software", "2025-01-05", modo=modo)
+
+    total = compaction.compactar("data/outputs", keep_days=30, hoy=date(2025, 6, 1))
+    assert total["archivos"] == 2 and total["filas"] == 4     # no 4 archivos / 8 filas
+
+    index = compaction.load_index("data/outputs")
+    n_alias = sum(len(e.get("alias", {})) for e in index.values())
+    assert n_alias == 2
+    assert not list((tmp_path / "data" / "outputs").glob("*/Software/corpus_unido/*.csv"))
+
+    # las dos carpetas siguen viendo el contenido archivado
+    global_dir = "data/outputs/todas_las_plataformas/Software"
+    archivos = dict(fm.resolver_archivos_globales(global_dir))
+    for fuente, df in frames.items():
+        ref = archivos[f"{fuente}__Software__2025-01-05__merged.csv"]
+        pd.testing.assert_frame_equal(compaction.leer_referencia(ref).astype(str), df)
+        plataforma = compaction.leer_archivo(f"{fuente}/Software/corpus_unido", base_outputs="data/outputs")
+        assert plataforma["job_title"].tolist() == df["job_title"].tolist()
+    assert len(compaction.leer_archivo(global_dir, base_outputs="data/outputs")) == 4
+
+    # una segunda pasada no vuelve a archivar nada
+    assert compaction.compactar("data/outputs", keep_days=30, hoy=date(2025, 6, 1))["archivos"] == 0
+
+
+def test_acumulado_sin_fecha_se_archiva_por_modificacion(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cdir = tmp_path / "data" / "outputs" / "jooble" / "Software"
+    cdir.mkdir(parents=True)
+    viejo, nuevo = cdir / "jooble__Software__acumulado.csv", cdir / "indeed__Software__acumulado.csv"
+    pd.DataFrame({"job_title": ["analista"]}).to_csv(viejo, index=False)
+    pd.DataFrame({"job_title": ["dev"]}).to_csv(nuevo, index=False)
+    marzo = datetime(2025, 3, 10).timestamp()
+    os.utime(viejo, (marzo, marzo))
+
+    total = compaction.compactar("data/outputs", keep_days=30, hoy=date(2025, 6, 1))
+    assert total["archivos"] == 1 and not viejo.exists() and nuevo.exists()
+    index = compaction.load_index("data/outputs")
+    assert index["jooble/Software/2025-03.parquet"]["archivos"]["jooble__Software__acumulado.csv"]["fecha"] == "2025-03-10"
+    df = compaction.leer_archivo("jooble/Software", base_outputs="data/outputs")
+    assert df["job_title"].tolist() == ["analista"]
+
+    # otro acumulado con el mismo nombre y otra fecha no pisa lo archivado ni se borra
+    pd.DataFrame({"job_title": ["otro"]}).to_csv(viejo, index=False)
+    otra = datetime(2025, 3, 20).timestamp()
+    os.utime(viejo, (otra, otra))
+    assert compaction.compactar("data/outputs", keep_days=30, hoy=date(2025, 6, 1))["archivos"] == 0
+    assert viejo.exists()
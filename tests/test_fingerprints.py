@@ -0,0 +1,85 @@
+"""Huellas por fila (ver fingerprints.py): una segunda ejecución solo procesa lo nuevo o cambiado."""
+
+from collections import Counter
+import pandas as pd
+import pytest
+
+import fingerprints
+import Traductor_Skills as ts
+
+
+def test_changed_mask_solo_filas_nuevas_o_cambiadas(tmp_path):
+    path = tmp_path / "X_Merged.csv"
+    df = pd.DataFrame({"job_id": ["a", "b", "c"], "skills": ["sql", "excel", "python"]})
+    fps = fingerprints.row_fingerprints(df, ["skills"], 1)
+    fingerprints.save_fingerprints(path, "etapa", df, fps)
+
+    df2 = pd.DataFrame({"job_id": ["a", "b", "c", "d"], "skills": ["sql", "EXCEL", "python", "r"]})
+    mask = fingerprints.changed_mask(path, "etapa", df2, fingerprints.row_fingerprints(df2, ["skills"], 1))
+    assert mask.tolist() == [False, True, False, True]
+
+    # otra versión de la etapa invalida todas las huellas
+    mask_v2 = fingerprints.changed_mask(path, "etapa", df2, fingerprints.row_fingerprints(df2, ["skills"], 2))
+    assert mask_v2.all()
+
+
+@pytest.fixture
+def skills_stage(fake_backend, monkeypatch):
+    monkeypatch.setattr(ts, "BACKEND_NAME", "fake")
+    monkeypatch.setattr(ts, "PERSISTENT_CACHE", False)
+    monkeypatch.setattr(ts, "LANG_FILTER", False)
+    monkeypatch.setattr(ts, "GLOSSARY", False)
+    monkeypatch.setattr(ts, "STREAMING", False)
+    monkeypatch.setattr(ts, "RETRY_SLEEP_BASE", 0)
+
+    def fresh_session():
+        # cada ejecución del script es un proceso nuevo: sin caché de sesión
+        monkeypatch.setattr(ts, "_global_cache", {})
+        monkeypatch.setattr(ts, "_failed_items", set())
+        monkeypatch.setattr(ts, "_item_counts", Counter())
+        fake_backend.calls.clear()
+    return fresh_session
+
+
+def test_segunda_ejecucion_omite_filas_sin_cambios(tmp_path, skills_stage, fake_backend):
+    path = tmp_path / "X_Merged.csv"
+    pd.DataFrame({"job_id": ["a", "b", "c"],
+                  "skills": ["cooking, baking", "frying", "welding"]}).to_csv(path, index=False)
+
+    skills_stage()
+    ts.process_file(path)
+    assert fake_backend.calls
+    out = pd.read_csv(path, dtype=str)
+    assert out["skills"].tolist() == ["COOKING, BAKING", "FRYING", "WELDING"]
+
+    skills_stage()
+    ts.process_file(path)
+    assert fake_backend.calls == []          # nada nuevo: ninguna llamada al backend
+
+    out.loc[out["job_id"] == "b", "skills"] = "painting"
+    out.to_csv(path, index=False)
+    skills_stage()
+    ts.process_file(path)
+    assert fake_backend.calls == ["painting"]
+    assert pd.read_csv(path, dtype=str)["skills"].tolist() == ["COOKING, BAKING", "PAINTING", "WELDING"]
+
+
+def test_fila_con_traduccion_fallida_se_reintenta(tmp_path, skills_stage, fake_backend):
+    path = tmp_path / "X_Merged.csv"
+    pd.DataFrame({"job_id": ["a", "b"], "skills": ["cooking", "boom, frying"]}).to_csv(path, index=False)
+
+    fake_backend.fail_on = {"boom"}
+    skills_stage()
+    ts.process_file(path)
+    assert pd.read_csv(path, dtype=str)["skills"].tolist() == ["COOKING", "boom, FRYING"]
+
+    # el backend se recupera: solo la fila con el fallo vuelve a procesarse
+    fake_backend.fail_on = set()
+    skills_stage()
+    ts.process_file(path)
+    assert "COOKING" not in fake_backend.calls and "cooking" not in fake_backend.calls
+    assert pd.read_csv(path, dtype=str)["skills"].tolist() == ["COOKING", "BOOM, FRYING"]
+
+    skills_stage()
+    ts.process_file(path)
+    assert fake_backend.calls == []
@@ -0,0 +1,45 @@
+"""soft_country_guess con el trie de tokens frente al recorrido lineal anterior."""
+
+import random
+import pytest
+
+import location_extractor as le
+
+
+def soft_country_guess_lineal(full_loc: str) -> str:
+    """Implementación anterior: variantes más largas primero, 'contains' con límites de palabra."""
+    s = f" {le._strip_noise_for_guess(le.clean_text(full_loc))} "
+    for variant in sorted(le.VARIANT2CANON.keys(), key=len, reverse=True):
+        if not variant or len(variant) < 2:
+            continue
+        if f" {variant} " in s:
+            return le.VARIANT2CANON[variant]
+    return ""
+
+
+@pytest.mark.parametrize("loc", [
+    "Seoul, South Korea",
+    "Korea",
+    "Greater São Paulo Area, Brazil",
+    "Bogotá D.C., Colombia",
+    "New York, NY, United States",
+    "Remote - Mexico City (Mexico)",
+    "https://example.com/jobs Lima Peru",
+    "Metropolitan Area of Santiago, Chile",
+    "",
+    "nowhere at all",
+])
+def test_casos_conocidos_igual_que_lineal(loc):
+    assert le.soft_country_guess(loc) == soft_country_guess_lineal(loc)
+
+
+def test_combinaciones_aleatorias_igual_que_lineal():
+    rnd = random.Random(0)
+    variants = list(le.VARIANT2CANON) + ["foo", "the", "greater", "new", "south", "korea", "area"]
+    for _ in range(3000):
+        loc = rnd.choice([", ", " "]).join(rnd.choice(variants) for _ in range(rnd.randint(1, 5)))
+        assert le.soft_country_guess(loc) == soft_country_guess_lineal(loc), loc
+
+
+def test_prefiere_la_variante_mas_larga():
+    assert le.soft_country_guess("Busan, South Korea") == soft_country_guess_lineal("south korea")
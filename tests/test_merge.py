@@ -0,0 +1,90 @@
+"""
+Unión acumulada por carrera: en paralelo (pool de procesos) y con deduplicación externa
+(fuera de memoria) debe dar lo mismo que la unión secuencial en memoria.
+"""
+
+import random
+import shutil
+from pathlib import Path
+import pandas as pd
+import pytest
+
+import file_manager as fm
+
+CARRERAS = ["Economía", "Software"]
+
+
+def _corpus(base: Path) -> None:
+    """Tres CSV diarios por carrera con ofertas repetidas entre archivos y dentro de ellos."""
+    rnd = random.Random(1)
+    for carrera in CARRERAS:
+        cdir = base / "data" / "outputs" / "todas_las_plataformas" / carrera
+        cdir.mkdir(parents=True)
+        for dia in ("2025-07-01", "2025-07-02", "2025-07-03"):
+            rows = []
+            for _ in range(400):
+                n = rnd.randint(0, 299)     # ~300 ofertas distintas por carrera
+                rows.append({
+                    "job_title": f"Analista {carrera} {n}",
+                    "company": f"Empresa {n % 37}",
+                    "location": rnd.choice(["Quito, Ecuador", "Lima, Peru", "Madrid, Spain", ""]) if n % 5 else "Remote",
+                    "date_posted": f"2025-06-{1 + n % 28:02d}",
+                    "description": f"Descripción {n} ({dia})",   # se conserva la primera aparición
+                    "job_id": f"viejo-{n}",
+                    # texto con pinta de número y marcadores 'NA': no deben cambiar al pasar por fragmentos
+                    "postal_code": "S/N" if n % 50 == 0 else f"0{1000 + n}",
+                    "salary_currency": "NA" if n % 3 == 0 else "USD",
+                })
+            pd.DataFrame(rows).to_csv(cdir / f"jooble__{carrera}__{dia}__merged.csv", index=False)
+
+
+def _merge(tmp_path: Path, monkeypatch, nombre: str, **kwargs) -> dict:
+    work = tmp_path / nombre
+    shutil.copytree(tmp_path / "src", work)
+    monkeypatch.chdir(work)
+    resumenes = fm.unir_corpus_acumulado_por_carrera(**kwargs)
+    assert len(resumenes) == len(CARRERAS)
+    base = work / "data" / "outputs" / "todas_las_plataformas"
+    return {c: base / c / f"{c}_Merged.csv" for c in CARRERAS}
+
+
+@pytest.fixture
+def merges(tmp_path, monkeypatch):
+    _corpus(tmp_path / "src")
+    monkeypatch.setattr(fm, "NEAR_DUP_AFTER_MERGE", False)
+    return lambda nombre, **kw: _merge(tmp_path, monkeypatch, nombre, **kw)
+
+
+def test_paralelo_igual_que_secuencial(merges):
+    secuencial = merges("secuencial", workers=1)
+    paralelo = merges("paralelo", workers=2)
+    for carrera in CARRERAS:
+        assert secuencial[carrera].read_bytes() == paralelo[carrera].read_bytes()
+
+
+def test_dedup_externa_igual_que_en_memoria(merges):
+    memoria = merges("memoria", workers=1)
+    externa = merges("externa", workers=1, memoria_mb=0.05)   # fuerza varios fragmentos
+    for carrera in CARRERAS:
+        a = pd.read_csv(memoria[carrera], dtype=str, keep_default_na=False)
+        b = pd.read_csv(externa[carrera], dtype=str, keep_default_na=False)
+        assert list(a.columns) == list(b.columns)
+        assert a["job_id"].is_unique and len(a) < 1200
+        # la dedup externa agrupa las filas por fragmento: se compara sin orden
+        a = a.sort_values("job_id").reset_index(drop=True)
+        b = b.sort_values("job_id").reset_index(drop=True)
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_hijos_spawn_reciben_la_configuracion(monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    import csv_loader
+
+    monkeypatch.setattr(csv_loader, "CSV_ENGINE", "pyarrow")
+    monkeypatch.setattr(csv_loader, "APPLY_SCHEMA", False)
+    monkeypatch.setattr(fm, "DEDUP_MEMORY_MB", 64)
+    config = fm._config_hijos()
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=fm._aplicar_config, initargs=(config,)) as ex:
+        assert ex.submit(fm._config_hijos).result() == config
@@ -0,0 +1,31 @@
+"""Modo streaming (ver streaming.py): una columna creada en un bloque posterior no se pierde."""
+
+import pandas as pd
+
+import fingerprints
+import streaming
+
+
+def test_columna_nueva_en_bloque_posterior(tmp_path):
+    path = tmp_path / "X_Merged.csv"
+    pd.DataFrame({"job_id": [f"j{i}" for i in range(10)],
+                  "description": ["hola"] * 5 + ["hello"] * 5}).to_csv(path, index=False)
+
+    def etapa(chunk):
+        # como description_lang: solo aparece cuando el bloque tiene algo que hacer
+        pendientes = chunk["description"] == "hello"
+        if not pendientes.any():
+            return chunk, None, False
+        chunk = chunk.copy()
+        chunk.loc[pendientes, "description_lang"] = "en"
+        return chunk, fingerprints.row_fingerprints(chunk, ["description"], 1), True
+
+    assert streaming.stream_file(path, [("etapa", etapa)], chunk_rows=4)
+    out = pd.read_csv(path, dtype=str, keep_default_na=False)
+    assert list(out.columns) == ["job_id", "description", "description_lang"]
+    assert out["description_lang"].tolist() == [""] * 5 + ["en"] * 5
+    assert out["job_id"].tolist() == [f"j{i}" for i in range(10)]
+
+    # las huellas guardadas corresponden a filas que sí tienen la columna nueva
+    saved = fingerprints.saved_fingerprints(path, "etapa", out).dropna()
+    assert set(saved.index) >= set(range(5, 10))
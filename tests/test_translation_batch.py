@@ -0,0 +1,64 @@
+"""Empaquetado de ítems cortos en lotes con delimitador (ver translation_batch.py)."""
+
+import random
+import pytest
+
+import translation_batch as tb
+
+
+def _items(n, seed=0):
+    rnd = random.Random(seed)
+    words = ["sql", "trabajo en equipo", "excel avanzado", "liderazgo", "python", "gestión de proyectos"]
+    return [" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 6))) + f" {i}" for i in range(n)]
+
+
+def test_pack_batches_conserva_orden_y_respeta_limites():
+    items = _items(500)
+    batches = tb.pack_batches(items, char_limit=300, max_items=20)
+    assert [it for b in batches for it in b] == items
+    for b in batches:
+        assert len(b) <= 20
+        assert len(b) == 1 or len(tb.DELIMITER.join(b)) <= 300
+
+
+def test_items_con_delimitador_o_largos_van_solos():
+    largo = "x" * 50
+    items = ["a", f"b{tb.DELIMITER}c", "d", largo, "e"]
+    batches = tb.pack_batches(items, char_limit=40)
+    assert [f"b{tb.DELIMITER}c"] in batches and [largo] in batches
+    # los lotes propios salen antes: cada ítem aparece una vez (el orden lo dan los pares)
+    assert sorted(it for b in batches for it in b) == sorted(items)
+
+
+@pytest.mark.parametrize("char_limit", [50, 300, tb.BATCH_CHAR_LIMIT])
+def test_ida_y_vuelta_por_el_delimitador(char_limit):
+    items = _items(300, seed=char_limit)
+    for batch in tb.pack_batches(items, char_limit=char_limit):
+        assert tb._split_response(tb.DELIMITER.join(batch), len(batch)) == batch
+
+
+def test_split_response_rechaza_respuestas_desalineadas():
+    assert tb._split_response("uno\ndos", 3) is None
+    assert tb._split_response("uno\n\ntres", 3) is None
+    assert tb._split_response(None, 1) is None
+
+
+def test_translate_batch_una_peticion_por_lote(monkeypatch):
+    monkeypatch.setattr(tb, "RETRY_SLEEP_BASE", 0)
+    calls = []
+
+    def translate_text(text):
+        calls.append(text)
+        return text.upper()
+
+    batch = ["sql", "liderazgo", "excel"]
+    pairs, packed = tb.translate_batch(batch, translate_text, lambda it: pytest.fail("respaldo innecesario"))
+    assert packed and pairs == [("sql", "SQL"), ("liderazgo", "LIDERAZGO"), ("excel", "EXCEL")]
+    assert len(calls) == 1
+
+
+def test_translate_batch_desalineado_usa_el_respaldo(monkeypatch):
+    monkeypatch.setattr(tb, "RETRY_SLEEP_BASE", 0)
+    fusiona = lambda text: text.replace(tb.DELIMITER, " ").upper()   # el backend une las líneas
+    pairs, packed = tb.translate_batch(["a", "b"], fusiona, lambda it: f"<{it}>")
+    assert not packed and pairs == [("a", "<a>"), ("b", "<b>")]
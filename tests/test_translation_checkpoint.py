@@ -0,0 +1,86 @@
+"""Puntos de control de Traductor_Descripcion: lo traducido antes de una caída no se repite."""
+
+import json
+import pandas as pd
+import pytest
+
+import translation_checkpoint as tcp
+import Traductor_Descripcion as td
+
+META = {"version": 1, "src": "auto", "tgt": "es", "backend": "fake"}
+
+
+def test_restaura_tras_linea_cortada(tmp_path, monkeypatch):
+    monkeypatch.setattr(tcp, "EVERY_ITEMS", 2)
+    path = tmp_path / "X_Merged.csv"
+    cp = tcp.TranslationCheckpoint(path, "etapa", META)
+    for i in range(5):
+        cp.add(f"texto {i}", f"TEXTO {i}")   # 4 en disco, 1 en memoria al caerse
+    with open(cp.path, "a", encoding="utf-8") as f:
+        f.write('{"h": "abc", "t": "lín')    # línea a medio escribir
+
+    nuevo = tcp.TranslationCheckpoint(path, "etapa", META)
+    restored = nuevo.restore(pd.Series([f"texto {i}" for i in range(5)]))
+    assert restored.tolist()[:4] == [f"TEXTO {i}" for i in range(4)]
+    assert pd.isna(restored[4])
+    # el archivo se reescribe sin la línea dañada
+    lines = cp.path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5 and all(json.loads(line) for line in lines)
+
+
+def test_otra_configuracion_descarta_el_punto_de_control(tmp_path):
+    path = tmp_path / "X_Merged.csv"
+    cp = tcp.TranslationCheckpoint(path, "etapa", META)
+    cp.add("hola", "HOLA")
+    cp.flush()
+    otro = tcp.TranslationCheckpoint(path, "etapa", {**META, "backend": "google"})
+    assert otro.restore(pd.Series(["hola"])).isna().all()
+    assert not cp.path.exists()
+
+
+@pytest.fixture
+def description_stage(fake_backend, monkeypatch):
+    monkeypatch.setattr(td, "BACKEND_NAME", "fake")
+    monkeypatch.setattr(td, "PERSISTENT_CACHE", False)
+    monkeypatch.setattr(td, "LANG_FILTER", False)
+    monkeypatch.setattr(td, "STRIP_BOILERPLATE", False)
+    monkeypatch.setattr(td, "STREAMING", False)
+    monkeypatch.setattr(td, "CHECKPOINT", True)
+    monkeypatch.setattr(tcp, "EVERY_ITEMS", 10)
+
+    def fresh_process():
+        monkeypatch.setattr(td, "_global_cache", {})
+        monkeypatch.setattr(tcp, "_OPEN", {})
+        fake_backend.calls.clear()
+    return fresh_process
+
+
+def test_reanuda_tras_caida_sin_retraducir(tmp_path, description_stage, fake_backend):
+    rows = [{"job_id": f"j{i}", "description": f"Oferta número {i} en la empresa {i % 7}. Requiere experiencia {i}."}
+            for i in range(120)]
+    path = tmp_path / "C" / "C_Merged.csv"
+    path.parent.mkdir()
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+    ref = tmp_path / "R" / "R_Merged.csv"
+    ref.parent.mkdir()
+    pd.DataFrame(rows).to_csv(ref, index=False)
+    description_stage()
+    td.process_file(ref)
+    n_full = len(fake_backend.calls)
+
+    description_stage()
+    fake_backend.crash_after = 2
+    with pytest.raises(KeyboardInterrupt):
+        td.process_file(path)
+    checkpoint = path.parent / tcp.SIDECAR_DIRNAME / f"{path.name}.{td.STAGE_NAME}.jsonl"
+    assert checkpoint.exists()
+    assert "description_final" not in pd.read_csv(path, dtype=str).columns   # el CSV no llegó a escribirse
+
+    description_stage()
+    td.process_file(path)
+    assert 0 < len(fake_backend.calls) < n_full
+    assert not checkpoint.exists()          # el CSV ya tiene las traducciones
+    out = pd.read_csv(path, dtype=str)["description_final"]
+    assert out.equals(pd.read_csv(ref, dtype=str)["description_final"])
+    assert out.str.isupper().all()
@@ -2,26 +2,31 @@
 from pathlib import Path
 import re
 import pandas as pd
+# Lectura/escritura CSV compartida (ver csv_loader.py)
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .skills_format import skills_empty_mask
+    from .fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from .streaming import stream_file
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from skills_format import skills_empty_mask
+    from fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from streaming import stream_file
 
 # -------- Config --------
 BASE_GLOBAL = Path(r"C:\Users\andra\Documents\Proyects\TICs\Corpus\Jobs_ScalperV2\modelo-ciencia-datos-empleabilidad\data\outputs\todas_las_plataformas")
 DESCRIPTION_COL = "description"
 SKILLS_COL = "skills"
 ONLY_THIS_CAREER = None  # p.ej. "Administración_de_Empresas" o None para todas
-
-# -------- Lectura robusta --------
-def read_csv_robust(path: Path) -> pd.DataFrame:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, low_memory=False)
-        except Exception:
-            pass
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, sep=";", low_memory=False)
-        except Exception:
-            pass
-    raise RuntimeError(f"No se pudo leer el CSV: {path}")
+USE_GLOBAL_REGISTRY = False  # True: filtra el registro de ofertas únicas y luego cada carrera (ver job_registry.py)
+INCREMENTAL = True       # solo revisa filas nuevas o cambiadas (ver fingerprints.py)
+STAGE_VERSION = 1        # súbelo al cambiar el criterio de "vacío"
+STAGE_NAME = "eliminar_filas_vacias"
+STREAMING = False        # True: procesa el CSV por bloques de CHUNK_ROWS filas (ver streaming.py)
+CHUNK_ROWS = 2000
 
 # -------- Criterio de "vacío" --------
 BRACKETS_EMPTY_RE = re.compile(r"^\s*\[\s*\]\s*$")  # coincide con [], [   ], etc.
@@ -43,39 +48,64 @@ def series_is_empty_like(s: pd.Series) -> pd.Series:
     is_brackets = as_str.str.match(BRACKETS_EMPTY_RE)
     return is_na | is_blank | is_brackets
 
-# -------- Proceso por archivo --------
-def clean_file(file_path: Path):
-    try:
-        df = read_csv_robust(file_path)
-    except Exception as e:
-        print(f"[ERROR] {file_path.name}: {e}")
-        return
+# -------- Transformación en memoria --------
+def transform_df(df: pd.DataFrame, file_path: Path):
+    """
+    Quita las filas con DESCRIPTION_COL y SKILLS_COL vacías; con INCREMENTAL solo revisa
+    las nuevas o cambiadas (las demás ya pasaron el filtro).
 
+    Returns:
+        tuple: (df sin esas filas, huellas de las filas que quedan, True si se eliminó alguna)
+    """
     n_before = len(df)
     if n_before == 0:
         print(f"[SKIP] {file_path.name}: vacío.")
-        return
+        return df, None, False
 
     # Si faltan columnas, las tratamos como vacías
     desc = df[DESCRIPTION_COL] if DESCRIPTION_COL in df.columns else pd.Series([None]*n_before)
     skills = df[SKILLS_COL] if SKILLS_COL in df.columns else pd.Series([None]*n_before)
 
-    desc_empty = series_is_empty_like(desc)
-    skills_empty = series_is_empty_like(skills)
+    # Solo se revisan filas nuevas o cambiadas; las demás ya pasaron el filtro
+    fps = row_fingerprints(df, [DESCRIPTION_COL, SKILLS_COL], STAGE_VERSION)
+    check = (changed_mask(file_path, STAGE_NAME, df, fps) if INCREMENTAL
+             else pd.Series(True, index=df.index)).to_numpy()
+
+    desc_empty = series_is_empty_like(desc[check]).to_numpy()
+    skills_empty = skills_empty_mask(skills[check]).to_numpy()  # parser compartido (ver skills_format.py)
 
     # Mantener filas donde AL MENOS una columna tiene contenido
-    keep_mask = ~(desc_empty & skills_empty)
+    keep_mask = pd.Series(True, index=df.index)
+    keep_mask[check] = ~(desc_empty & skills_empty)
     df_kept = df[keep_mask].copy()
 
     removed = n_before - len(df_kept)
     if removed > 0:
-        try:
-            df_kept.to_csv(file_path, index=False, encoding="utf-8")
-        except Exception:
-            df_kept.to_csv(file_path, index=False, encoding="utf-8-sig")
         print(f"[OK] {file_path.name}: eliminadas {removed} filas (quedan {len(df_kept)}).")
     else:
-        print(f"[OK] {file_path.name}: nada que eliminar ({n_before} filas).")
+        print(f"[OK] {file_path.name}: nada que eliminar ({n_before} filas, {int(check.sum())} revisadas).")
+    return df_kept, fps[keep_mask], removed > 0
+
+# -------- Proceso por archivo --------
+def clean_file(file_path: Path):
+    if STREAMING:
+        try:
+            stream_file(file_path, [(STAGE_NAME, lambda c: transform_df(c, file_path))], CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {file_path.name}: {e}")
+        return
+
+    try:
+        df = read_csv_robust(file_path)
+    except Exception as e:
+        print(f"[ERROR] {file_path.name}: {e}")
+        return
+
+    df, fps, changed = transform_df(df, file_path)
+    if changed:
+        write_csv_robust(df, file_path)
+    if fps is not None:
+        save_fingerprints(file_path, STAGE_NAME, df, fps)
 
 # -------- Recorrer todas las carreras --------
 def run_all():
@@ -83,6 +113,9 @@ def run_all():
     if not base.exists():
         raise FileNotFoundError(f"No existe la ruta base: {base}")
 
+    if run_stage_on_registry(USE_GLOBAL_REGISTRY, clean_file, base, [], ONLY_THIS_CAREER):
+        return
+
     carreras = [p for p in base.iterdir() if p.is_dir()]
     if ONLY_THIS_CAREER:
         carreras = [d for d in carreras if d.name == ONLY_THIS_CAREER]
@@ -98,4 +131,5 @@ def run_all():
         clean_file(target)
 
 # -------- Ejecutar --------
-run_all()
+if __name__ == "__main__":
+    run_all()
@@ -7,13 +7,27 @@ Extractor de habilidades blandas (EURACE) con diccionario externo YAML.
 """
 
 import re
-import ast
+import hashlib
 import unicodedata
 from pathlib import Path
 import pandas as pd
 import yaml
 from rapidfuzz import fuzz, process as rf_process
 HAS_RAPIDFUZZ = True
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .skills_format import parse_skills_series
+    from .fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from .streaming import stream_file
+    from .boilerplate import strip_series
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from skills_format import parse_skills_series
+    from fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from streaming import stream_file
+    from boilerplate import strip_series
 
 # -------------- CONFIG --------------
 BASE_GLOBAL = Path("C:\\Users\\andra\\Documents\\Proyects\\TICs\\Corpus\\Jobs_ScalperV2\\modelo-ciencia-datos-empleabilidad\\data\\outputs\\todas_las_plataformas")
@@ -23,9 +37,16 @@ SKILLS_COL  = "skills"
 EURACE_COL  = "EURACE_skills"
 INIT_COL    = "initial_skills"
 ONLY_THIS_CAREER = None
+USE_GLOBAL_REGISTRY = False  # True: extrae habilidades una vez por oferta única en el registro (ver job_registry.py)
+INCREMENTAL = True    # solo filas nuevas / con descripción o skills cambiadas (ver fingerprints.py)
+STAGE_VERSION = 1     # súbelo al cambiar la extracción (cambios en skills.yml ya se detectan solos)
+STAGE_NAME = "extract_habilidades"
+STREAMING = False     # True: procesa el CSV por bloques de CHUNK_ROWS filas (ver streaming.py)
+CHUNK_ROWS = 2000
 
 OVERWRITE = True      # sobrescribe CSV original
 FUZZY_THRESHOLD = 90  # umbral conservador para rescate difuso
+STRIP_BOILERPLATE = False  # True: no buscar habilidades en oraciones repetidas del corpus de BASE_GLOBAL (ver boilerplate.py)
 
 # -------------- Normalización --------------
 URL_RE = re.compile(r"https?://\S+|www\.\S+")
@@ -94,28 +115,6 @@ def load_dictionary(yaml_path: Path):
 
     return order, compiled, cat2_canonical, fuzzy_bank, phrase2cat
 
-# -------------- Parse 'skills' --------------
-def parse_skills_cell(cell):
-    if cell is None or (isinstance(cell, float) and pd.isna(cell)):
-        return None
-    if isinstance(cell, list):
-        vals = [str(x).strip() for x in cell if str(x).strip()]
-        return vals or None
-    s = str(cell).strip()
-    if s in ("", "[]", "[ ]"):
-        return None
-    if s.startswith("[") and s.endswith("]"):
-        try:
-            obj = ast.literal_eval(s)
-            if isinstance(obj, list):
-                vals = [str(x).strip() for x in obj if str(x).strip()]
-                return vals or None
-        except Exception:
-            pass
-    parts = [p.strip() for p in s.split(",")]
-    parts = [p for p in parts if p]
-    return parts or None
-
 # -------------- Extracción --------------
 def extract_from_text(raw_text: str, order, compiled, cat2_canonical, fuzzy_bank, phrase2cat):
     text_norm = normalize_text(raw_text)
@@ -172,34 +171,58 @@ def extract_from_text(raw_text: str, order, compiled, cat2_canonical, fuzzy_bank
 
     return eurace_out, init_out
 
-# -------------- Proceso por archivo --------------
-def process_file(path: Path, order, compiled, cat2_canonical, fuzzy_bank, phrase2cat):
-    # lectura robusta
-    df = None
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            df = pd.read_csv(path, encoding=enc, low_memory=False)
-            break
-        except Exception:
-            df = None
-    if df is None:
-        print(f"[ERROR] No se pudo leer {path.name}")
-        return
+# -------------- Transformación en memoria --------------
+def transform_df(df: pd.DataFrame, path: Path, dictionary, dict_path=None):
+    """
+    Rellena EURACE_COL e INIT_COL a partir de DESC_COL + SKILLS_COL en las filas nuevas o
+    cambiadas (en todas si aún no existen esas columnas); el resto conserva su valor.
+
+    Args:
+        dictionary: Tupla devuelta por load_dictionary(dict_path)
+        dict_path: skills.yml del que salió el diccionario (default: DICT_PATH)
+
+    Returns:
+        tuple: (df, huellas de descripción + skills + diccionario o None si no había
+                pendientes, True si se extrajo alguna fila)
+    """
+    order, compiled, cat2_canonical, fuzzy_bank, phrase2cat = dictionary
 
     missing = [c for c in (DESC_COL, SKILLS_COL) if c not in df.columns]
     if missing:
         print(f"[WARN] {path.name}: faltan columnas {missing}.")
-        return
+        return df, None, False
 
     total = len(df)
-    print(f"[INFO] Procesando {path.name} ({total} filas)")
+
+    # Huella = entradas + versión de la etapa + contenido del diccionario
+    version = f"{STAGE_VERSION}:{hashlib.sha256(Path(dict_path or DICT_PATH).read_bytes()).hexdigest()}"
+    if STRIP_BOILERPLATE:
+        # el texto sin boilerplate entra en la huella: un cambio de la tabla reprocesa esas filas
+        descs_all = strip_series(df[DESC_COL], DESC_COL, "sentence", fallback=df,
+                                 corpus_dir=Path(path).parent.parent)
+        inputs = pd.DataFrame({DESC_COL: df[DESC_COL], SKILLS_COL: df[SKILLS_COL], "_texto": descs_all},
+                              index=df.index)
+        fps = row_fingerprints(inputs, [DESC_COL, SKILLS_COL, "_texto"], f"{version}:boilerplate")
+    else:
+        descs_all = df[DESC_COL]
+        fps = row_fingerprints(df, [DESC_COL, SKILLS_COL], version)
+    if INCREMENTAL and EURACE_COL in df.columns and INIT_COL in df.columns:
+        todo = changed_mask(path, STAGE_NAME, df, fps)
+    else:
+        todo = pd.Series(True, index=df.index)
+    n_todo = int(todo.sum())
+    print(f"[INFO] Procesando {path.name} ({n_todo}/{total} filas nuevas o cambiadas)")
+    if n_todo == 0:
+        return df, None, False
+
+    descs = descs_all[todo]
 
     eurace_vals, init_vals = [], []
-    for d, s in zip(df[DESC_COL], df[SKILLS_COL]):
+    # 'skills' se parsea una vez por valor distinto (ver skills_format.py)
+    for d, lst in zip(descs, parse_skills_series(df.loc[todo, SKILLS_COL])):
         pieces = []
         if isinstance(d, str) and d.strip():
             pieces.append(d)
-        lst = parse_skills_cell(s)
         if lst:
             pieces.append(", ".join(lst))
 
@@ -212,20 +235,44 @@ def process_file(path: Path, order, compiled, cat2_canonical, fuzzy_bank, phrase
         eurace_vals.append(eur)
         init_vals.append(ini)
 
-    # Solo estas dos columnas
-    df[EURACE_COL] = eurace_vals
-    df[INIT_COL]   = init_vals
+    # Solo estas dos columnas (las filas sin cambios conservan su valor)
+    for col, vals in ((EURACE_COL, eurace_vals), (INIT_COL, init_vals)):
+        if col not in df.columns or n_todo == total:
+            df[col] = ""
+        df[col] = df[col].astype(object).where(df[col].notna(), "")
+        df.loc[todo, col] = vals
 
-    # Salida (sobrescribe original si OVERWRITE=True)
-    out_path = path
+    n_cats = int((df[EURACE_COL].str.len() > 0).sum())
+    n_init = int((df[INIT_COL].str.len() > 0).sum())
+    print(f"[OK] {path.name}: {n_cats}/{total} con EURACE_skills, {n_init}/{total} con initial_skills.\n")
+    return df, fps, True
+
+# -------------- Proceso por archivo --------------
+def process_file(path: Path, order, compiled, cat2_canonical, fuzzy_bank, phrase2cat):
+    dictionary = (order, compiled, cat2_canonical, fuzzy_bank, phrase2cat)
+    if STREAMING:
+        try:
+            stream_file(path, [(STAGE_NAME, lambda c: transform_df(c, path, dictionary))], CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {path.name}: {e}")
+        return
+
+    # lectura robusta
     try:
-        df.to_csv(out_path, index=False, encoding="utf-8")
+        df = read_csv_robust(path)
     except Exception:
-        df.to_csv(out_path, index=False, encoding="utf-8-sig")
+        print(f"[ERROR] No se pudo leer {path.name}")
+        return
+
+    df, fps, changed = transform_df(df, path, dictionary)
+    if not changed:
+        return
+
+    # Salida (sobrescribe original si OVERWRITE=True)
+    out_path = path
+    write_csv_robust(df, out_path)
+    save_fingerprints(out_path, STAGE_NAME, df, fps)
 
-    n_cats = int((df[EURACE_COL].str.len() > 0).sum())
-    n_init = int((df[INIT_COL].str.len() > 0).sum())
-    print(f"[OK] {out_path.name}: {n_cats}/{total} con EURACE_skills, {n_init}/{total} con initial_skills.\n")
 
 # -------------- Recorrer base --------------
 def run_all():
@@ -235,6 +282,13 @@ def run_all():
     if not base.exists():
         raise FileNotFoundError(f"No existe la ruta base: {base}")
 
+    if run_stage_on_registry(
+        USE_GLOBAL_REGISTRY,
+        lambda p: process_file(p, order, compiled, cat2_canonical, fuzzy_bank, phrase2cat),
+        base, [EURACE_COL, INIT_COL], ONLY_THIS_CAREER,
+    ):
+        return
+
     dirs = [p for p in base.iterdir() if p.is_dir()]
     if ONLY_THIS_CAREER:
         dirs = [d for d in dirs if d.name == ONLY_THIS_CAREER]
@@ -9,11 +9,28 @@ from pathlib import Path
 import pandas as pd
 from ftfy import fix_text
 import emoji
+# Lectura/escritura CSV compartida (ver csv_loader.py)
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from .streaming import stream_file
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from streaming import stream_file
 
 # ------------------- CONFIG -------------------
 BASE_GLOBAL = Path("/content/drive/MyDrive/todas_las_plataformas")
 FINAL_COL = "description_final"
 ONLY_THIS_CAREER = None          # p.ej. "Administración_de_Empresas" o None
+USE_GLOBAL_REGISTRY = False      # True: normaliza sobre el registro de ofertas únicas (ver job_registry.py)
+INCREMENTAL = True               # omite filas que ya normalizó esta versión (ver fingerprints.py)
+STAGE_VERSION = 1                # súbelo al cambiar clean_final_text: renormaliza todo
+STAGE_NAME = "normalizador"
+STREAMING = False                # True: procesa el CSV por bloques de CHUNK_ROWS filas (ver streaming.py)
+CHUNK_ROWS = 2000
 FAIL_MARKER = "[GT_FAIL]"
 
 # ----------------- REGEX / UTILS --------------
@@ -135,53 +152,61 @@ def clean_final_text(text: str) -> str:
     s = LEADING_PUNCT_RE.sub("", s).strip()
     return s
 
-# --------------- LECTURA ROBUSTA ----------------
-def read_csv_robust(path: Path) -> pd.DataFrame:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, low_memory=False)
-        except Exception:
-            pass
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, sep=";", low_memory=False)
-        except Exception:
-            pass
-    raise RuntimeError(f"No se pudo leer el CSV: {path}")
-
-# --------------- PROCESO POR ARCHIVO ---------------
-def normalize_file(path: Path):
-    try:
-        df = read_csv_robust(path)
-    except Exception as e:
-        print(f"[ERROR] Leyendo {path.name}: {e}")
-        return
+# --------------- TRANSFORMACIÓN EN MEMORIA ---------------
+def transform_df(df: pd.DataFrame, path: Path):
+    """
+    Aplica clean_final_text a FINAL_COL en su lugar, salvo en vacíos, filas con
+    FAIL_MARKER y, con INCREMENTAL, filas que esta versión ya normalizó.
 
+    Returns:
+        tuple: (df, huellas del texto ya normalizado o None si no había nada que hacer,
+                True si se normalizó alguna fila)
+    """
     if FINAL_COL not in df.columns:
         print(f"[WARN] No hay columna '{FINAL_COL}' en {path.name}")
-        return
+        return df, None, False
 
-    col = df[FINAL_COL].astype(str)
+    col = df[FINAL_COL].fillna("").astype(str)
 
     # NO tocar vacíos ni filas con ticket
     mask_keep = col.str.strip().eq("") | col.str.startswith(FAIL_MARKER, na=False)
     mask_norm = ~mask_keep
+    # Etapa in situ: la huella guardada es la del texto ya normalizado
+    if INCREMENTAL:
+        mask_norm &= changed_mask(path, STAGE_NAME, df, row_fingerprints(df, [FINAL_COL], STAGE_VERSION))
 
     n_total = len(df)
     n_norm = int(mask_norm.sum())
     if n_norm == 0:
         print(f"[OK] {path.name}: nada que normalizar ({n_total} filas).")
-        return
+        return df, None, False
 
     df.loc[mask_norm, FINAL_COL] = col[mask_norm].map(clean_final_text)
+    print(f"[OK] {path.name}: normalizadas {n_norm}/{n_total} filas.")
+    return df, row_fingerprints(df, [FINAL_COL], STAGE_VERSION), True
+
+# --------------- PROCESO POR ARCHIVO ---------------
+def normalize_file(path: Path):
+    if STREAMING:
+        try:
+            stream_file(path, [(STAGE_NAME, lambda c: transform_df(c, path))], CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {path.name}: {e}")
+        return
 
-    # Guardar
     try:
-        df.to_csv(path, index=False, encoding="utf-8")
-    except Exception:
-        df.to_csv(path, index=False, encoding="utf-8-sig")
+        df = read_csv_robust(path)
+    except Exception as e:
+        print(f"[ERROR] Leyendo {path.name}: {e}")
+        return
 
-    print(f"[OK] {path.name}: normalizadas {n_norm}/{n_total} filas.")
+    df, fps, changed = transform_df(df, path)
+    if not changed:
+        return
+
+    # Guardar
+    write_csv_robust(df, path)
+    save_fingerprints(path, STAGE_NAME, df, fps)
 
 # --------------- RECORRER TODAS LAS CARRERAS ---------------
 def normalize_all():
@@ -189,6 +214,9 @@ def normalize_all():
     if not base.exists():
         raise FileNotFoundError(f"No existe la ruta base: {base}")
 
+    if run_stage_on_registry(USE_GLOBAL_REGISTRY, normalize_file, base, [FINAL_COL], ONLY_THIS_CAREER):
+        return
+
     dirs = [p for p in base.iterdir() if p.is_dir()]
     if ONLY_THIS_CAREER:
         dirs = [d for d in dirs if d.name == ONLY_THIS_CAREER]
@@ -204,4 +232,5 @@ def normalize_all():
         normalize_file(target)
 
 # --------------------- EJECUCIÓN ---------------------
-normalize_all()
+if __name__ == "__main__":
+    normalize_all()
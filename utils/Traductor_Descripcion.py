@@ -1,13 +1,34 @@
 # ====================== DEPENDENCIAS ======================
-import re, html, unicodedata, time, threading
+import re, html, unicodedata, time, sys
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from ftfy import fix_text
 import emoji
 from tqdm.auto import tqdm
-from deep_translator import GoogleTranslator
+# Lectura/escritura CSV compartida (ver csv_loader.py)
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .fingerprints import row_fingerprints, changed_mask, save_fingerprints, KEY_COL
+    from .streaming import stream_file
+    from . import translation_cache
+    from .language_id import LANG_COL, detect_series
+    from .translation_runtime import StageRuntime
+    from .translation_checkpoint import get_checkpoint, clear_checkpoint
+    from .boilerplate import strip_series
+    from . import translation_queue
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from fingerprints import row_fingerprints, changed_mask, save_fingerprints, KEY_COL
+    from streaming import stream_file
+    import translation_cache
+    from language_id import LANG_COL, detect_series
+    from translation_runtime import StageRuntime
+    from translation_checkpoint import get_checkpoint, clear_checkpoint
+    from boilerplate import strip_series
+    import translation_queue
 
 
 # ======================= CONFIGURACIÓN =====================
@@ -15,15 +36,45 @@ BASE_GLOBAL = Path(r"C:\Users\andra\Documents\Proyects\TICs\Corpus\Jobs_ScalperV
 DESCRIPTION_COL = "description"
 NEW_COL = "description_final"
 ONLY_THIS_CAREER = None            # p.ej. "Sistemas_de_Información" o None para todas
+USE_GLOBAL_REGISTRY = False        # True: traduce el registro de ofertas únicas y copia description_final a las carreras (ver job_registry.py)
+GLOBAL_QUEUE = True                # reúne los pendientes de todas las carreras y traduce cada texto una vez (ver translation_queue.py)
+
+# Incremental (ver fingerprints.py)
+INCREMENTAL = True                 # solo filas nuevas / con descripción cambiada
+STAGE_VERSION = 1                  # súbelo al cambiar la limpieza o traducción: reprocesa todo
+STAGE_NAME = "traductor_descripcion"
+STREAMING = False                  # True: procesa el CSV por bloques de CHUNK_ROWS filas (ver streaming.py)
+CHUNK_ROWS = 2000
 
 # Rendimiento
-MAX_WORKERS = 2                    # 2–4 si no te limita
+MAX_WORKERS = 2                    # 2–4 si no te limita (solo con ADAPTIVE_CONCURRENCY = False)
+ADAPTIVE_CONCURRENCY = True        # concurrencia AIMD compartida (ver translation_scheduler.py)
 CHUNK_LIMIT = 2000                 # Reducir para evitar errores con textos largos
 
 # Reintentos / control de fallos
 FAIL_MARKER = "[GT_FAIL] "         # prefijo cuando falla la traducción
 RETRY_ONLY_FAILED_FROM_CSV = True  # al relanzar, solo reintenta FAIL o vacías
 RETRY_PREV_FAIL = True             # reintenta en esta sesión aunque esté cacheado como FAIL
+CHECKPOINT = True                  # guarda lo traducido por tandas y lo retoma tras una caída (ver translation_checkpoint.py)
+
+# Caché persistente entre ejecuciones y scripts (ver translation_cache.py)
+PERSISTENT_CACHE = True
+SOURCE_LANG = "auto"
+TARGET_LANG = "es"
+BACKEND_NAME = "google"            # "google", "marian_ct2" o "argos" (ver translation_backends.py); parte de la clave de caché
+
+# Pre-filtro de idioma local (ver language_id.py): lo que ya está en TARGET_LANG no se traduce
+LANG_FILTER = True
+
+# Traducción por oraciones: el texto repetido entre ofertas (EEO, beneficios, "sobre la
+# empresa") se traduce una sola vez para todo el corpus
+SENTENCE_LEVEL = True
+
+# Párrafos repetidos en el corpus de BASE_GLOBAL (igualdad de oportunidades, "quiénes somos",
+# beneficios) se quitan antes de traducir (ver boilerplate.py). El texto ya sin ellos entra
+# en la huella: si la tabla aprendida cambia, se retraducen solo las filas afectadas.
+# Opcional: activarlo retraduce las filas con boilerplate la primera vez.
+STRIP_BOILERPLATE = False
 
 # Menos ruido en consola (solo progreso y mensajes clave)
 # ===========================================================
@@ -165,31 +216,10 @@ def clean_text(text: str) -> str:
     return s
 
 
-# ==================== LECTURA ROBUSTA CSV =====================
-def read_csv_robust(path: Path) -> pd.DataFrame:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, low_memory=False)
-        except Exception:
-            pass
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, sep=";", low_memory=False)
-        except Exception:
-            pass
-    raise RuntimeError(f"No se pudo leer el CSV: {path}")
-
 
-# ================== TRADUCTOR POR HILO + CACHÉ =================
-_thread_local = threading.local()
+# ================== BACKEND DE TRADUCCIÓN + CACHÉ =================
 _global_cache = {}  # texto_limpio -> traducción o FAIL_MARKER+texto
-
-def _get_translator():
-    gt = getattr(_thread_local, "gt", None)
-    if gt is None:
-        gt = GoogleTranslator(source="auto", target="es")
-        _thread_local.gt = gt
-    return gt
+_runtime = StageRuntime(sys.modules[__name__])   # backend / planificador / clave de caché (ver translation_runtime.py)
 
 def _split_into_chunks(text: str, limit: int = CHUNK_LIMIT):
     """Divide en chunks, priorizando separadores naturales, luego espacios, finalmente corte duro."""
@@ -234,6 +264,7 @@ def _split_into_chunks(text: str, limit: int = CHUNK_LIMIT):
     
     return chunks
 
+
 def _translate_text_with_fail(text: str) -> str:
     """
     Traduce con troceo + 3 reintentos por trozo.
@@ -249,7 +280,6 @@ def _translate_text_with_fail(text: str) -> str:
         else:
             return cached
 
-    gt = _get_translator()
     outs = []
     chunks = _split_into_chunks(text, CHUNK_LIMIT)
     
@@ -258,14 +288,15 @@ def _translate_text_with_fail(text: str) -> str:
         delay = 1.0  # Reducir delay inicial
         for attempt in range(3):
             try:
-                out = gt.translate(ch)
+                out = _runtime.call(ch)
                 if not isinstance(out, str) or out.strip() == "":
                     raise RuntimeError("empty response")
                 outs.append(out)
                 ok = True
                 break
             except Exception:
-                if attempt < 2:  # Solo dormir si no es el último intento
+                # Solo dormir si no es el último intento (con el planificador la pausa es global)
+                if attempt < 2 and not ADAPTIVE_CONCURRENCY:
                     time.sleep(delay)
                     delay *= 1.5  # Reducir incremento: 1s, 1.5s, 2.25s
         
@@ -276,14 +307,17 @@ def _translate_text_with_fail(text: str) -> str:
 
     final = " ".join(outs)
     _global_cache[text] = final
+    if PERSISTENT_CACHE:
+        translation_cache.put(text, final, **_runtime.cache_key())
     return final
 
 
 # ===== TRADUCIR SOLO ÚNICOS (omite vacíos) + MAPEO RÁPIDO =====
-def translate_series_unique_multithread(series: pd.Series, max_workers: int = 3) -> pd.Series:
+def translate_series_unique_multithread(series: pd.Series, max_workers: int = 3, on_done=None) -> pd.Series:
     """
     - Traduce solo valores únicos no vacíos ('' se omiten y se dejan tal cual).
     - Usa hilos y caché en memoria para acelerar.
+    - on_done(texto, traducción) se llama con cada texto traducido sin fallo (puntos de control).
     """
     texts = series.fillna("").astype(str)
 
@@ -299,71 +333,365 @@ def translate_series_unique_multithread(series: pd.Series, max_workers: int = 3)
         elif RETRY_PREV_FAIL and isinstance(v, str) and v.startswith(FAIL_MARKER):
             to_do.append(u)
 
+    # lo ya traducido en ejecuciones anteriores (o por otro script) sale de la caché persistente
+    if to_do and PERSISTENT_CACHE:
+        stored = translation_cache.get_many(to_do, **_runtime.cache_key())
+        _global_cache.update(stored)
+        to_do = [u for u in to_do if u not in stored]
+
     if to_do:
         def worker(u):
             return u, _translate_text_with_fail(u)
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            for u, out in tqdm(ex.map(worker, to_do), total=len(to_do),
-                               desc="Traduciendo únicos", unit="texto"):
-                _global_cache[u] = out
+        results = _runtime.map(worker, to_do, max_workers)
+        for u, out in tqdm(results, total=len(to_do),
+                           desc="Traduciendo únicos", unit="texto"):
+            _global_cache[u] = out
+            if on_done is not None and not out.startswith(FAIL_MARKER):
+                on_done(u, out)
 
     # mapear: vacíos quedan como "", el resto toma de la caché
     return texts.map(lambda x: _global_cache.get(x, x))
 
 
-# ===================== PROCESAMIENTO POR CSV ====================
-def process_file(target_file: Path):
-    try:
-        df = read_csv_robust(target_file)
-    except Exception as e:
-        print(f"[ERROR] Leyendo {target_file.name}: {e}")
-        return
+# ===== TRADUCIR POR ORACIONES ÚNICAS (EMPAQUETADAS) + REENSAMBLAR =====
+# Tras clean_text el texto es una sola línea con espacios simples: se corta tras . ! ?
+# salvo que siga una minúscula (abreviaturas como "p. ej.") y se reúne con " "
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?![a-záéíóúñü])")
+
+def split_sentences(text: str) -> list[str]:
+    return [p for p in SENTENCE_SPLIT_RE.split(text) if p]
+
+def _assemble(text: str, parts: list[str]) -> str:
+    """Reúne las oraciones traducidas; si alguna falló, FAIL_MARKER + original."""
+    outs = [_global_cache.get(x, x) for x in parts]
+    if any(o.startswith(FAIL_MARKER) for o in outs):
+        return f"{FAIL_MARKER}{text}"
+    return " ".join(outs)
+
+def translate_series_by_sentence(series: pd.Series, max_workers: int = 3, on_done=None) -> pd.Series:
+    """
+    Como translate_series_unique_multithread pero a nivel de oración:
+    - Segmenta cada texto único y traduce solo las oraciones que no están en caché
+      (de sesión ni persistente), empaquetadas en lotes (ver translation_batch.py).
+    - Reensambla cada texto; si alguna oración falla, el texto queda como FAIL_MARKER + original.
+    - on_done(texto, traducción) se llama en cuanto todas las oraciones de un texto están listas.
+    """
+    texts = series.fillna("").astype(str)
+    uniques = [u for u in texts.unique().tolist() if u != ""]
+    sentences_of = {u: split_sentences(u) for u in uniques}
+
+    # oraciones únicas pendientes (no en caché, o FAIL y queremos reintentar)
+    to_do = []
+    for sent in dict.fromkeys(x for parts in sentences_of.values() for x in parts):
+        v = _global_cache.get(sent)
+        if v is None or (RETRY_PREV_FAIL and v.startswith(FAIL_MARKER)):
+            to_do.append(sent)
+    if to_do and PERSISTENT_CACHE:
+        stored = translation_cache.get_many(to_do, **_runtime.cache_key())
+        _global_cache.update(stored)
+        to_do = [x for x in to_do if x not in stored]
+
+    if to_do:
+        # textos que esperan a cada oración pendiente (para avisar a on_done al completarse)
+        waiting, missing = {}, {}
+        if on_done is not None:
+            pending = set(to_do)
+            for u, parts in sentences_of.items():
+                todo_parts = pending.intersection(parts)
+                missing[u] = len(todo_parts)
+                for x in todo_parts:
+                    waiting.setdefault(x, []).append(u)
+
+        batches, worker = _runtime.batch_jobs(to_do, _translate_text_with_fail)
+        results = _runtime.map(worker, batches, max_workers)
+        for pairs, packed in tqdm(results, total=len(batches),
+                                  desc=f"Traduciendo {len(to_do)} oraciones únicas", unit="lote"):
+            _global_cache.update(pairs)
+            if packed and PERSISTENT_CACHE:
+                translation_cache.put_many(pairs, **_runtime.cache_key())   # el respaldo ya las guardó
+            for sent, _ in pairs:
+                for u in waiting.pop(sent, ()):
+                    missing[u] -= 1
+                    if missing[u] == 0:
+                        out = _assemble(u, sentences_of[u])
+                        if not out.startswith(FAIL_MARKER):
+                            on_done(u, out)
+        n_sent = sum(len(p) for p in sentences_of.values())
+        print(f"[INFO] {len(uniques)} textos -> {n_sent} oraciones, {len(to_do)} traducidas en {len(batches)} lotes")
+
+    result = {u: _assemble(u, parts) for u, parts in sentences_of.items()}
+    return texts.map(lambda x: result.get(x, x))
+
+
+# ===== PRE-FILTRO DE IDIOMA: SOLO SE TRADUCE LO QUE NO ESTÁ EN TARGET_LANG =====
+def translate_or_keep(texts: pd.Series, max_workers: int = 3, on_done=None):
+    """
+    Detecta el idioma de cada texto (ver language_id.py); los que ya están en TARGET_LANG
+    pasan tal cual y solo el resto se traduce.
+
+    Returns:
+        tuple: (textos de salida, idioma detectado por fila o None si LANG_FILTER=False)
+    """
+    translate = translate_series_by_sentence if SENTENCE_LEVEL else translate_series_unique_multithread
+    if not LANG_FILTER:
+        return translate(texts, max_workers=max_workers, on_done=on_done), None
+
+    langs = detect_series(texts)
+    foreign = ~langs.eq(TARGET_LANG)
+    print(f"[INFO] Ya en '{TARGET_LANG}': {int((~foreign).sum())} | a traducir: {int(foreign.sum())}")
+    out = texts.copy()
+    if foreign.any():
+        out[foreign] = translate(texts[foreign], max_workers=max_workers, on_done=on_done)
+    return out, langs
+
+
+# ===================== TRANSFORMACIÓN EN MEMORIA ====================
+# Limpieza hecha por _pending_texts al planificar la cola global, reutilizada por
+# transform_df: {archivo: (hash de DESCRIPTION_COL, vacías, huellas, textos pendientes)}
+_prepared: dict = {}
+
+def _clean_descriptions(df: pd.DataFrame, target_file: Path) -> pd.Series:
+    """DESCRIPTION_COL sin boilerplate y limpia: el texto que se traduce."""
+    raw = df[DESCRIPTION_COL].fillna("")
+    if STRIP_BOILERPLATE:
+        # tabla del corpus de la carpeta base del archivo (<base>/<Carrera>/<Carrera>_Merged.csv)
+        raw = strip_series(raw, DESCRIPTION_COL, "paragraph", fallback=df,
+                           corpus_dir=Path(target_file).parent.parent)
+    return raw.apply(clean_text)
+
+def _fingerprints(df: pd.DataFrame, cleaned: pd.Series) -> pd.Series:
+    """Huella de fila: descripción (+ texto sin boilerplate si STRIP_BOILERPLATE) y versión."""
+    if not STRIP_BOILERPLATE:
+        return row_fingerprints(df, [DESCRIPTION_COL], STAGE_VERSION)
+    inputs = pd.DataFrame({DESCRIPTION_COL: df[DESCRIPTION_COL], "_texto": cleaned}, index=df.index)
+    return row_fingerprints(inputs, [DESCRIPTION_COL, "_texto"], f"{STAGE_VERSION}:boilerplate")
+
+def _raw_hash(df: pd.DataFrame) -> pd.Series:
+    return pd.util.hash_pandas_object(df[DESCRIPTION_COL].astype(object).fillna("").astype(str), index=False)
+
+def _prepare(df: pd.DataFrame, target_file: Path):
+    """
+    (vacías, huellas, textos limpios) de DESCRIPTION_COL. Si _pending_texts ya limpió estas
+    mismas filas se reutiliza lo suyo, y los textos son solo los de las filas pendientes.
+    """
+    prep = _prepared.get(Path(target_file))
+    if prep is not None:
+        raw_hash, empty, fps, texts = prep
+        if df.index.isin(raw_hash.index).all() and raw_hash.loc[df.index].eq(_raw_hash(df)).all():
+            return empty.loc[df.index], fps.loc[df.index], texts
+    cleaned = _clean_descriptions(df, target_file)
+    return cleaned.eq(""), _fingerprints(df, cleaned), cleaned
+
+def _texts_for(df: pd.DataFrame, target_file: Path, cleaned: pd.Series, mask: pd.Series) -> pd.Series:
+    """Textos limpios de las filas de mask (se limpian aquí las que _prepare no trae)."""
+    idx = mask.index[mask]
+    if idx.isin(cleaned.index).all():
+        return cleaned.loc[idx]
+    return _clean_descriptions(df.loc[idx], target_file)
+
+def forget_prepared(target_file: Path) -> None:
+    """Descarta lo preparado por _pending_texts para el archivo (ya escrito)."""
+    _prepared.pop(Path(target_file), None)
+
+def _pending_mask(df: pd.DataFrame, target_file: Path, mask_desc_empty: pd.Series, fps: pd.Series) -> pd.Series:
+    """Filas con descripción a traducir: nuevas o cambiadas y, al relanzar, con FAIL o vacías."""
+    if INCREMENTAL and NEW_COL in df.columns:
+        # sin huellas previas se respeta la traducción existente (solo FAIL/vacías se reintentan)
+        mask_changed = changed_mask(target_file, STAGE_NAME, df, fps, missing=not RETRY_ONLY_FAILED_FROM_CSV)
+    else:
+        mask_changed = pd.Series(True, index=df.index)
+
+    if NEW_COL in df.columns and RETRY_ONLY_FAILED_FROM_CSV:
+        mask_fail = df[NEW_COL].astype(str).str.startswith(FAIL_MARKER, na=False)
+        mask_empty_final = df[NEW_COL].isna() | df[NEW_COL].eq("")
+        # pendientes = filas con descripción (no vacías) y final FAIL, vacío o desactualizado
+        return ~mask_desc_empty & (mask_fail | mask_empty_final | mask_changed)
+    return ~mask_desc_empty & mask_changed
+
+def transform_df(df: pd.DataFrame, target_file: Path, queue=None):
+    """
+    Traduce DESCRIPTION_COL a NEW_COL en las filas pendientes (nuevas, con descripción
+    cambiada o, al relanzar, con FAIL_MARKER / vacías) y rellena LANG_COL si LANG_FILTER.
+    queue: cola global ya traducida (ver build_global_queue) o None.
 
+    Returns:
+        tuple: (df con NEW_COL / LANG_COL, huellas de la descripción limpia,
+                True si se tradujo, restauró del punto de control o detectó algún idioma)
+    """
     if DESCRIPTION_COL not in df.columns:
         print(f"[WARN] No hay columna '{DESCRIPTION_COL}' en {target_file.name}")
-        return
+        return df, None, False
 
     total = len(df)
     print(f"\n[INFO] Procesando {target_file.name} ({total} filas)")
 
-    cleaned = df[DESCRIPTION_COL].fillna("").apply(clean_text)
-    mask_desc_empty = cleaned.eq("")  # filas sin descripción -> no tocar
+    # filas sin descripción -> no tocar; huellas: filas nuevas o con descripción distinta
+    mask_desc_empty, fps, cleaned = _prepare(df, target_file)
+    cp = get_checkpoint(target_file, STAGE_NAME, _checkpoint_meta()) if CHECKPOINT else None
 
     if NEW_COL in df.columns and RETRY_ONLY_FAILED_FROM_CSV:
-        col = df[NEW_COL].astype(str) if NEW_COL in df.columns else pd.Series("", index=df.index)
-        mask_fail  = col.str.startswith(FAIL_MARKER, na=False)
-        mask_empty_final = df[NEW_COL].isna() | df[NEW_COL].eq("") if NEW_COL in df.columns else pd.Series(True, index=df.index)
-        # pendientes = filas con descripción (no vacías) y final FAIL o vacío
-        mask_pending = (~mask_desc_empty) & (mask_fail | mask_empty_final)
+        mask_pending = _pending_mask(df, target_file, mask_desc_empty, fps)
 
         n_pending = int(mask_pending.sum())
+        n_restored = 0
         n_skip = int(len(df) - n_pending)
         print(f"[INFO] Reintentando solo pendientes (con descripción): {n_pending} filas | conservando {n_skip} restantes")
 
         if n_pending > 0:
-            translated_pending = translate_series_unique_multithread(
-                cleaned[mask_pending], max_workers=MAX_WORKERS
-            )
-            if NEW_COL not in df.columns:
-                df[NEW_COL] = ""
+            texts = _texts_for(df, target_file, cleaned, mask_pending)
+            mask_pending, n_restored = _restore_checkpoint(df, texts, mask_pending, cp)
+            translated_pending, langs = _translate_checkpointed(texts[mask_pending[texts.index]], cp, queue)
             df.loc[mask_pending, NEW_COL] = translated_pending
+            _set_langs(df, mask_pending, langs)
         else:
             print("[INFO] No hay pendientes que reintentar.")
+        mask_done = mask_pending
     else:
-        # Pase completo: traducir solo filas con descripción
-        translated = translate_series_unique_multithread(
-            cleaned[~mask_desc_empty], max_workers=MAX_WORKERS
-        )
+        # Pase completo: traducir solo filas con descripción (y cambiadas, si es incremental)
+        mask_todo = _pending_mask(df, target_file, mask_desc_empty, fps)
+        texts = _texts_for(df, target_file, cleaned, mask_todo)
+        mask_todo, n_restored = _restore_checkpoint(df, texts, mask_todo, cp)
+        translated, langs = _translate_checkpointed(texts[mask_todo[texts.index]], cp, queue)
         # crear/actualizar solo en las filas con descripción
         if NEW_COL not in df.columns:
             df[NEW_COL] = ""
-        df.loc[~mask_desc_empty, NEW_COL] = translated
+        df.loc[mask_todo, NEW_COL] = translated
+        _set_langs(df, mask_todo, langs)
+        mask_done = mask_todo
+
+    # Filas traducidas antes de existir LANG_COL: se detecta su idioma una sola vez
+    n_backfill = 0
+    if LANG_FILTER:
+        lang_col = df[LANG_COL] if LANG_COL in df.columns else pd.Series(pd.NA, index=df.index, dtype=object)
+        mask_backfill = ~mask_desc_empty & ~mask_done & (lang_col.isna() | lang_col.astype(str).eq(""))
+        n_backfill = int(mask_backfill.sum())
+        if n_backfill:
+            _set_langs(df, mask_backfill, detect_series(_texts_for(df, target_file, cleaned, mask_backfill)))
+
+    return df, fps, bool(mask_done.any() or n_restored or n_backfill)
+
+def _checkpoint_meta() -> dict:
+    """Configuración con la que se tradujo: otro valor invalida el punto de control."""
+    return {"version": STAGE_VERSION, **_runtime.cache_key()}
+
+def _restore_checkpoint(df: pd.DataFrame, texts: pd.Series, mask: pd.Series, cp):
+    """
+    Copia a NEW_COL las filas de mask ya traducidas en una ejecución interrumpida.
+    texts: textos limpios de las filas de mask.
 
-    # Guardar
+    Returns:
+        tuple: (mask sin las filas restauradas, número de filas restauradas)
+    """
+    if cp is None or not mask.any():
+        return mask, 0
+    saved = cp.restore(texts)
+    hit = saved.notna()
+    n = int(hit.sum())
+    if n == 0:
+        return mask, 0
+    idx = hit[hit].index
+    if NEW_COL not in df.columns:
+        df[NEW_COL] = ""
+    df.loc[idx, NEW_COL] = saved[hit]
+    if LANG_COL in df.columns:
+        df[LANG_COL] = df[LANG_COL].astype(object)
+        df.loc[idx, LANG_COL] = ""   # se vuelve a detectar en el relleno de LANG_COL
+    print(f"[INFO] Restauradas {n} filas del punto de control {cp.path.name}")
+    mask = mask.copy()
+    mask[idx] = False
+    return mask, n
+
+def _translate_checkpointed(texts: pd.Series, cp, queue=None):
+    """
+    translate_or_keep guardando cada traducción terminada en el punto de control.
+    Lo ya traducido por la cola global (ver translation_queue.py) se toma de ahí.
+    """
+    def translate(rest):
+        if rest.empty:
+            return rest, None
+        if cp is None:
+            return translate_or_keep(rest, max_workers=MAX_WORKERS)
+        try:
+            return translate_or_keep(rest, max_workers=MAX_WORKERS, on_done=cp.add)
+        finally:
+            cp.flush()
+
+    if queue is None:
+        return translate(texts)
+    return queue.apply(texts, translate, with_langs=LANG_FILTER)
+
+def _set_langs(df: pd.DataFrame, mask: pd.Series, langs) -> None:
+    if langs is None:
+        return
+    if LANG_COL not in df.columns:
+        df[LANG_COL] = ""
+    df[LANG_COL] = df[LANG_COL].astype(object)
+    df.loc[mask, LANG_COL] = langs
+
+
+# ===================== COLA GLOBAL ENTRE CARRERAS ====================
+def _pending_texts(target_file: Path) -> pd.Series:
+    """Textos limpios pendientes del archivo que no están en su punto de control."""
     try:
-        df.to_csv(target_file, index=False, encoding="utf-8")
-    except Exception:
-        df.to_csv(target_file, index=False, encoding="utf-8-sig")
+        df = read_csv_robust(target_file, usecols=lambda c: c in (KEY_COL, DESCRIPTION_COL, NEW_COL))
+    except Exception as e:
+        print(f"[ERROR] Leyendo {target_file.name}: {e}")
+        return pd.Series(dtype=object)
+    if DESCRIPTION_COL not in df.columns:
+        return pd.Series(dtype=object)
+    cleaned = _clean_descriptions(df, target_file)
+    empty, fps = cleaned.eq(""), _fingerprints(df, cleaned)
+    texts = cleaned[_pending_mask(df, target_file, empty, fps)]
+    # transform_df reutiliza esta limpieza (la tabla de boilerplate no se vuelve a aplicar)
+    _prepared[Path(target_file)] = (_raw_hash(df), empty, fps, texts)
+    if CHECKPOINT and not texts.empty:
+        # lo guardado en el punto de control del archivo se restaura en transform_df
+        texts = texts[get_checkpoint(target_file, STAGE_NAME, _checkpoint_meta()).restore(texts).isna()]
+    return texts
+
+def build_global_queue(target_files):
+    """
+    Traduce una vez los pendientes de todos los archivos (ver translation_queue.py).
+    La cola devuelta se pasa a process_file / transform_df y se cierra con finish().
+    """
+    return translation_queue.plan_global_queue(
+        target_files, _pending_texts, _translate_checkpointed, STAGE_NAME,
+        meta=_checkpoint_meta() if CHECKPOINT else None,
+        detect=detect_series if LANG_FILTER else None,
+    )
+
+
+# ===================== PROCESAMIENTO POR CSV ====================
+def process_file(target_file: Path, queue=None):
+    if STREAMING:
+        try:
+            stream_file(target_file, [(STAGE_NAME, lambda c: transform_df(c, target_file, queue))], CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {target_file.name}: {e}")
+            return
+        finally:
+            forget_prepared(target_file)
+        clear_checkpoint(target_file, STAGE_NAME)
+        return
+
+    try:
+        df = read_csv_robust(target_file)
+    except Exception as e:
+        print(f"[ERROR] Leyendo {target_file.name}: {e}")
+        return
+
+    df, fps, changed = transform_df(df, target_file, queue)
+    forget_prepared(target_file)
+    if not changed:
+        if fps is not None:
+            save_fingerprints(target_file, STAGE_NAME, df, fps)
+        clear_checkpoint(target_file, STAGE_NAME)
+        return
+
+    # Guardar
+    write_csv_robust(df, target_file)
+    save_fingerprints(target_file, STAGE_NAME, df, fps)
+    clear_checkpoint(target_file, STAGE_NAME)   # lo traducido ya está en el CSV
 
     print(f"[OK] Guardado en {target_file}\n")
 
@@ -373,6 +701,10 @@ def process_all():
     if not BASE_GLOBAL.exists():
         raise FileNotFoundError(f"No existe la ruta base: {BASE_GLOBAL}")
 
+    if run_stage_on_registry(USE_GLOBAL_REGISTRY, process_file, BASE_GLOBAL, [NEW_COL, LANG_COL], ONLY_THIS_CAREER):
+        _runtime.print_stats()
+        return
+
     carrera_dirs = [p for p in BASE_GLOBAL.iterdir() if p.is_dir()]
     if ONLY_THIS_CAREER:
         carrera_dirs = [d for d in carrera_dirs if d.name == ONLY_THIS_CAREER]
@@ -380,13 +712,22 @@ def process_all():
         print("[WARN] No se encontraron carpetas de carrera para procesar.")
         return
 
+    targets = []
     for carrera_dir in sorted(carrera_dirs, key=lambda x: x.name.lower()):
         expected_name = f"{carrera_dir.name}_Merged.csv"
         target_file = carrera_dir / expected_name
         if not target_file.exists():
             print(f"[SKIP] No existe {expected_name} en {carrera_dir.name}")
             continue
-        process_file(target_file)
+        targets.append(target_file)
+
+    queue = build_global_queue(targets) if GLOBAL_QUEUE else None
+    for target_file in targets:
+        process_file(target_file, queue)
+    if queue is not None:
+        queue.finish()
+
+    _runtime.print_stats()
 
 
 # =========================== EJECUCIÓN ==========================
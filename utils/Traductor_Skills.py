@@ -1,33 +1,74 @@
 # =============== TRADUCIR COLUMNA "skills" A ESPAÑOL (salida: "item1, item2, ...") ===============
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-import threading
+from collections import Counter
+import sys
 import time
-import ast
-import re
 import pandas as pd
 from tqdm.auto import tqdm
-from deep_translator import GoogleTranslator
+# Lectura/escritura CSV compartida (ver csv_loader.py)
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .skills_format import parse_skills_series
+    from .fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from .streaming import stream_file
+    from . import translation_cache
+    from .language_id import detect_series
+    from .translation_runtime import StageRuntime
+    from . import skill_glossary
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from skills_format import parse_skills_series
+    from fingerprints import row_fingerprints, changed_mask, save_fingerprints
+    from streaming import stream_file
+    import translation_cache
+    from language_id import detect_series
+    from translation_runtime import StageRuntime
+    import skill_glossary
 
 # ---------------- CONFIG ----------------
 BASE_GLOBAL = Path("/content/drive/MyDrive/todas_las_plataformas")
 SKILLS_COL = "skills"
 ONLY_THIS_CAREER = None          # p.ej., "Administración_de_Empresas" o None para todas
+USE_GLOBAL_REGISTRY = False      # True: traduce las skills una vez por job_id en el registro global (ver job_registry.py)
+INCREMENTAL = True               # omite filas ya traducidas por esta versión (ver fingerprints.py)
+STAGE_VERSION = 1                # súbelo al cambiar la traducción: retraduce todo
+STAGE_NAME = "traductor_skills"
+STREAMING = False                # True: procesa el CSV por bloques de CHUNK_ROWS filas (ver streaming.py)
+CHUNK_ROWS = 2000
 
-MAX_WORKERS = 3                  # 2–4 si no te limita
+MAX_WORKERS = 3                  # 2–4 si no te limita (solo con ADAPTIVE_CONCURRENCY = False)
+ADAPTIVE_CONCURRENCY = True      # concurrencia AIMD compartida (ver translation_scheduler.py)
 RETRIES_PER_ITEM = 3             # reintentos por skill
 RETRY_SLEEP_BASE = 1.5           # 1.5s, 3s, 4.5s ...
+BATCH_PACKING = True             # varias skills por petición (ver translation_batch.py)
 
-# ---------------- THREAD-LOCAL TRANSLATOR ----------------
-_thread_local = threading.local()
+# Caché persistente entre ejecuciones y scripts (ver translation_cache.py)
+PERSISTENT_CACHE = True
+SOURCE_LANG = "auto"
+TARGET_LANG = "es"
+BACKEND_NAME = "google"          # "google", "marian_ct2" o "argos" (ver translation_backends.py); parte de la clave de caché
+
+# Pre-filtro de idioma local (ver language_id.py): las skills de celdas ya en TARGET_LANG no se traducen
+LANG_FILTER = True
+
+# Glosario (ver skill_glossary.py y config/skills_glossary.yml): términos que no se traducen
+# (SQL, Excel, Scrum...) y traducciones fijas se resuelven sin llamar al backend
+GLOSSARY = True
+GLOSSARY_SUGGESTIONS = True      # al final, propone las skills traducidas más frecuentes
+
+# ---------------- BACKEND DE TRADUCCIÓN ----------------
 _global_cache: dict[str, str] = {}  # skill_original -> skill_traducida
+_item_counts = Counter()            # apariciones de cada skill enviada a traducir (sugerencias de glosario)
+_failed_items: set[str] = set()     # skills cuya traducción falló en esta ejecución (se conservan en original)
+_runtime = StageRuntime(sys.modules[__name__])   # backend / planificador / clave de caché (ver translation_runtime.py)
 
-def _get_translator():
-    gt = getattr(_thread_local, "gt", None)
-    if gt is None:
-        gt = GoogleTranslator(source="auto", target="es")
-        _thread_local.gt = gt
-    return gt
+def _print_run_stats() -> None:
+    """Estadísticas de caché / planificador y sugerencias de glosario al final de la ejecución."""
+    if GLOSSARY and GLOSSARY_SUGGESTIONS:
+        skill_glossary.write_suggestions(_item_counts, _global_cache)
+    _runtime.print_stats()
 
 def _translate_item(text: str) -> str:
     """Traduce un ítem (string corto). Si falla tras reintentos, devuelve el original."""
@@ -43,73 +84,41 @@ def _translate_item(text: str) -> str:
     delay = RETRY_SLEEP_BASE
     for _ in range(RETRIES_PER_ITEM):
         try:
-            out = _get_translator().translate(t)
+            out = _runtime.call(t)
             if isinstance(out, str) and out.strip():
                 _global_cache[t] = out.strip()
+                if PERSISTENT_CACHE:
+                    translation_cache.put(t, _global_cache[t], **_runtime.cache_key())
                 return _global_cache[t]
             raise RuntimeError("empty result")
         except Exception:
-            time.sleep(delay)
+            if not ADAPTIVE_CONCURRENCY:   # con el planificador la pausa es global
+                time.sleep(delay)
             delay += RETRY_SLEEP_BASE
 
-    _global_cache[t] = t  # conserva original si falló todo
+    _global_cache[t] = t  # conserva original si falló todo (no se persiste)
+    _failed_items.add(t)  # su fila no guarda huella: se reintenta en la siguiente ejecución
     return t
 
-# ---------------- LECTURA ROBUSTA ----------------
-def read_csv_robust(path: Path) -> pd.DataFrame:
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, low_memory=False)
-        except Exception:
-            pass
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            return pd.read_csv(path, encoding=enc, sep=";", low_memory=False)
-        except Exception:
-            pass
-    raise RuntimeError(f"No se pudo leer el CSV: {path}")
-
-# ---------------- PARSEAR COLUMNA SKILLS ----------------
-BRACKETS_EMPTY_RE = re.compile(r"^\s*\[\s*\]\s*$")
-
-def parse_skills_cell(cell) -> list[str] | None:
-    """
-    Devuelve lista de strings o None si la celda está vacía.
-    Trata como vacío: NaN, "", "[]", "[   ]".
-    Si viene como lista Python en string -> ast.literal_eval.
-    Si no, intenta split por comas.
-    """
-    if cell is None or (isinstance(cell, float) and pd.isna(cell)):
-        return None
-    s = str(cell).strip()
-    if s == "" or BRACKETS_EMPTY_RE.match(s):
-        return None
-
-    # ¿es una lista literal? (soporta comillas simples/dobles estilo Python/JSON)
-    if s.startswith("[") and s.endswith("]"):
-        try:
-            obj = ast.literal_eval(s)
-            if isinstance(obj, list):
-                out = []
-                for x in obj:
-                    if x is None:
-                        continue
-                    t = str(x).strip()
-                    if t != "":
-                        out.append(t)
-                return out if out else None
-        except Exception:
-            pass
-
-    # fallback: separar por comas
-    parts = [p.strip() for p in s.split(",")]
-    parts = [p for p in parts if p]
-    return parts if parts else None
-
+# ---------------- SERIALIZAR SKILLS ----------------
 def format_skills_plain(skills: list[str]) -> str:
     """Serializa como 'item1, item2, item3' (sin comillas ni corchetes)."""
     return ", ".join(skills)
 
+# ---------------- TRADUCCIÓN EMPAQUETADA ----------------
+def _translate_packed(items: list[str], max_workers: int) -> None:
+    """Traduce los ítems en lotes (una petición por lote) y los deja en _global_cache."""
+    batches, worker = _runtime.batch_jobs(items, _translate_item)
+    n_fallback = 0
+    results = _runtime.map(worker, batches, max_workers)
+    for pairs, packed in tqdm(results, total=len(batches),
+                              desc=f"Traduciendo {len(items)} skills en lotes", unit="lote"):
+        _global_cache.update(pairs)
+        if packed and PERSISTENT_CACHE:
+            translation_cache.put_many(pairs, **_runtime.cache_key())   # el respaldo ya las guardó
+        n_fallback += 0 if packed else len(pairs)
+    print(f"[INFO] Skills: {len(items)} en {len(batches)} peticiones empaquetadas; {n_fallback} por ítem")
+
 # ---------------- TRADUCCIÓN ÚNICOS + MAPEO ----------------
 def translate_skills_series(series: pd.Series, max_workers: int = 3) -> pd.Series:
     """
@@ -117,12 +126,23 @@ def translate_skills_series(series: pd.Series, max_workers: int = 3) -> pd.Serie
     - Traduce solo los ítems únicos (multihilo + caché).
     - Reconstruye cada celda preservando el orden; vacías -> "" (celda en blanco).
     """
-    parsed = series.apply(parse_skills_cell)
+    return _translate_skills(series, max_workers)[0]
 
-    # recolecta ítems únicos a traducir
+def _translate_skills(series: pd.Series, max_workers: int) -> tuple[pd.Series, pd.Series]:
+    """translate_skills_series + máscara de celdas con alguna skill cuya traducción falló."""
+    parsed = parse_skills_series(series)
+
+    # Idioma por celda (la skill suelta es muy corta para detectarlo de forma fiable)
+    if LANG_FILTER:
+        cell_lang = detect_series(parsed.map(lambda lst: ", ".join(lst) if lst else None))
+        skip = cell_lang.eq(TARGET_LANG)
+    else:
+        skip = pd.Series(False, index=parsed.index)
+
+    # recolecta ítems únicos a traducir (los de celdas ya en TARGET_LANG se conservan)
     uniq_items = []
     seen = set()
-    for lst in parsed:
+    for lst in parsed[~skip]:
         if not lst:
             continue
         for it in lst:
@@ -130,48 +150,108 @@ def translate_skills_series(series: pd.Series, max_workers: int = 3) -> pd.Serie
                 seen.add(it)
                 uniq_items.append(it)
 
+    # glosario: términos fijos o que no se traducen, sin pasar por el backend ni la caché
+    if GLOSSARY:
+        _item_counts.update(it for lst in parsed[~skip] if lst for it in lst)
+        n_gloss = 0
+        for u in uniq_items:
+            if u not in _global_cache:
+                hit = skill_glossary.lookup(u)
+                if hit is not None:
+                    _global_cache[u] = hit
+                    n_gloss += 1
+        if n_gloss:
+            print(f"[INFO] Glosario: {n_gloss} de {len(uniq_items)} skills únicas resueltas sin traducir")
+
+    # lo ya traducido en ejecuciones anteriores (o por otro script) sale de la caché persistente
+    pending = [u for u in uniq_items if u not in _global_cache]
+    if pending and PERSISTENT_CACHE:
+        stored = translation_cache.get_many(pending, **_runtime.cache_key())
+        _global_cache.update(stored)
+        pending = [u for u in pending if u not in stored]
+
     # traduce únicos pendientes
-    if uniq_items:
+    if pending and BATCH_PACKING:
+        _translate_packed(pending, max_workers)
+    elif pending:
         def worker(u):
             return u, _translate_item(u)
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            for u, out in tqdm(ex.map(worker, uniq_items), total=len(uniq_items),
-                               desc="Traduciendo skills únicas", unit="skill"):
-                _global_cache[u] = out
+        results = _runtime.map(worker, pending, max_workers)
+        for u, out in tqdm(results, total=len(pending),
+                           desc="Traduciendo skills únicas", unit="skill"):
+            _global_cache[u] = out
 
     # reconstruye celdas
-    out_series = []
-    for lst in parsed:
+    out_series, failed = [], []
+    for lst, keep in zip(parsed, skip):
         if not lst:
             out_series.append("")  # celda vacía
+        elif keep:
+            out_series.append(format_skills_plain(lst))
         else:
             translated = [_global_cache.get(x, x) for x in lst]
             out_series.append(format_skills_plain(translated))
+        failed.append(bool(lst) and not keep and any(x.strip() in _failed_items for x in lst))
 
-    return pd.Series(out_series, index=series.index)
+    return pd.Series(out_series, index=series.index), pd.Series(failed, index=series.index)
+
+# ---------------- TRANSFORMACIÓN EN MEMORIA ----------------
+def transform_df(df: pd.DataFrame, path: Path):
+    """
+    Reemplaza SKILLS_COL por su traducción ('item1, item2, ...') en las filas nuevas o
+    cambiadas; las skills del glosario o ya en TARGET_LANG no pasan por el backend.
+
+    Returns:
+        tuple: (df, huellas de las skills traducidas (NA en filas con alguna skill fallida,
+                que así se reintentan) o None si no había pendientes, True si tradujo)
+    """
+    if SKILLS_COL not in df.columns:
+        print(f"[WARN] No hay columna '{SKILLS_COL}' en {path.name}")
+        return df, None, False
+
+    total = len(df)
+    # Etapa in situ: la huella guardada es la de las skills ya traducidas
+    if INCREMENTAL:
+        todo = changed_mask(path, STAGE_NAME, df, row_fingerprints(df, [SKILLS_COL], STAGE_VERSION))
+    else:
+        todo = pd.Series(True, index=df.index)
+    n_todo = int(todo.sum())
+    print(f"\n[INFO] Procesando {path.name} ({n_todo}/{total} filas nuevas o cambiadas)")
+    if n_todo == 0:
+        return df, None, False
+
+    df[SKILLS_COL] = df[SKILLS_COL].astype(object)
+    translated, failed = _translate_skills(df.loc[todo, SKILLS_COL], max_workers=MAX_WORKERS)
+    df.loc[todo, SKILLS_COL] = translated
+    fps = row_fingerprints(df, [SKILLS_COL], STAGE_VERSION).astype(object)
+    if failed.any():
+        # Sin huella las filas con alguna skill sin traducir se vuelven a procesar la próxima vez
+        fps[failed[failed].index] = pd.NA
+        print(f"[WARN] {int(failed.sum())} filas con skills sin traducir; se reintentarán")
+    return df, fps, True
 
 # ---------------- PROCESO POR ARCHIVO ----------------
 def process_file(path: Path):
+    if STREAMING:
+        try:
+            stream_file(path, [(STAGE_NAME, lambda c: transform_df(c, path))], CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {path.name}: {e}")
+        return
+
     try:
         df = read_csv_robust(path)
     except Exception as e:
         print(f"[ERROR] Leyendo {path.name}: {e}")
         return
 
-    if SKILLS_COL not in df.columns:
-        print(f"[WARN] No hay columna '{SKILLS_COL}' en {path.name}")
+    df, fps, changed = transform_df(df, path)
+    if not changed:
         return
 
-    total = len(df)
-    print(f"\n[INFO] Procesando {path.name} ({total} filas)")
-
-    df[SKILLS_COL] = translate_skills_series(df[SKILLS_COL], max_workers=MAX_WORKERS)
-
     # guardar
-    try:
-        df.to_csv(path, index=False, encoding="utf-8")
-    except Exception:
-        df.to_csv(path, index=False, encoding="utf-8-sig")
+    write_csv_robust(df, path)
+    save_fingerprints(path, STAGE_NAME, df, fps)
 
     print(f"[OK] Guardado en {path}.\n")
 
@@ -181,6 +261,10 @@ def run_all():
     if not base.exists():
         raise FileNotFoundError(f"No existe la ruta base: {base}")
 
+    if run_stage_on_registry(USE_GLOBAL_REGISTRY, process_file, base, [SKILLS_COL], ONLY_THIS_CAREER):
+        _print_run_stats()
+        return
+
     dirs = [p for p in base.iterdir() if p.is_dir()]
     if ONLY_THIS_CAREER:
         dirs = [d for d in dirs if d.name == ONLY_THIS_CAREER]
@@ -195,5 +279,8 @@ def run_all():
             continue
         process_file(expected)
 
+    _print_run_stats()
+
 # ---------------- EJECUCIÓN ----------------
-run_all()
+if __name__ == "__main__":
+    run_all()
@@ -0,0 +1,226 @@
+"""
+Detector de texto repetido de reclutamiento (boilerplate): declaraciones de igualdad de
+oportunidades, "quiénes somos", beneficios genéricos, instrucciones para postular...
+
+Aprende del corpus de la etapa que lo llama (los '<Carrera>/<Carrera>_Merged.csv' de la
+carpeta base del archivo que procesa) una tabla de frecuencias de párrafos por hash: un
+párrafo normalizado es boilerplate si aparece en ofertas de al menos MIN_TITLES
+títulos de puesto distintos. Contar títulos y no filas evita marcar como boilerplate el
+contenido real de una misma oferta publicada varias veces o en varias ciudades.
+
+Traductor_Descripcion lo quita de 'description' antes de limpiar y traducir (unidad:
+párrafo = línea) y Extract_Habilidades de 'description_final' antes de buscar
+habilidades (unidad: oración, porque tras la limpieza el texto es una sola línea).
+Ambas etapas incluyen el texto ya sin boilerplate en su huella de fila (ver
+fingerprints.py), así que un cambio en la tabla reprocesa justo las filas afectadas.
+
+La tabla se aprende recorriendo el corpus por bloques de CHUNK_ROWS filas (solo se
+acumulan pares de hashes segmento/título, no el texto) y se guarda en la carpeta de
+huellas del corpus ('<base>/.fingerprints/boilerplate.<columna>.<unidad>.json'). Las
+siguientes ejecuciones la reutilizan mientras no cambie la lista de archivos del corpus
+ni la configuración y no tenga más de MAX_AGE_DAYS días.
+"""
+
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+try:
+    from .csv_loader import iter_csv_chunks
+    from .fingerprints import SIDECAR_DIRNAME
+except ImportError:
+    from csv_loader import iter_csv_chunks
+    from fingerprints import SIDECAR_DIRNAME
+
+# ===================== CONFIGURACIÓN =====================
+TITLE_COL = "job_title"
+MIN_CHARS = 60               # párrafos más cortos (títulos, "Beneficios:") nunca cuentan
+MIN_TITLES = 3               # títulos de puesto distintos en los que debe repetirse
+MAX_STRIP_FRACTION = 0.8     # si quitaría más del 80% del texto, se deja entero
+CHUNK_ROWS = 5000            # filas por bloque al recorrer el corpus
+MAX_AGE_DAYS = 7             # la tabla guardada se vuelve a aprender pasado este tiempo
+# ==========================================================
+
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+WS_RE = re.compile(r"\s+")
+BULLET_RE = re.compile(r"^\s*[•\-\–\—\·\‣\∙\●\○\▪\▫\►\➤*]")   # viñetas: requisitos/funciones, contenido real
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?![a-záéíóúñü])")  # mismo corte que Traductor_Descripcion
+UNITS = {
+    "paragraph": (lambda s: s.split("\n"), "\n"),
+    "sentence": (lambda s: SENTENCE_SPLIT_RE.split(s), " "),
+}
+
+# Tablas ya aprendidas en este proceso: {(carpeta del corpus, columna, unidad): hashes de boilerplate}
+_TABLES: dict = {}
+
+# ---------------- Segmentos ----------------
+def _norm(segment: str) -> str:
+    s = HTML_TAG_RE.sub(" ", unicodedata.normalize("NFC", segment))
+    return WS_RE.sub(" ", s).strip().lower()
+
+def _countable(norm: pd.Series) -> pd.Series:
+    return (norm.str.len() >= MIN_CHARS) & ~norm.str.match(BULLET_RE)
+
+def _hash(norm: pd.Series) -> np.ndarray:
+    return pd.util.hash_array(norm.to_numpy(dtype=object))
+
+# ---------------- Aprendizaje ----------------
+def _count_titles(frames, col: str, unit: str) -> pd.Series | None:
+    """
+    Tabla de frecuencias sobre una secuencia de bloques de filas: hash del segmento ->
+    número de títulos de puesto distintos en los que aparece. None si ningún bloque
+    tiene la columna.
+    """
+    split, _ = UNITS[unit]
+    seen_docs = np.empty(0, dtype=np.uint64)      # cada texto cuenta una vez (con su primer título)
+    pairs = pd.DataFrame({"seg": np.empty(0, dtype=np.uint64), "title": np.empty(0, dtype=np.uint64)})
+    found = False
+    for df in frames:
+        if col not in df.columns:
+            continue
+        found = True
+        docs = df[col].dropna().astype(str)
+        titles = (df.loc[docs.index, TITLE_COL].fillna("").astype(str).str.strip().str.lower()
+                  if TITLE_COL in df.columns else docs)          # sin título: cada texto distinto cuenta
+        docs = pd.DataFrame({"doc": docs.to_numpy(), "title": titles.to_numpy()}).drop_duplicates("doc")
+        doc_hash = _hash(docs["doc"])
+        new = ~np.isin(doc_hash, seen_docs)
+        docs = docs[new]
+        seen_docs = np.concatenate([seen_docs, doc_hash[new]])
+        if docs.empty:
+            continue
+        segs = docs["doc"].map(split).explode().dropna()
+        norm = segs.map(_norm)
+        keep = _countable(norm)
+        pairs = pd.concat([pairs, pd.DataFrame({
+            "seg": _hash(norm[keep]),
+            "title": _hash(docs["title"].loc[norm[keep].index]),
+        })], ignore_index=True).drop_duplicates()
+    return pairs.groupby("seg").size() if found else None
+
+def learn_table(df: pd.DataFrame, col: str, unit: str = "paragraph") -> pd.Series:
+    """
+    Tabla de frecuencias: hash del segmento -> número de títulos de puesto distintos
+    en los que aparece (solo segmentos contables, ver MIN_CHARS).
+    """
+    table = _count_titles([df], col, unit)
+    return table if table is not None else pd.Series(dtype=np.int64)
+
+def _corpus_files(corpus_dir) -> list:
+    return sorted(Path(corpus_dir).glob("*/*_Merged.csv"))
+
+def _corpus_chunks(files, col: str):
+    """Bloques (col, TITLE_COL) de los archivos del corpus, sin cargarlo entero."""
+    for path in files:
+        try:
+            yield from iter_csv_chunks(path, CHUNK_ROWS, usecols=lambda c: c in (col, TITLE_COL))
+        except Exception as e:
+            print(f"[WARN] Boilerplate: no se pudo leer {path.name}: {e}")
+
+# ---------------- Tabla guardada ----------------
+def _table_path(corpus_dir, col: str, unit: str) -> Path:
+    return Path(corpus_dir) / SIDECAR_DIRNAME / f"boilerplate.{col}.{unit}.json"
+
+def _signature(corpus_dir, files) -> dict:
+    """Lo que invalida la tabla guardada: archivos del corpus y configuración."""
+    return {
+        "files": [p.relative_to(corpus_dir).as_posix() for p in files],
+        "title_col": TITLE_COL, "min_chars": MIN_CHARS, "min_titles": MIN_TITLES,
+    }
+
+def _load_table(corpus_dir, col: str, unit: str, signature: dict) -> set | None:
+    path = _table_path(corpus_dir, col, unit)
+    try:
+        saved = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if saved.get("signature") != signature or time.time() - saved.get("learned", 0) > MAX_AGE_DAYS * 86400:
+        return None
+    # los hashes uint64 se guardan como texto (JSON no garantiza enteros de 64 bits)
+    return {int(h) for h in saved.get("hashes", [])}
+
+def _save_table(corpus_dir, col: str, unit: str, signature: dict, table: set) -> None:
+    path = _table_path(corpus_dir, col, unit)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"signature": signature, "learned": time.time(),
+                                   "hashes": sorted(str(h) for h in table)}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        tmp.unlink(missing_ok=True)
+        print(f"[WARN] Boilerplate: no se pudo guardar la tabla en {path}: {e}")
+
+def get_table(col: str, unit: str = "paragraph", fallback: pd.DataFrame | None = None,
+              corpus_dir=None) -> set:
+    """
+    Hashes de los segmentos boilerplate de 'col', aprendidos del corpus de corpus_dir
+    (carpeta con '<Carrera>/<Carrera>_Merged.csv') o, si no hay corpus ahí, del DataFrame
+    'fallback' (p.ej. el registro global de ofertas únicas). La tabla del corpus se
+    guarda junto a las huellas y se reutiliza entre procesos (ver MAX_AGE_DAYS).
+    """
+    key = (str(Path(corpus_dir).resolve()) if corpus_dir else None, col, unit)
+    if key in _TABLES:
+        return _TABLES[key]
+
+    files = _corpus_files(corpus_dir) if corpus_dir else []
+    signature = _signature(corpus_dir, files) if files else None
+    if files:
+        cached = _load_table(corpus_dir, col, unit, signature)
+        if cached is not None:
+            _TABLES[key] = cached
+            print(f"[INFO] Boilerplate '{col}' ({unit}): {len(cached)} segmentos repetidos "
+                  f"(tabla guardada en {_table_path(corpus_dir, col, unit).name})")
+            return cached
+
+    table = _count_titles(_corpus_chunks(files, col), col, unit) if files else None
+    from_corpus = table is not None
+    if table is None:
+        if fallback is None or col not in fallback.columns:
+            return set()
+        table = learn_table(fallback, col, unit)
+    _TABLES[key] = set(table.index[table >= MIN_TITLES].tolist())
+    if from_corpus:
+        _save_table(corpus_dir, col, unit, signature, _TABLES[key])
+    print(f"[INFO] Boilerplate '{col}' ({unit}): {len(_TABLES[key])} segmentos repetidos "
+          f"en >= {MIN_TITLES} títulos, de {len(table)} distintos")
+    return _TABLES[key]
+
+# ---------------- Limpieza ----------------
+def strip_text(text: str, table: set, unit: str = "paragraph") -> str:
+    """Quita los segmentos boilerplate del texto (o nada si quedaría casi vacío)."""
+    if not isinstance(text, str) or not text or not table:
+        return text
+    split, joiner = UNITS[unit]
+    segs = split(text)
+    norm = [_norm(s) for s in segs]
+    hashes = pd.util.hash_array(np.array(norm, dtype=object)).tolist()
+    drop = [len(n) >= MIN_CHARS and not BULLET_RE.match(n) and h in table
+            for n, h in zip(norm, hashes)]
+    if not any(drop):
+        return text
+    removed = sum(len(s) for s, d in zip(segs, drop) if d)
+    if removed > MAX_STRIP_FRACTION * len(text):
+        return text
+    return joiner.join(s for s, d in zip(segs, drop) if not d)
+
+def strip_series(series: pd.Series, col: str, unit: str = "paragraph",
+                 fallback: pd.DataFrame | None = None, corpus_dir=None) -> pd.Series:
+    """strip_text una vez por valor distinto de la serie; informa cuánto texto se quitó."""
+    table = get_table(col, unit, fallback, corpus_dir)
+    if not table or series.empty:
+        return series
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+    stripped = [strip_text(u, table, unit) for u in uniques]
+    before = sum(len(u) for u in uniques if isinstance(u, str))
+    after = sum(len(s) for s in stripped if isinstance(s, str))
+    if before > after:
+        print(f"[INFO] Boilerplate: {before - after} de {before} caracteres quitados "
+              f"({(before - after) / before:.1%}) en '{col}'")
+    out = np.array(stripped + [np.nan], dtype=object)[codes]
+    return pd.Series(out, index=series.index, dtype=object)
@@ -0,0 +1,331 @@
+"""
+Compactación de CSV diarios antiguos en un archivo Parquet (zstd) particionado por mes.
+
+Los CSV por término ('jooble__analista_de_datos__2025-07-18.csv'), los
+'corpus_unido/*__merged.csv' y las copias diarias de 'todas_las_plataformas/<Carrera>/'
+con fecha anterior a KEEP_DAYS se mueven a:
+
+    data/outputs/archivo/<misma ruta relativa>/<YYYY-MM>.parquet
+
+con un índice 'archivo/index.json' (carpeta de origen, mes, rango de fechas, filas y
+archivos originales de cada partición). Las lecturas por rango de fechas solo abren las
+particiones de los meses involucrados, y la unión acumulada sigue viendo los archivos
+archivados mediante referencias '<partición>::<nombre original>'.
+
+Un hardlink de 'todas_las_plataformas' o una entrada de su catálogo comparten contenido
+(mismo inodo) con el archivo de la plataforma: ese contenido se archiva una sola vez y
+el otro nombre queda en el índice como alias ('alias') que apunta a esa partición.
+
+Los acumulados sin fecha en el nombre ('<...>__acumulado.csv') se archivan por la fecha
+de su última modificación: uno que no se ha reescrito en KEEP_DAYS días va a la partición
+del mes de esa fecha. Si ya hay en la partición un archivo con el mismo nombre y otra
+fecha, el nuevo se deja como CSV (no se sobrescribe lo archivado).
+"""
+
+import os
+import re
+import json
+from datetime import date, datetime, timedelta
+import pandas as pd
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    from .csv_loader import read_csv_robust
+except ImportError:
+    from csv_loader import read_csv_robust
+
+# ===================== CONFIGURACIÓN =====================
+BASE_OUTPUTS = os.path.join("data", "outputs")
+ARCHIVE_DIRNAME = "archivo"
+INDEX_FILE = "index.json"
+KEEP_DAYS = 30                 # los diarios más recientes se quedan como CSV
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 9
+DELETE_ORIGINALS = True        # borra cada CSV una vez verificado en su partición
+SKIP_DIRS = {ARCHIVE_DIRNAME, "registro_global", "reportes"}
+# ==========================================================
+
+FECHA_RE = re.compile(r"__(\d{4}-\d{2}-\d{2})(?:__merged)?(?:\.csv)?$")
+ACUMULADO_RE = re.compile(r"__acumulado(?:\.csv)?$")   # sin fecha: se usa la de modificación
+REF_SEP = "::"                 # '<partición>.parquet::<archivo original>'
+ORIGIN_COL, DATE_COL = "_archivo", "_fecha"
+
+# ---------------- Índice ----------------
+def archive_root(base_outputs=None) -> str:
+    return os.path.join(base_outputs or BASE_OUTPUTS, ARCHIVE_DIRNAME)
+
+def load_index(base_outputs=None) -> dict:
+    """{ruta de partición relativa al archivo: {dir, mes, desde, hasta, filas, bytes_csv, archivos, alias}}"""
+    ipath = os.path.join(archive_root(base_outputs), INDEX_FILE)
+    if not os.path.exists(ipath):
+        return {}
+    with open(ipath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_index(index: dict, base_outputs=None) -> None:
+    ipath = os.path.join(archive_root(base_outputs), INDEX_FILE)
+    tmp = f"{ipath}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, ipath)
+
+def _rel_dir(directorio, base_outputs=None) -> str:
+    rel = os.path.relpath(os.path.abspath(directorio), os.path.abspath(base_outputs or BASE_OUTPUTS))
+    return rel.replace(os.sep, "/")
+
+# ---------------- Escritura de particiones ----------------
+def _as_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Todas las columnas como texto (nulos conservados) para un esquema estable entre días."""
+    return df.astype(object).where(df.notna(), None).astype("string")
+
+def _write_partition(part_path: str, nuevos: pd.DataFrame) -> int:
+    """Añade filas a la partición del mes (reescritura atómica) y devuelve el total de filas."""
+    if os.path.exists(part_path):
+        previos = pq.read_table(part_path).to_pandas()
+        nuevos = pd.concat([previos.astype("string"), nuevos], ignore_index=True)
+    tmp = f"{part_path}.{os.getpid()}.tmp"
+    table = pa.Table.from_pandas(nuevos, preserve_index=False)
+    pq.write_table(table, tmp, compression=COMPRESSION, compression_level=COMPRESSION_LEVEL)
+    os.replace(tmp, part_path)
+    return len(nuevos)
+
+def _fecha_de(name: str, ruta: str) -> str | None:
+    """Fecha del nombre ('__YYYY-MM-DD') o, en los acumulados, la de última modificación."""
+    m = FECHA_RE.search(name)
+    if m:
+        return m.group(1)
+    if ACUMULADO_RE.search(name):
+        return datetime.fromtimestamp(os.path.getmtime(ruta)).date().isoformat()
+    return None
+
+def _candidatos(base_outputs, cutoff: str):
+    """(carpeta, nombre, fecha, ruta a leer) de los CSV fechados anteriores a cutoff."""
+    try:
+        from .file_manager import leer_catalogo_global
+    except ImportError:
+        from file_manager import leer_catalogo_global
+
+    for root, dirs, files in os.walk(base_outputs):
+        if os.path.abspath(root) == os.path.abspath(base_outputs):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in sorted(files):
+            ruta = os.path.join(root, name)
+            fecha = _fecha_de(name, ruta)
+            if fecha and fecha < cutoff:
+                yield root, name, fecha, ruta
+        # Entradas de catálogo: su contenido se archiva en la carpeta global
+        for name, rel in sorted(leer_catalogo_global(root).items()):
+            ruta = os.path.normpath(os.path.join(root, rel))
+            if name in files or not os.path.isfile(ruta):
+                continue
+            fecha = _fecha_de(name, ruta)
+            if fecha and fecha < cutoff:
+                yield root, name, fecha, ruta
+
+def compactar(base_outputs=None, keep_days=None, hoy=None) -> dict:
+    """
+    Mueve los CSV diarios con fecha anterior a hoy - keep_days a sus particiones mensuales.
+
+    Args:
+        base_outputs: Carpeta 'data/outputs' (default: BASE_OUTPUTS)
+        keep_days: Días que se conservan como CSV (default: KEEP_DAYS)
+        hoy: Fecha de referencia (default: date.today())
+
+    Returns:
+        dict: {"archivos", "filas", "bytes_csv", "bytes_parquet"}
+    """
+    if not HAS_PYARROW:
+        raise ImportError("La compactación requiere pyarrow (pip install pyarrow)")
+    try:
+        from .file_manager import leer_catalogo_global, guardar_catalogo_global
+    except ImportError:
+        from file_manager import leer_catalogo_global, guardar_catalogo_global
+
+    base_outputs = base_outputs or BASE_OUTPUTS
+    keep_days = KEEP_DAYS if keep_days is None else keep_days
+    cutoff = ((hoy or date.today()) - timedelta(days=keep_days)).isoformat()
+    index = load_index(base_outputs)
+    os.makedirs(archive_root(base_outputs), exist_ok=True)
+
+    grupos, alias = {}, []
+    vistos = {}   # (st_dev, st_ino) -> (partición, nombre) del primer candidato con ese contenido
+    for root, name, fecha, ruta in _candidatos(base_outputs, cutoff):
+        part_rel = f"{_rel_dir(root, base_outputs)}/{fecha[:7]}.parquet"
+        st = os.stat(ruta)
+        inodo = (st.st_dev, st.st_ino)
+        if inodo in vistos:
+            # Hardlink o entrada de catálogo de un archivo ya candidato: se archiva una sola vez
+            alias.append((root, name, fecha, ruta, part_rel, vistos[inodo]))
+            continue
+        vistos[inodo] = (part_rel, name)
+        grupos.setdefault((root, fecha[:7]), []).append((name, fecha, ruta))
+
+    total = {"archivos": 0, "filas": 0, "bytes_csv": 0, "bytes_parquet": 0}
+    archivados_ok = []   # se borran al final: una entrada de catálogo puede apuntar a otro candidato
+    for (root, mes), archivos in sorted(grupos.items()):
+        rel = _rel_dir(root, base_outputs)
+        part_rel = f"{rel}/{mes}.parquet"
+        entry = index.get(part_rel, {"dir": rel, "mes": mes, "filas": 0, "bytes_csv": 0, "archivos": {}})
+
+        frames, nuevos = [], {}
+        for name, fecha, ruta in archivos:
+            if name in entry["archivos"]:
+                if entry["archivos"][name]["fecha"] != fecha:
+                    print(f"⚠️  {name} ya está archivado con otra fecha en {part_rel}, se deja como CSV")
+                continue  # ya archivado (p.ej. ejecución interrumpida antes de borrar)
+            try:
+                df = read_csv_robust(ruta, schema=False)
+            except Exception:
+                print(f"⚠️  No se pudo leer, se deja sin archivar: {ruta}")
+                continue
+            nuevos[name] = {"fecha": fecha, "filas": len(df), "columnas": list(df.columns),
+                            "bytes": os.path.getsize(ruta)}
+            frames.append(_as_text(df).assign(**{ORIGIN_COL: name, DATE_COL: fecha}))
+
+        if frames:
+            part_path = os.path.join(archive_root(base_outputs), *part_rel.split("/"))
+            os.makedirs(os.path.dirname(part_path), exist_ok=True)
+            filas = _write_partition(part_path, pd.concat(frames, ignore_index=True))
+            entry["archivos"].update(nuevos)
+            if filas != sum(a["filas"] for a in entry["archivos"].values()):
+                raise RuntimeError(f"Partición inconsistente, no se borra nada: {part_path}")
+            entry.update(
+                filas=filas,
+                bytes_csv=sum(a["bytes"] for a in entry["archivos"].values()),
+                bytes_parquet=os.path.getsize(part_path),
+                desde=min(a["fecha"] for a in entry["archivos"].values()),
+                hasta=max(a["fecha"] for a in entry["archivos"].values()),
+            )
+            index[part_rel] = entry
+            _save_index(index, base_outputs)
+            total["archivos"] += len(nuevos)
+            total["filas"] += sum(a["filas"] for a in nuevos.values())
+            total["bytes_csv"] += sum(a["bytes"] for a in nuevos.values())
+            print(f"🗜️  {part_rel}: +{len(nuevos)} archivos ({entry['filas']} filas en la partición)")
+
+        archivados_ok += [(root, name, ruta) for name, fecha, ruta in archivos
+                          if entry["archivos"].get(name, {}).get("fecha") == fecha]
+
+    # Alias: la partición de su carpeta solo guarda la referencia al contenido ya archivado
+    for root, name, fecha, ruta, part_rel, (dueno_rel, dueno_name) in alias:
+        if dueno_name not in index.get(dueno_rel, {}).get("archivos", {}):
+            continue  # el original no se pudo archivar: la copia se queda como está
+        entry = index.setdefault(part_rel, {"dir": _rel_dir(root, base_outputs), "mes": fecha[:7],
+                                            "filas": 0, "bytes_csv": 0, "archivos": {}})
+        aliases = entry.setdefault("alias", {})
+        if name not in entry["archivos"] and name not in aliases:
+            aliases[name] = {"fecha": fecha, "ref": f"{dueno_rel}{REF_SEP}{dueno_name}"}
+            fechas = [a["fecha"] for a in (*entry["archivos"].values(), *aliases.values())]
+            entry.update(desde=min(fechas), hasta=max(fechas))
+            _save_index(index, base_outputs)
+        archivados_ok.append((root, name, ruta))
+
+    if DELETE_ORIGINALS:
+        for root in sorted({r for r, _, _ in archivados_ok}):
+            catalogo = leer_catalogo_global(root)
+            cambios = False
+            for r, name, ruta in archivados_ok:
+                if r != root:
+                    continue
+                if name in catalogo:
+                    catalogo.pop(name)   # el archivo de la plataforma se compacta aparte
+                    cambios = True
+                elif os.path.exists(ruta):
+                    os.remove(ruta)
+            if cambios:
+                guardar_catalogo_global(root, catalogo)
+
+    total["bytes_parquet"] = sum(e.get("bytes_parquet", 0) for e in index.values())
+    print(f"[INFO] Compactación: {total['archivos']} archivos, {total['filas']} filas, "
+          f"{total['bytes_csv'] / 1e6:.1f} MB de CSV → archivo total {total['bytes_parquet'] / 1e6:.1f} MB")
+    return total
+
+# ---------------- Lectura ----------------
+def _to_frame(table, columnas=None) -> pd.DataFrame:
+    df = table.to_pandas().astype(object)
+    df = df.where(df.notna(), float("nan"))
+    return df.reindex(columns=columnas) if columnas is not None else df
+
+def leer_archivo(directorio, desde=None, hasta=None, base_outputs=None) -> pd.DataFrame:
+    """
+    Filas archivadas de una carpeta de origen (p.ej. 'jooble/Software' o su ruta completa)
+    entre las fechas desde/hasta (YYYY-MM-DD, inclusivas). Solo abre las particiones de
+    los meses del rango; incluye las columnas '_archivo' y '_fecha'.
+    """
+    if os.path.isabs(directorio) or os.path.exists(directorio):
+        rel = _rel_dir(directorio, base_outputs)
+    else:
+        rel = directorio.replace(os.sep, "/").strip("/")
+    filtros = []
+    if desde:
+        filtros.append((DATE_COL, ">=", desde))
+    if hasta:
+        filtros.append((DATE_COL, "<=", hasta))
+
+    frames = []
+    for part_rel, entry in sorted(load_index(base_outputs).items()):
+        if entry["dir"] != rel:
+            continue
+        if (desde and entry["hasta"] < desde) or (hasta and entry["desde"] > hasta):
+            continue
+        part_path = os.path.join(archive_root(base_outputs), *part_rel.split("/"))
+        if entry["archivos"]:
+            frames.append(_to_frame(pq.read_table(part_path, filters=filtros or None)))
+        for name, a in sorted(entry.get("alias", {}).items()):
+            if (desde and a["fecha"] < desde) or (hasta and a["fecha"] > hasta):
+                continue
+            df = _to_frame(pq.read_table(_ruta_alias(a, base_outputs),
+                                         filters=[(ORIGIN_COL, "=", a["ref"].split(REF_SEP, 1)[1])]))
+            frames.append(df.assign(**{ORIGIN_COL: name}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def _ruta_alias(alias: dict, base_outputs=None) -> str:
+    dueno_rel = alias["ref"].split(REF_SEP, 1)[0]
+    return os.path.join(archive_root(base_outputs), *dueno_rel.split("/"))
+
+def archivados(directorio, base_outputs=None) -> dict:
+    """{nombre original: referencia '<partición>::<nombre>'} de los CSV archivados de una carpeta."""
+    rel = _rel_dir(directorio, base_outputs)
+    refs = {}
+    for part_rel, entry in load_index(base_outputs).items():
+        if entry["dir"] == rel:
+            part_path = os.path.join(archive_root(base_outputs), *part_rel.split("/"))
+            refs.update({name: f"{part_path}{REF_SEP}{name}" for name in entry["archivos"]})
+            refs.update({name: f"{_ruta_alias(a, base_outputs)}{REF_SEP}{a['ref'].split(REF_SEP, 1)[1]}"
+                         for name, a in entry.get("alias", {}).items()})
+    return refs
+
+def es_referencia(ruta) -> bool:
+    return REF_SEP in str(ruta)
+
+def leer_referencia(ref) -> pd.DataFrame:
+    """Contenido de un CSV archivado con sus columnas originales."""
+    part_path, name = str(ref).split(REF_SEP, 1)
+    table = pq.read_table(part_path, filters=[(ORIGIN_COL, "=", name)])
+    info = _info_referencia(part_path, name)
+    return _to_frame(table, info["columnas"] if info else None)
+
+def _info_referencia(part_path, name):
+    # '<base_outputs>/archivo/<dir>/<mes>.parquet' -> índice de <base_outputs>/archivo
+    root = part_path.split(os.sep + ARCHIVE_DIRNAME + os.sep)[0]
+    index = load_index(root)
+    rel = os.path.relpath(part_path, archive_root(root)).replace(os.sep, "/")
+    return index.get(rel, {}).get("archivos", {}).get(name)
+
+def tamano_fuente(ruta) -> int:
+    """Bytes del CSV original (archivado o en disco), para dimensionar la deduplicación externa."""
+    if es_referencia(ruta):
+        part_path, name = str(ruta).split(REF_SEP, 1)
+        info = _info_referencia(part_path, name)
+        return info["bytes"] if info else os.path.getsize(part_path)
+    return os.path.getsize(ruta)
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    compactar()
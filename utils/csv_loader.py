@@ -0,0 +1,219 @@
+"""
+Lector CSV compartido por file_manager, representations y los scripts de utils.
+Detecta encoding y separador leyendo solo los primeros KB del archivo y luego
+parsea una única vez. El dialecto detectado se guarda en un manifiesto por carpeta
+para que las lecturas siguientes del mismo archivo omitan la detección.
+
+Con CSV_ENGINE = "pyarrow" el parseo usa pyarrow.csv (multihilo, por bloques).
+"""
+
+import os
+import csv
+import json
+import codecs
+from pathlib import Path
+import pandas as pd
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+try:
+    from .schema import apply_schema
+except ImportError:
+    from schema import apply_schema
+
+# ===================== CONFIGURACIÓN =====================
+SNIFF_BYTES = 64 * 1024                  # bytes leídos para detectar el dialecto
+CANDIDATE_SEPS = (",", ";", "\t", "|")
+MANIFEST_NAME = ".csv_manifest.json"     # un manifiesto por carpeta
+
+# Motor de lectura: "c" (pandas, un hilo) o "pyarrow" (multihilo por bloques)
+CSV_ENGINE = "c"
+ARROW_BLOCK_SIZE = 4 * 1024 * 1024       # bytes por bloque de pyarrow.csv
+ARROW_BACKED = False                     # True -> DataFrames con dtypes pd.ArrowDtype
+APPLY_SCHEMA = True                      # aplica schema.SCHEMA (category / string[pyarrow]) al leer
+# ==========================================================
+
+# ---------------- Detección de dialecto ----------------
+def _sniff_encoding(sample: bytes) -> str:
+    """utf-8-sig si hay BOM, utf-8 si la muestra decodifica, si no latin-1."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False tolera un carácter multibyte cortado al final de la muestra
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+def _sniff_sep(text: str) -> str:
+    """Elige el separador más frecuente en la cabecera (por defecto ',')."""
+    header = text.splitlines()[0] if text else ""
+    counts = {sep: header.count(sep) for sep in CANDIDATE_SEPS}
+    best = max(counts, key=counts.get)
+    return best if counts[best] > 0 else ","
+
+def sniff_dialect(path) -> dict:
+    """Detecta encoding y separador a partir de los primeros SNIFF_BYTES del archivo."""
+    with open(path, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+    encoding = _sniff_encoding(sample)
+    text = sample.decode(encoding, errors="ignore")
+    return {"encoding": encoding, "sep": _sniff_sep(text)}
+
+# ---------------- Manifiesto de dialectos ----------------
+def _manifest_path(path: Path) -> Path:
+    return path.parent / MANIFEST_NAME
+
+def _file_signature(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _load_manifest(path: Path) -> dict:
+    mpath = _manifest_path(path)
+    if not mpath.exists():
+        return {}
+    try:
+        with open(mpath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def record_dialect(path, dialect: dict) -> None:
+    """Guarda el dialecto del archivo en el manifiesto de su carpeta (escritura atómica)."""
+    path = Path(path)
+    manifest = _load_manifest(path)
+    manifest[path.name] = {**dialect, **_file_signature(path)}
+    mpath = _manifest_path(path)
+    tmp = mpath.with_name(f"{mpath.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, mpath)
+
+def cached_dialect(path) -> dict | None:
+    """Devuelve el dialecto del manifiesto si el archivo no cambió desde que se registró."""
+    path = Path(path)
+    entry = _load_manifest(path).get(path.name)
+    if not entry:
+        return None
+    if {k: entry.get(k) for k in ("size", "mtime_ns")} != _file_signature(path):
+        return None
+    return {"encoding": entry["encoding"], "sep": entry["sep"]}
+
+# ---------------- Lectura con pyarrow ----------------
+def _read_header(path: Path, dialect: dict) -> list[str]:
+    with open(path, "r", encoding=dialect["encoding"], newline="") as f:
+        return next(csv.reader(f, delimiter=dialect["sep"]), [])
+
+def read_csv_arrow(path, dialect: dict | None = None, usecols=None) -> "pa.Table":
+    """
+    Lee el CSV como tabla Arrow con pyarrow.csv (multihilo, por bloques).
+    Todas las columnas se leen como texto (vacíos -> null) para no inferir fechas ni números.
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow no está instalado")
+    path = Path(path)
+    dialect = dialect or cached_dialect(path) or sniff_dialect(path)
+    header = _read_header(path, dialect)
+    encoding = "utf-8" if dialect["encoding"] == "utf-8-sig" else dialect["encoding"]  # Arrow omite el BOM
+
+    return pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE, encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=dialect["sep"], newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={c: pa.string() for c in header},
+            strings_can_be_null=True,
+            include_columns=list(usecols) if usecols is not None else None,
+        ),
+    )
+
+def _parse(path: Path, dialect: dict, engine: str, kwargs: dict) -> pd.DataFrame:
+    # El lector de Arrow solo entiende 'usecols'; cualquier otra opción va por el motor C
+    extra = {k for k in kwargs if k not in ("low_memory", "usecols")}
+    if engine == "pyarrow" and HAS_PYARROW and not extra:
+        try:
+            table = read_csv_arrow(path, dialect, usecols=kwargs.get("usecols"))
+            return table.to_pandas(types_mapper=pd.ArrowDtype if ARROW_BACKED else None)
+        except pa.ArrowInvalid as e:
+            if "UTF8" in str(e):
+                raise UnicodeError(str(e)) from e  # mismo reintento latin-1 que el motor C
+            # Filas mal formadas (p.ej. '\r' sin comillas): el motor C es más tolerante
+            print(f"⚠️  pyarrow no pudo parsear {path.name}, usando motor C")
+    kwargs.setdefault("low_memory", False)
+    return pd.read_csv(path, encoding=dialect["encoding"], sep=dialect["sep"], **kwargs)
+
+# ---------------- Lectura / escritura ----------------
+def read_csv_robust(path, engine: str | None = None, schema: bool = True, **kwargs) -> pd.DataFrame:
+    """
+    Lee un CSV con un solo parseo usando el dialecto del manifiesto o el detectado.
+    Si el encoding detectado falla más adelante en el archivo, reintenta una vez con latin-1.
+    El motor por defecto es CSV_ENGINE ("c" o "pyarrow"); con schema=True se aplican
+    los dtypes de schema.SCHEMA.
+    """
+    path = Path(path)
+    engine = engine or CSV_ENGINE
+    dialect = cached_dialect(path)
+    detected = dialect is None
+    if detected:
+        dialect = sniff_dialect(path)
+
+    try:
+        df = _parse(path, dialect, engine, dict(kwargs))
+    except (UnicodeDecodeError, UnicodeError):
+        dialect = {**dialect, "encoding": "latin-1"}
+        detected = True
+        try:
+            df = _parse(path, dialect, engine, dict(kwargs))
+        except Exception as e:
+            raise RuntimeError(f"No se pudo leer el CSV: {path}") from e
+    except Exception as e:
+        raise RuntimeError(f"No se pudo leer el CSV: {path}") from e
+
+    if detected:
+        try:
+            record_dialect(path, dialect)
+        except OSError:
+            pass  # carpeta de solo lectura: se detectará de nuevo la próxima vez
+    if schema and APPLY_SCHEMA:
+        apply_schema(df)
+    return df
+
+def iter_csv_chunks(path, chunksize: int, schema: bool = True, **kwargs):
+    """
+    Recorre el CSV en bloques de 'chunksize' filas (motor C) con el dialecto detectado/cacheado.
+    Cada bloque recibe los dtypes de schema.SCHEMA igual que read_csv_robust.
+    """
+    path = Path(path)
+    dialect = cached_dialect(path)
+    if dialect is None:
+        dialect = sniff_dialect(path)
+        try:
+            record_dialect(path, dialect)
+        except OSError:
+            pass
+    kwargs.setdefault("low_memory", False)
+    with pd.read_csv(path, encoding=dialect["encoding"], sep=dialect["sep"], chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            if schema and APPLY_SCHEMA:
+                apply_schema(chunk)
+            yield chunk
+
+def write_csv_robust(df: pd.DataFrame, path, **kwargs) -> None:
+    """
+    Escribe en utf-8 (o utf-8-sig si falla) y registra el dialecto resultante.
+    Las columnas 'category' / 'string' se serializan como texto plano, igual que 'object'.
+    """
+    path = Path(path)
+    encoding = "utf-8"
+    try:
+        df.to_csv(path, index=False, encoding=encoding, **kwargs)
+    except Exception:
+        encoding = "utf-8-sig"
+        df.to_csv(path, index=False, encoding=encoding, **kwargs)
+    try:
+        record_dialect(path, {"encoding": encoding, "sep": kwargs.get("sep", ",")})
+    except OSError:
+        pass
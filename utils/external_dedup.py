@@ -0,0 +1,110 @@
+"""
+Deduplicación externa (fuera de memoria) por 'job_id' para corpus más grandes que la RAM.
+Las filas se reparten por hash de la clave en fragmentos temporales en disco; cada
+fragmento se deduplica por separado y el resultado se escribe por partes, de modo que
+el pico de memoria queda acotado por el presupuesto configurado.
+"""
+
+import os
+import math
+import shutil
+import tempfile
+from pathlib import Path
+import pandas as pd
+
+try:
+    from .csv_loader import read_csv_robust, record_dialect
+except ImportError:
+    from csv_loader import read_csv_robust, record_dialect
+
+# ===================== CONFIGURACIÓN =====================
+MEMORY_FACTOR = 3        # memoria de pandas ≈ 3x los bytes del CSV (texto como object)
+SAMPLE_ROWS = 500        # filas leídas para estimar memoria por fila
+MIN_CHUNK_ROWS = 1_000
+# ==========================================================
+
+def rows_per_chunk(path, memoria_mb: float) -> int:
+    """Filas por bloque para que un bloque de entrada use como mucho la mitad del presupuesto."""
+    try:
+        sample = read_csv_robust(path, schema=False, nrows=SAMPLE_ROWS)
+    except Exception:
+        return MIN_CHUNK_ROWS
+    if sample.empty:
+        return MIN_CHUNK_ROWS
+    per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    return max(MIN_CHUNK_ROWS, int(memoria_mb * 1e6 / 2 / per_row))
+
+def num_shards(bytes_entrada: int, memoria_mb: float) -> int:
+    """Fragmentos necesarios para que cada uno, cargado en pandas, quepa en el presupuesto."""
+    return max(1, math.ceil(bytes_entrada * MEMORY_FACTOR / (memoria_mb * 1e6)))
+
+def dedup_externo(bloques, out_path, bytes_entrada: int, memoria_mb: float,
+                  key: str = "job_id", transform=None) -> dict:
+    """
+    Deduplica por 'key' un flujo de DataFrames sin tenerlos todos en memoria.
+
+    Conserva la primera aparición de cada clave (igual que concat + drop_duplicates);
+    el orden de salida queda agrupado por fragmento.
+
+    Args:
+        bloques: Iterable de DataFrames en el orden de entrada
+        out_path: CSV de salida (se escribe en un temporal y se renombra al final)
+        bytes_entrada: Tamaño total en disco de la entrada, para dimensionar los fragmentos
+        memoria_mb: Presupuesto de memoria en MB
+        key: Columna clave de deduplicación
+        transform: Función opcional aplicada a cada fragmento ya deduplicado
+
+    Returns:
+        dict: {"filas": filas escritas, "duplicados": filas eliminadas}
+    """
+    n = num_shards(bytes_entrada, memoria_mb)
+    out_path = Path(out_path)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".dedup_", dir=out_path.parent))
+    columnas = {}             # unión de columnas en orden de aparición (como pd.concat)
+    partes = [[] for _ in range(n)]
+    filas_entrada = 0
+
+    try:
+        # 1) Particionar por hash de la clave
+        for i, df in enumerate(bloques):
+            if df.empty:
+                continue
+            filas_entrada += len(df)
+            columnas.update(dict.fromkeys(df.columns))
+            shard = pd.util.hash_pandas_object(df[key].astype(str), index=False).to_numpy() % n
+            for s, part in df.groupby(shard, sort=False):
+                ppath = tmp_dir / f"shard{s:04d}_{i:06d}.csv"
+                part.to_csv(ppath, index=False, encoding="utf-8")
+                partes[s].append(ppath)
+
+        # 2) Deduplicar cada fragmento y volcarlo a la salida
+        tmp_out = out_path.with_name(f"{out_path.name}.tmp")
+        filas_salida, header = 0, True
+        for s in range(n):
+            if not partes[s]:
+                continue
+            # como texto: volver a inferir tipos por fragmento cambiaría '01234' -> 1234 o 'NA' -> vacío
+            shard_df = pd.concat(
+                [pd.read_csv(p, encoding="utf-8", dtype=str, keep_default_na=False) for p in partes[s]],
+                ignore_index=True,
+            ).reindex(columns=list(columnas), fill_value="")
+            shard_df.drop_duplicates(subset=key, inplace=True)
+            if transform is not None:
+                shard_df = transform(shard_df)
+            shard_df.to_csv(tmp_out, index=False, encoding="utf-8", mode="w" if header else "a", header=header)
+            filas_salida += len(shard_df)
+            header = False
+            for p in partes[s]:
+                p.unlink()
+
+        if header:
+            pd.DataFrame(columns=list(columnas)).to_csv(tmp_out, index=False, encoding="utf-8")
+        os.replace(tmp_out, out_path)
+        try:
+            record_dialect(out_path, {"encoding": "utf-8", "sep": ","})
+        except OSError:
+            pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {"filas": filas_salida, "duplicados": filas_entrada - filas_salida}
@@ -1,16 +1,33 @@
-import os, json
+import os, json, sys
 import pandas as pd
 import glob
 import shutil
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from dateutil import parser
 # Importar funciones de extracción de países
 try:
     from .location_extractor import country_from_location, clean_text
+    from .csv_loader import read_csv_robust, write_csv_robust, iter_csv_chunks
+    from .external_dedup import dedup_externo, rows_per_chunk
+    from .near_duplicates import marcar_casi_duplicados
+    from .compaction import archivados, es_referencia, leer_referencia, tamano_fuente
+    from . import csv_loader, external_dedup
 except ImportError:
     from location_extractor import country_from_location, clean_text
+    from csv_loader import read_csv_robust, write_csv_robust, iter_csv_chunks
+    from external_dedup import dedup_externo, rows_per_chunk
+    from near_duplicates import marcar_casi_duplicados
+    from compaction import archivados, es_referencia, leer_referencia, tamano_fuente
+    import csv_loader, external_dedup
 
 NEEDED_COLS = ["job_title", "company", "location", "date_posted"]
+MERGE_WORKERS = None  # procesos para unir_corpus_acumulado_por_carrera (None = núcleos de CPU)
+DEDUP_MEMORY_MB = None  # presupuesto (MB) para deduplicar fuera de memoria (None = todo en memoria)
+GLOBAL_LINK_MODE = "hardlink"  # "hardlink" | "catalogo" | "copia" (ver copiar_corpus_diario_a_global)
+GLOBAL_CATALOG = ".catalogo.json"  # archivos de plataforma publicados sin copiar en <Carrera>/
+NEAR_DUP_AFTER_MERGE = False  # True: marca casi-duplicados (MinHash-LSH) tras la unión acumulada
 
 def normalize_date(value):
     """Devuelve YYYY-MM-DD sin cambiar el día."""
@@ -32,24 +49,101 @@ def make_uid(job_title, company, location, date_posted_norm):
     return hashlib.sha256(base.encode("utf-8")).hexdigest()
 
 def read_csv_loose(path: str) -> pd.DataFrame:
-    """Lector tolerante a encoding/separador."""
-    for kwargs in ({}, {"engine": "python", "sep": None}, {"encoding": "latin-1"}):
+    """Lector tolerante a encoding/separador (dialecto detectado una vez y cacheado).
+    También acepta referencias a CSV ya compactados en el archivo Parquet (ver compaction.py)."""
+    try:
+        if es_referencia(path):
+            return leer_referencia(path)
+        return read_csv_robust(path)
+    except Exception:
+        print(f"⚠️  No se pudo leer: {path}")
+        return pd.DataFrame()
+
+def iter_csv_loose(paths, memoria_mb):
+    """Recorre varios CSV en bloques acotados por el presupuesto de memoria, avisando los ilegibles."""
+    for path in paths:
         try:
-            return pd.read_csv(path, **kwargs)
+            if es_referencia(path):
+                yield leer_referencia(path)  # un CSV archivado es un único bloque
+                continue
+            yield from iter_csv_chunks(path, rows_per_chunk(path, memoria_mb))
         except Exception:
-            continue
-    print(f"⚠️  No se pudo leer: {path}")
-    return pd.DataFrame()
+            print(f"⚠️  No se pudo leer: {path}")
+
+# Lotes recién escritos por los extractores, por (fuente, carrera, fecha) -> {ruta CSV: DataFrame}.
+# unir_corpus_por_carrera los consume en lugar de releer esos archivos.
+_LOTES_DIARIOS = {}
+
+def _clave_lote(fuente, carrera, fecha):
+    return (fuente, carrera.replace(" ", "_"), fecha)
+
+def registrar_lote(fuente, carrera, fecha, ruta_csv, df):
+    """Guarda en memoria el contenido final del CSV de un término para la unión diaria."""
+    _LOTES_DIARIOS.setdefault(_clave_lote(fuente, carrera, fecha), {})[os.path.normpath(ruta_csv)] = df
 
 def crear_directorios():
     os.makedirs("data/outputs", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     os.makedirs("config", exist_ok=True)
 
-def copiar_corpus_diario_a_global(fuente, carrera, fecha):
+def guardar_catalogo_global(destino_dir, catalogo):
+    """Escribe el catálogo de una carpeta global (escritura atómica)."""
+    cpath = os.path.join(destino_dir, GLOBAL_CATALOG)
+    tmp = f"{cpath}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(catalogo, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, cpath)
+
+def _registrar_en_catalogo(destino_dir, nombre, origen):
+    """Apunta 'nombre' al archivo de la plataforma en el catálogo de la carpeta global."""
+    catalogo = leer_catalogo_global(destino_dir)
+    catalogo[nombre] = os.path.relpath(origen, destino_dir)
+    guardar_catalogo_global(destino_dir, catalogo)
+
+def leer_catalogo_global(destino_dir):
+    """Catálogo {nombre: ruta relativa al archivo de la plataforma} de una carpeta global."""
+    cpath = os.path.join(destino_dir, GLOBAL_CATALOG)
+    if not os.path.exists(cpath):
+        return {}
+    try:
+        with open(cpath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def resolver_archivos_globales(cdir):
     """
-    Copia el archivo de corpus unificado diario de una carrera desde la plataforma
-    hacia la carpeta 'todas_las_plataformas/<Carrera>/', conservando el nombre de origen.
+    Archivos de corpus de una carpeta 'todas_las_plataformas/<Carrera>/': los presentes en
+    disco (copias o hardlinks), los registrados en el catálogo y los ya compactados en el
+    archivo Parquet. Devuelve [(nombre, ruta o referencia)] ordenado por nombre; un archivo
+    en disco tiene prioridad sobre su entrada de catálogo o de archivo.
+    """
+    archivos = {
+        p: os.path.join(cdir, p) for p in os.listdir(cdir)
+        if os.path.isfile(os.path.join(cdir, p))
+        and (p.lower().endswith(".csv") or p.endswith("__merged"))
+    }
+    for nombre, rel in leer_catalogo_global(cdir).items():
+        if nombre in archivos:
+            continue
+        ruta = os.path.normpath(os.path.join(cdir, rel))
+        if os.path.isfile(ruta):
+            archivos[nombre] = ruta
+        else:
+            print(f"⚠️  Entrada de catálogo sin archivo: {nombre} -> {ruta}")
+    for nombre, ref in archivados(cdir).items():
+        archivos.setdefault(nombre, ref)
+    return sorted(archivos.items())
+
+def copiar_corpus_diario_a_global(fuente, carrera, fecha, modo=None):
+    """
+    Publica el archivo de corpus unificado diario de una carrera en la carpeta
+    'todas_las_plataformas/<Carrera>/', conservando el nombre de origen, sin duplicar bytes:
+    - "hardlink": enlace duro al archivo de la plataforma (si el sistema de archivos no lo
+      permite, p.ej. otra unidad, se usa el catálogo)
+    - "catalogo": entrada en '.catalogo.json' que apunta al archivo de la plataforma
+    - "copia": copia física (comportamiento anterior)
+    Default: GLOBAL_LINK_MODE.
     """
     origen = os.path.join(
         "data", "outputs", fuente, carrera.replace(" ", "_"),
@@ -59,62 +153,123 @@ def copiar_corpus_diario_a_global(fuente, carrera, fecha):
     os.makedirs(destino_dir, exist_ok=True)
     destino = os.path.join(destino_dir, os.path.basename(origen))
 
-    if os.path.exists(origen):
-        shutil.copy2(origen, destino)
-        print(f"🗂️  Copiado a carpeta global: {destino}")
-    else:
+    if not os.path.exists(origen):
         print(f"⚠️  No se encontró el archivo diario para copiar: {origen}")
+        return
 
-def unir_corpus_acumulado_por_carrera():
-    """
-    Deduplica por 'job_id' y guarda '<Carrera>_Merged.csv' en la carpeta de cada carrera.
-    """
-    base_global = os.path.join("data", "outputs", "todas_las_plataformas")
+    modo = modo or GLOBAL_LINK_MODE
+    if modo == "copia":
+        shutil.copy2(origen, destino)
+        print(f"🗂️  Copiado a carpeta global: {destino}")
+        return
 
-    carreras = sorted(
-        d for d in os.listdir(base_global)
-        if os.path.isdir(os.path.join(base_global, d))
+    if modo == "hardlink":
+        if os.path.exists(destino) and os.path.samefile(origen, destino):
+            print(f"🗂️  Ya enlazado en carpeta global: {destino}")
+            return
+        tmp = f"{destino}.{os.getpid()}.tmp"
+        try:
+            os.link(origen, tmp)
+            os.replace(tmp, destino)
+            print(f"🗂️  Enlazado en carpeta global: {destino}")
+            return
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            print("⚠️  Hardlink no soportado aquí, se registra en el catálogo")
+
+    # Catálogo: una copia previa con el mismo nombre quedaría desactualizada
+    if os.path.exists(destino):
+        os.remove(destino)
+    _registrar_en_catalogo(destino_dir, os.path.basename(origen), origen)
+    print(f"🗂️  Registrado en catálogo global: {destino}")
+
+def _preparar_acumulado(df):
+    """Asegura columnas mínimas, normaliza la fecha y recalcula job_id. Devuelve (df, job_id sobrescritos)."""
+    for col in NEEDED_COLS:
+        if col not in df.columns:
+            df[col] = ""
+
+    # Normalizar fecha y recalcular/sobrescribir job_id
+    df["date_posted_norm"] = df["date_posted"].apply(normalize_date)
+
+    old_job_id = df["job_id"].astype(str) if "job_id" in df.columns else None
+    df["job_id"] = df.apply(
+        lambda r: make_uid(r["job_title"], r["company"], r["location"], r["date_posted_norm"]),
+        axis=1
     )
-
-    for carrera_dirname in carreras:
-        cdir = os.path.join(base_global, carrera_dirname)
-        archivos = sorted(
-            p for p in os.listdir(cdir)
-            if os.path.isfile(os.path.join(cdir, p))
-            and (p.lower().endswith(".csv") or p.endswith("__merged"))
+    reemplazos = 0
+    if old_job_id is not None:
+        changed = (old_job_id != df["job_id"].astype(str))
+        reemplazos = int(changed.sum())
+    return df, reemplazos
+
+def _finalizar_acumulado(merged):
+    """Agrega location_final y reordena columnas del corpus ya deduplicado."""
+    # Crear columna location_final con países extraídos
+    if "location" in merged.columns:
+        merged["location_final"] = merged["location"].astype(str).apply(
+            lambda x: clean_text(country_from_location(x)) if x and str(x).strip() not in ['', 'nan', 'None', '<NA>'] else ""
         )
 
-        if not archivos:
-            print(f"⚠️  {carrera_dirname}: no hay archivos para unir.")
-            continue
-
+    # Reordenar columnas: date_posted_norm después de date_posted, location_final después de location
+    cols = list(merged.columns)
+    
+    # Mover date_posted_norm
+    if "date_posted" in cols and "date_posted_norm" in cols:
+        cols.remove("date_posted_norm")
+        insert_at = cols.index("date_posted") + 1 if "date_posted" in cols else len(cols)
+        cols.insert(insert_at, "date_posted_norm")
+    
+    # Mover location_final
+    if "location" in cols and "location_final" in cols:
+        cols.remove("location_final")
+        insert_at = cols.index("location") + 1 if "location" in cols else len(cols)
+        cols.insert(insert_at, "location_final")
+    
+    return merged[cols]
+
+def _unir_carrera_acumulado(base_global, carrera_dirname, memoria_mb=None):
+    """
+    Une y deduplica los archivos de una carrera en '<Carrera>_Merged.csv'.
+    Se ejecuta en un proceso hijo; devuelve el resumen de la carrera (o None si no hubo archivos).
+    Con memoria_mb la deduplicación se hace fuera de memoria (ver external_dedup.py).
+    """
+    cdir = os.path.join(base_global, carrera_dirname)
+    archivos = resolver_archivos_globales(cdir)
+
+    if not archivos:
+        print(f"⚠️  {carrera_dirname}: no hay archivos para unir.")
+        return None
+
+    out_path = os.path.join(cdir, f"{carrera_dirname}_Merged.csv")
+    paths = [ruta for _, ruta in archivos]
+    total_reemplazos = 0
+
+    if memoria_mb:
+        def bloques():
+            nonlocal total_reemplazos
+            for df in iter_csv_loose(paths, memoria_mb):
+                df, reemplazos = _preparar_acumulado(df)
+                total_reemplazos += reemplazos
+                yield df
+
+        stats = dedup_externo(
+            bloques(), out_path,
+            bytes_entrada=sum(tamano_fuente(p) for p in paths),
+            memoria_mb=memoria_mb,
+            transform=_finalizar_acumulado,
+        )
+        filas, removed = stats["filas"], stats["duplicados"]
+    else:
         dfs = []
-        total_reemplazos = 0
-
-        for fname in archivos:
-            path = os.path.join(cdir, fname)
+        for path in paths:
             df = read_csv_loose(path)
             if df.empty:
                 print(f"⚠️  No se pudo leer o vacío: {path}")
                 continue
-
-            # Asegurar columnas mínimas
-            for col in NEEDED_COLS:
-                if col not in df.columns:
-                    df[col] = ""
-
-            # Normalizar fecha y recalcular/sobrescribir job_id
-            df["date_posted_norm"] = df["date_posted"].apply(normalize_date)
-
-            old_job_id = df["job_id"].astype(str) if "job_id" in df.columns else None
-            df["job_id"] = df.apply(
-                lambda r: make_uid(r["job_title"], r["company"], r["location"], r["date_posted_norm"]),
-                axis=1
-            )
-            if old_job_id is not None:
-                changed = (old_job_id != df["job_id"].astype(str))
-                total_reemplazos += int(changed.sum())
-
+            df, reemplazos = _preparar_acumulado(df)
+            total_reemplazos += reemplazos
             dfs.append(df)
 
         merged = pd.concat(dfs, ignore_index=True)
@@ -124,39 +279,80 @@ def unir_corpus_acumulado_por_carrera():
         merged.drop_duplicates(subset="job_id", inplace=True)
         removed = before - len(merged)
 
-        # Crear columna location_final con países extraídos
-        if "location" in merged.columns:
-            print(f"  📍 Extrayendo países de {len(merged)} ubicaciones...")
-            merged["location_final"] = merged["location"].astype(str).apply(
-                lambda x: clean_text(country_from_location(x)) if x and str(x).strip() not in ['', 'nan', 'None'] else ""
-            )
-
-        # Reordenar columnas: date_posted_norm después de date_posted, location_final después de location
-        cols = list(merged.columns)
-        
-        # Mover date_posted_norm
-        if "date_posted" in cols and "date_posted_norm" in cols:
-            cols.remove("date_posted_norm")
-            insert_at = cols.index("date_posted") + 1 if "date_posted" in cols else len(cols)
-            cols.insert(insert_at, "date_posted_norm")
-        
-        # Mover location_final
-        if "location" in cols and "location_final" in cols:
-            cols.remove("location_final")
-            insert_at = cols.index("location") + 1 if "location" in cols else len(cols)
-            cols.insert(insert_at, "location_final")
-        
-        merged = merged[cols]
-
-        out_path = os.path.join(cdir, f"{carrera_dirname}_Merged.csv")
-        merged.to_csv(out_path, index=False)
-        extra = f" | job_id sobrescritos: {total_reemplazos}" if total_reemplazos else ""
-        print(f"- {carrera_dirname}: {len(merged)} filas (elim. {removed} duplicados){extra} → {out_path}")
-
-def unir_corpus_por_carrera(fuente, carrera, fecha):
+        merged = _finalizar_acumulado(merged)
+        write_csv_robust(merged, out_path)
+        filas = len(merged)
+
+    return {
+        "carrera": carrera_dirname,
+        "filas": filas,
+        "duplicados": removed,
+        "reemplazos": total_reemplazos,
+        "out_path": out_path,
+    }
+
+def _config_hijos() -> list:
+    """
+    (módulo, nombre, valor) de la configuración que leen los procesos de la unión. Con el
+    arranque 'spawn' cada hijo vuelve a importar los módulos y no vería los cambios hechos
+    en tiempo de ejecución (motor CSV, esquema, memoria de la dedup externa...).
+    """
+    modulos = {
+        csv_loader: ("CSV_ENGINE", "ARROW_BLOCK_SIZE", "ARROW_BACKED", "APPLY_SCHEMA"),
+        external_dedup: ("MEMORY_FACTOR", "SAMPLE_ROWS", "MIN_CHUNK_ROWS"),
+        sys.modules[__name__]: ("NEEDED_COLS", "GLOBAL_CATALOG", "DEDUP_MEMORY_MB"),
+    }
+    return [(m.__name__, nombre, getattr(m, nombre)) for m, nombres in modulos.items() for nombre in nombres]
+
+def _aplicar_config(config) -> None:
+    """Inicializador del pool: copia en el hijo la configuración del proceso principal."""
+    for modulo, nombre, valor in config:
+        setattr(sys.modules[modulo], nombre, valor)
+
+def unir_corpus_acumulado_por_carrera(workers=None, memoria_mb=None):
+    """
+    Deduplica por 'job_id' y guarda '<Carrera>_Merged.csv' en la carpeta de cada carrera.
+    Las carreras se procesan en paralelo en un pool de procesos de 'workers' procesos
+    (default: MERGE_WORKERS; 1 = secuencial) y los resúmenes se agregan aquí.
+    Con memoria_mb (default: DEDUP_MEMORY_MB) cada proceso deduplica fuera de memoria
+    dentro de ese presupuesto.
+    """
+    base_global = os.path.join("data", "outputs", "todas_las_plataformas")
+
+    carreras = sorted(
+        d for d in os.listdir(base_global)
+        if os.path.isdir(os.path.join(base_global, d))
+    )
+
+    workers = workers or MERGE_WORKERS or os.cpu_count() or 1
+    memoria_mb = memoria_mb or DEDUP_MEMORY_MB
+    if workers == 1 or len(carreras) <= 1:
+        resumenes = [_unir_carrera_acumulado(base_global, c, memoria_mb) for c in carreras]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(carreras)),
+                                 initializer=_aplicar_config, initargs=(_config_hijos(),)) as ex:
+            resumenes = list(ex.map(_unir_carrera_acumulado, repeat(base_global), carreras, repeat(memoria_mb)))
+
+    resumenes = [r for r in resumenes if r]
+    for r in resumenes:
+        extra = f" | job_id sobrescritos: {r['reemplazos']}" if r["reemplazos"] else ""
+        print(f"- {r['carrera']}: {r['filas']} filas (elim. {r['duplicados']} duplicados){extra} → {r['out_path']}")
+
+    if resumenes:
+        print(
+            f"Total: {len(resumenes)} carreras | {sum(r['filas'] for r in resumenes)} filas | "
+            f"{sum(r['duplicados'] for r in resumenes)} duplicados eliminados | "
+            f"{sum(r['reemplazos'] for r in resumenes)} job_id sobrescritos"
+        )
+        if NEAR_DUP_AFTER_MERGE:
+            marcar_casi_duplicados(base_global)
+    return resumenes
+
+def unir_corpus_por_carrera(fuente, carrera, fecha, memoria_mb=None):
     """
     Une todos los CSVs de una carrera para una plataforma y fecha dada.
     Guarda el resultado en 'corpus_unido/' dentro de la carpeta de la carrera.
+    Con memoria_mb (default: DEDUP_MEMORY_MB) deduplica fuera de memoria.
     """
     base_path = os.path.join("data", "outputs", fuente, carrera.replace(" ", "_"))
     patron = os.path.join(base_path, f"{fuente}__*__{fecha}.csv")
@@ -166,17 +362,40 @@ def unir_corpus_por_carrera(fuente, carrera, fecha):
         print(f"No se encontraron archivos para unir en {base_path}")
         return
 
-    # Cargar y concatenar
-    dfs = [pd.read_csv(f) for f in archivos_csv]
-    df_unido = pd.concat(dfs, ignore_index=True).drop_duplicates(subset="job_id")
-
-    # Guardar en subcarpeta corpus_unido/
     output_dir = os.path.join(base_path, "corpus_unido")
     os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, f"{fuente}__{carrera.replace(' ', '_')}__{fecha}__merged.csv")
-    df_unido.to_csv(output_file, index=False)
 
-    print(f"Corpus unificado guardado en: {output_file} ({len(df_unido)} filas)")
+    # Los términos extraídos en este proceso ya están en memoria; solo se leen los demás
+    lotes = _LOTES_DIARIOS.pop(_clave_lote(fuente, carrera, fecha), {})
+    en_memoria = [lotes.get(os.path.normpath(f)) for f in archivos_csv]
+
+    memoria_mb = memoria_mb or DEDUP_MEMORY_MB
+    if memoria_mb:
+        def bloques():
+            # Mismo orden de archivos que la lectura desde disco (se conserva la primera aparición)
+            for f, df in zip(archivos_csv, en_memoria):
+                if df is not None:
+                    yield df
+                else:
+                    yield from iter_csv_loose([f], memoria_mb)
+
+        stats = dedup_externo(
+            bloques(), output_file,
+            bytes_entrada=sum(os.path.getsize(f) for f in archivos_csv),
+            memoria_mb=memoria_mb,
+        )
+        filas = stats["filas"]
+    else:
+        # Cargar (solo lo que no llegó en memoria) y concatenar
+        dfs = [df if df is not None else read_csv_robust(f) for f, df in zip(archivos_csv, en_memoria)]
+        df_unido = pd.concat(dfs, ignore_index=True).drop_duplicates(subset="job_id")
+
+        # Guardar en subcarpeta corpus_unido/
+        write_csv_robust(df_unido, output_file)
+        filas = len(df_unido)
+
+    print(f"Corpus unificado guardado en: {output_file} ({filas} filas)")
 
 def guardar_log(fuente, consulta, fecha, total=None, pagina=None, ubicaciones_finales=None):
     """
@@ -0,0 +1,105 @@
+"""
+Huellas por fila para procesar solo lo nuevo en las etapas de utils.
+
+Cada etapa guarda, junto al CSV que procesa, un archivo lateral
+'.fingerprints/<archivo>.<etapa>.csv' con (job_id, huella), donde la huella es un hash
+de las columnas de entrada de la etapa más su STAGE_VERSION. En la siguiente ejecución
+solo se procesan las filas nuevas, las que cambiaron de entrada o las de una versión
+anterior de la etapa; el resto conserva su salida.
+"""
+
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# ===================== CONFIGURACIÓN =====================
+SIDECAR_DIRNAME = ".fingerprints"
+KEY_COL = "job_id"        # sin job_id se usa el índice (posición de la fila en el archivo)
+# ==========================================================
+
+# Huellas ya leídas por archivo lateral: {ruta: ((size, mtime_ns), Series)}.
+# En modo streaming (ver streaming.py) changed_mask se llama una vez por bloque.
+_LOADED: dict = {}
+
+def _sidecar_path(path, stage: str) -> Path:
+    path = Path(path)
+    return path.parent / SIDECAR_DIRNAME / f"{path.name}.{stage}.csv"
+
+def _row_keys(df: pd.DataFrame) -> pd.Series:
+    if KEY_COL in df.columns:
+        return df[KEY_COL].astype(str)
+    # los bloques de read_csv(chunksize=...) continúan la numeración del anterior
+    return pd.Series(df.index.astype(str), index=df.index)
+
+def row_fingerprints(df: pd.DataFrame, cols, version) -> pd.Series:
+    """Hash estable (uint64) de las columnas de entrada de cada fila combinado con la versión."""
+    inputs = df.reindex(columns=list(cols)).astype(object)
+    inputs = inputs.where(inputs.notna(), "").astype(str)
+    h = pd.util.hash_pandas_object(inputs, index=False).to_numpy()
+    v = pd.util.hash_array(np.array([str(version)], dtype=object))[0]
+    return pd.Series(h ^ v, index=df.index)
+
+def load_fingerprints(path, stage: str) -> pd.Series:
+    """Huellas guardadas de una etapa para un archivo: Series job_id -> huella como texto (vacía si no hay)."""
+    spath = _sidecar_path(path, stage)
+    if not spath.exists():
+        return pd.Series(dtype=object)
+    st = spath.stat()
+    sig = (st.st_size, st.st_mtime_ns)
+    cached = _LOADED.get(spath)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    try:
+        # como texto: un uint64 pasado por float (NaN en map) perdería precisión
+        saved = pd.read_csv(spath, dtype=str, keep_default_na=False)
+    except Exception:
+        return pd.Series(dtype=object)   # archivo lateral dañado: se reprocesa todo
+    saved = saved.drop_duplicates("key", keep="last").set_index("key")["fp"]
+    _LOADED[spath] = (sig, saved)
+    return saved
+
+def changed_mask(path, stage: str, df: pd.DataFrame, fps: pd.Series, missing: bool = True) -> pd.Series:
+    """
+    True en las filas cuya huella no coincide con la guardada (nuevas o modificadas).
+    Si la etapa aún no tiene huellas para el archivo, todas las filas valen 'missing'
+    (False = aceptar la salida ya presente en el CSV como vigente).
+    """
+    saved = load_fingerprints(path, stage)
+    if saved.empty:
+        return pd.Series(missing, index=df.index)
+    prev = _row_keys(df).map(saved)
+    return prev.isna() | (prev != fps.astype(str))
+
+def saved_fingerprints(path, stage: str, df: pd.DataFrame) -> pd.Series:
+    """Huellas guardadas alineadas a las filas de df (NaN donde la fila no tiene huella)."""
+    saved = load_fingerprints(path, stage)
+    if saved.empty:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    return _row_keys(df).map(saved)
+
+def _fingerprint_frame(df: pd.DataFrame, fps: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({"key": _row_keys(df).to_numpy(), "fp": fps.reindex(df.index).astype(str).to_numpy()})
+
+def fingerprints_tmp(path, stage: str) -> Path:
+    """Archivo temporal junto al lateral definitivo (para append_fingerprints / commit_fingerprints)."""
+    spath = _sidecar_path(path, stage)
+    spath.parent.mkdir(parents=True, exist_ok=True)
+    return spath.with_name(f"{spath.name}.{os.getpid()}.tmp")
+
+def append_fingerprints(tmp, df: pd.DataFrame, fps: pd.Series) -> None:
+    """Añade al temporal las huellas de un bloque de filas (la cabecera solo la primera vez)."""
+    tmp = Path(tmp)
+    _fingerprint_frame(df, fps).to_csv(tmp, mode="a", header=not tmp.exists(), index=False, encoding="utf-8")
+
+def commit_fingerprints(tmp, path, stage: str) -> None:
+    """Sustituye el lateral de la etapa por el temporal (rename atómico)."""
+    spath = _sidecar_path(path, stage)
+    os.replace(tmp, spath)
+    _LOADED.pop(spath, None)
+
+def save_fingerprints(path, stage: str, df: pd.DataFrame, fps: pd.Series) -> None:
+    """Reemplaza las huellas de la etapa para el archivo (escritura atómica)."""
+    tmp = fingerprints_tmp(path, stage)
+    _fingerprint_frame(df, fps).to_csv(tmp, index=False, encoding="utf-8")
+    commit_fingerprints(tmp, path, stage)
@@ -0,0 +1,126 @@
+"""
+Registro global de ofertas: una fila por 'job_id' único con los campos de texto pesados
+('jobs.csv') y una tabla delgada de pertenencia oferta↔carrera ('membership.csv').
+
+Una misma oferta encontrada en varias carreras (p.ej. Software, Computación y
+Tecnologías de la Información) se traduce, normaliza y analiza una sola vez sobre el
+registro; luego las columnas resultantes se propagan a cada <Carrera>_Merged.csv.
+"""
+
+from pathlib import Path
+import pandas as pd
+
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+
+# ===================== CONFIGURACIÓN =====================
+REGISTRY_DIRNAME = "registro_global"       # hermana de 'todas_las_plataformas'
+JOBS_FILE = "jobs.csv"
+MEMBERSHIP_FILE = "membership.csv"
+CAREER_COLS = ["careers_required", "career_tag"]   # dependen de la carrera, no van al registro
+# ==========================================================
+
+def default_registry_dir(base_global) -> Path:
+    """'data/outputs/registro_global' para base_global = 'data/outputs/todas_las_plataformas'."""
+    return Path(base_global).parent / REGISTRY_DIRNAME
+
+def _career_files(base_global: Path, careers=None):
+    for d in sorted((p for p in base_global.iterdir() if p.is_dir()), key=lambda x: x.name.lower()):
+        if careers and d.name not in careers:
+            continue
+        target = d / f"{d.name}_Merged.csv"
+        if target.exists():
+            yield d.name, target
+
+def build_registry(base_global, registry_dir=None, careers=None) -> Path:
+    """
+    Construye jobs.csv y membership.csv a partir de los <Carrera>_Merged.csv.
+
+    Args:
+        base_global: Carpeta 'todas_las_plataformas'
+        registry_dir: Carpeta de salida (default: registro_global junto a base_global)
+        careers: Lista opcional de carreras a incluir (default: todas)
+
+    Returns:
+        Path: Ruta de jobs.csv
+    """
+    base_global = Path(base_global)
+    registry_dir = Path(registry_dir or default_registry_dir(base_global))
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    frames, members = [], []
+    for career, path in _career_files(base_global, careers):
+        df = read_csv_robust(path)
+        if df.empty or "job_id" not in df.columns:
+            continue
+        members.append(pd.DataFrame({"job_id": df["job_id"].astype(str), "career": career}))
+        frames.append(df.drop(columns=[c for c in CAREER_COLS if c in df.columns]))
+
+    if not frames:
+        raise RuntimeError(f"No se encontraron <Carrera>_Merged.csv en: {base_global}")
+
+    jobs = pd.concat(frames, ignore_index=True)
+    total_rows = len(jobs)
+    # Una oferta puede venir incompleta en alguna carrera (p.ej. sin description_final):
+    # se toma, por columna, el primer valor no vacío entre sus copias
+    jobs["job_id"] = jobs["job_id"].astype(str)
+    jobs = jobs.groupby("job_id", sort=False, dropna=False).first().reset_index()
+    membership = pd.concat(members, ignore_index=True).drop_duplicates()
+
+    jobs_path = registry_dir / JOBS_FILE
+    write_csv_robust(jobs, jobs_path)
+    write_csv_robust(membership, registry_dir / MEMBERSHIP_FILE)
+
+    saved = 100 * (1 - len(jobs) / total_rows) if total_rows else 0
+    print(f"[INFO] Registro global: {total_rows} filas en {len(frames)} carreras → "
+          f"{len(jobs)} ofertas únicas ({saved:.1f}% menos trabajo por etapa)")
+    return jobs_path
+
+def propagate_registry(base_global, columns, registry_dir=None, careers=None) -> None:
+    """
+    Copia las columnas indicadas desde jobs.csv a cada <Carrera>_Merged.csv por job_id.
+    Las filas cuyo job_id ya no está en el registro (p.ej. eliminadas por una etapa) se quitan.
+    """
+    base_global = Path(base_global)
+    registry_dir = Path(registry_dir or default_registry_dir(base_global))
+    jobs = read_csv_robust(registry_dir / JOBS_FILE)
+    jobs = jobs.assign(job_id=jobs["job_id"].astype(str)).set_index("job_id")
+    columns = [c for c in columns if c in jobs.columns]
+
+    for career, path in _career_files(base_global, careers):
+        df = read_csv_robust(path)
+        if df.empty or "job_id" not in df.columns:
+            continue
+        ids = df["job_id"].astype(str)
+        keep = ids.isin(jobs.index)
+        removed = int((~keep).sum())
+        if removed:
+            df, ids = df[keep].copy(), ids[keep]
+        for col in columns:
+            df[col] = ids.map(jobs[col]).to_numpy()
+        if columns or removed:
+            write_csv_robust(df, path)
+            extra = f", eliminadas {removed} filas" if removed else ""
+            print(f"[OK] {path.name}: {len(df)} filas actualizadas desde el registro{extra}")
+
+def run_on_registry(process_file, base_global, columns, registry_dir=None, careers=None) -> None:
+    """
+    Ejecuta una etapa (process_file(path)) una sola vez sobre las ofertas únicas y
+    propaga sus columnas de salida a todas las carreras.
+    """
+    jobs_path = build_registry(base_global, registry_dir, careers)
+    process_file(jobs_path)
+    propagate_registry(base_global, columns, registry_dir, careers)
+
+def run_stage_on_registry(enabled: bool, process_file, base_global, columns, only_career=None) -> bool:
+    """
+    Rama USE_GLOBAL_REGISTRY del process_all de una etapa: con enabled ejecuta la etapa
+    sobre el registro (solo only_career, si se indica) y devuelve True; si no, False y la
+    etapa recorre las carreras como siempre.
+    """
+    if not enabled:
+        return False
+    run_on_registry(process_file, base_global, columns, careers=[only_career] if only_career else None)
+    return True
@@ -0,0 +1,47 @@
+"""
+Identificación local del idioma (n-gramas de caracteres con langdetect, sin red).
+
+Los traductores la usan como pre-filtro: el texto que ya está en el idioma destino
+pasa directo a la salida y solo el resto va a la API de traducción. El idioma de cada
+descripción queda en la columna LANG_COL.
+
+Sin langdetect instalado todo se marca como UNKNOWN y se traduce como antes.
+"""
+
+import pandas as pd
+try:
+    from langdetect import DetectorFactory, detect_langs
+    from langdetect.lang_detect_exception import LangDetectException
+    DetectorFactory.seed = 0     # resultados reproducibles entre ejecuciones
+    HAS_LANGDETECT = True
+except ImportError:
+    HAS_LANGDETECT = False
+
+# ===================== CONFIGURACIÓN =====================
+LANG_COL = "description_lang"
+UNKNOWN = "und"           # texto corto, sin letras o sin langdetect
+MIN_CHARS = 20            # por debajo el n-grama no es fiable: se traduce igual
+MAX_CHARS = 1000          # solo se analiza el inicio del texto (suficiente y más rápido)
+MIN_PROB = 0.80           # probabilidad mínima del idioma más probable
+# ==========================================================
+
+def detect_lang(text) -> str:
+    """Código ISO 639-1 del idioma del texto ('es', 'en', 'pt', ...) o UNKNOWN."""
+    if not HAS_LANGDETECT or not isinstance(text, str):
+        return UNKNOWN
+    sample = text[:MAX_CHARS].strip()
+    if len(sample) < MIN_CHARS:
+        return UNKNOWN
+    try:
+        best = detect_langs(sample)[0]
+    except LangDetectException:
+        return UNKNOWN
+    return best.lang if best.prob >= MIN_PROB else UNKNOWN
+
+def detect_series(series: pd.Series) -> pd.Series:
+    """Aplica detect_lang una vez por valor distinto y lo expande a todas las filas."""
+    if series.empty:
+        return pd.Series([], index=series.index, dtype=object)
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+    langs = [detect_lang(u) for u in uniques] + [UNKNOWN]   # código -1 -> NaN
+    return pd.Series([langs[c] for c in codes], index=series.index, dtype=object)
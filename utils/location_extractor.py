@@ -160,6 +160,24 @@ def build_country_index(cmap: dict) -> dict:
 
 VARIANT2CANON = build_country_index(COUNTRY_CANONICAL_MAP)
 
+def build_country_trie(variant_index: dict) -> dict:
+    """
+    Construye un trie por tokens (palabras separadas por espacio) sobre las variantes.
+    Cada nodo terminal guarda (largo, orden, país) para resolver empates igual que
+    el recorrido 'más largas primero' sobre el índice.
+    """
+    trie = {}
+    for order, (variant, canon) in enumerate(variant_index.items()):
+        if not variant or len(variant) < 2:
+            continue
+        node = trie
+        for token in variant.split(" "):
+            node = node.setdefault(token, {})
+        node[None] = (len(variant), order, canon)
+    return trie
+
+COUNTRY_TRIE = build_country_trie(VARIANT2CANON)
+
 # ---------------- Funciones de detección ----------------
 NOISE_WORDS = r"(greater|metropolitan|metro|area|region|province|state|prefecture|governorate)"
 
@@ -175,16 +193,22 @@ def _strip_noise_for_guess(s: str) -> str:
 def soft_country_guess(full_loc: str) -> str:
     """
     Detección suave por 'contains' con límites de palabra usando el índice de variantes.
-    Recorre variantes más largas primero para evitar colisiones (ej. korea vs south korea).
+    Recorre el texto una sola vez sobre el trie de tokens y se queda con la variante
+    más larga encontrada para evitar colisiones (ej. korea vs south korea).
     """
-    s = f" {_strip_noise_for_guess(clean_text(full_loc))} "
-    # ordenar por largo descendente
-    for variant in sorted(VARIANT2CANON.keys(), key=len, reverse=True):
-        if not variant or len(variant) < 2:
-            continue
-        if f" {variant} " in s:
-            return VARIANT2CANON[variant]
-    return ""
+    tokens = _strip_noise_for_guess(clean_text(full_loc)).split(" ")
+    best = None
+    for start in range(len(tokens)):
+        node = COUNTRY_TRIE
+        for token in tokens[start:]:
+            node = node.get(token)
+            if node is None:
+                break
+            match = node.get(None)
+            # más larga primero; a igual largo, la primera del índice
+            if match and (best is None or (-match[0], match[1]) < (-best[0], best[1])):
+                best = match
+    return best[2] if best else ""
 
 # ---------------- Función principal de extracción ----------------
 def country_from_location(loc: str) -> str:
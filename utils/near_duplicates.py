@@ -0,0 +1,255 @@
+"""
+Detección de casi-duplicados entre plataformas con MinHash + LSH.
+
+'make_uid' solo une ofertas idénticas en (título, empresa, ubicación, fecha); la misma
+oferta publicada en Jooble y LinkedIn con pequeñas diferencias sobrevive como filas
+distintas. Aquí cada oferta se resume en una firma MinHash de los shingles de
+título + empresa + descripción, y un índice LSH por bandas propone solo los pares
+candidatos (sin comparar todos contra todos). Los pares cuya similitud estimada supera
+JACCARD_THRESHOLD se agrupan y cada grupo recibe un id canónico (CANONICAL_COL).
+
+El índice (firmas + id canónico por job_id) se guarda en 'registro_global/' y las
+ejecuciones siguientes solo calculan firmas para las ofertas nuevas.
+"""
+
+import os
+import re
+import zlib
+import unicodedata
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import default_registry_dir
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import default_registry_dir
+
+# ===================== CONFIGURACIÓN =====================
+NUM_PERM = 128               # funciones hash por firma
+BANDS = 16                   # bandas LSH (BANDS * ROWS == NUM_PERM)
+ROWS = NUM_PERM // BANDS     # umbral LSH aprox. (1/BANDS)^(1/ROWS) ≈ 0.71
+SHINGLE_WORDS = 3            # shingles de 3 palabras
+JACCARD_THRESHOLD = 0.8      # similitud estimada mínima para marcar casi-duplicado
+TITLE_MIN_JACCARD = 0.5      # además, los títulos deben compartir palabras (evita unir
+                             # puestos distintos de una empresa con la misma plantilla)
+TEXT_COLS = ["job_title", "company", "description"]
+CANONICAL_COL = "canonical_job_id"
+INDEX_FILE = "near_dup_index.npz"
+MAX_BUCKET = 200             # cubetas LSH más grandes (p.ej. textos idénticos) se encadenan
+                             # en vez de generar todos sus pares
+SEED = 42                    # fija las permutaciones: las firmas guardadas siguen siendo válidas
+# ==========================================================
+
+_PRIME = np.uint64(4294967311)   # primo > 2^32
+_rng = np.random.RandomState(SEED)
+_A = _rng.randint(1, 2**31 - 1, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2**31 - 1, size=NUM_PERM).astype(np.uint64)
+_EMPTY = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+# ---------------- Firmas ----------------
+def _normalize(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"\w+", text)
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> set[str]:
+    """Conjunto de shingles de k palabras (o la única ventana si el texto es más corto)."""
+    words = _normalize(text)
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+def minhash(text: str) -> np.ndarray:
+    """Firma MinHash (NUM_PERM valores uint64) con hashes estables entre ejecuciones (crc32)."""
+    sh = shingles(text)
+    if not sh:
+        return _EMPTY.copy()
+    hv = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in sh), dtype=np.uint64, count=len(sh))
+    return ((np.outer(hv, _A) + _B) % _PRIME).min(axis=0)
+
+def title_similarity(a: str, b: str) -> float:
+    """Jaccard exacto entre las palabras de dos títulos."""
+    wa, wb = set(_normalize(a)), set(_normalize(b))
+    return len(wa & wb) / len(wa | wb) if wa | wb else 1.0
+
+def _job_text(row) -> str:
+    return " ".join("" if pd.isna(row.get(c)) else str(row.get(c)) for c in TEXT_COLS)
+
+# ---------------- Índice persistente ----------------
+def load_index(path) -> dict:
+    """Índice guardado: {'job_ids', 'titles', 'signatures', 'canonical'} (vacío si no existe)."""
+    path = Path(path)
+    empty = {"job_ids": np.array([], dtype=str),
+             "titles": np.array([], dtype=str),
+             "signatures": np.empty((0, NUM_PERM), dtype=np.uint64),
+             "canonical": np.array([], dtype=str)}
+    if not path.exists():
+        return empty
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if data["signatures"].shape[1] != NUM_PERM:
+                raise ValueError(f"El índice {path} usa otro NUM_PERM; bórralo para reconstruirlo")
+            return {k: data[k] for k in ("job_ids", "titles", "signatures", "canonical")}
+    except ValueError as e:
+        if "pickle" not in str(e):
+            raise
+        # índices antiguos guardados con dtype=object: se reconstruyen desde los CSV
+        print(f"[WARN] Índice {path.name} en formato antiguo (objetos Python); se reconstruye")
+        return empty
+
+def save_index(index: dict, path) -> None:
+    """Guarda el índice sin objetos Python: ids y títulos como texto de ancho fijo."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.stem}.tmp.npz")
+    data = {k: (v if k == "signatures" else np.asarray(v, dtype=str)) for k, v in index.items()}
+    np.savez_compressed(tmp, **data)
+    os.replace(tmp, path)
+
+# ---------------- LSH + agrupamiento ----------------
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def candidate_pairs(signatures: np.ndarray, nuevos_desde: int = 0, titles=None):
+    """
+    Pares (i, j) que comparten al menos una banda LSH, con j >= nuevos_desde
+    (los pares entre ofertas ya indexadas se resolvieron en ejecuciones anteriores).
+
+    Las firmas vacías (ofertas sin texto) no entran en las cubetas. Una cubeta de más de
+    MAX_BUCKET ofertas (firmas idénticas o casi) no genera todos sus pares: sus miembros,
+    ordenados por título si se pasa 'titles', se encadenan con su vecino, y la unión
+    transitiva de cluster() reconstruye el grupo con un número lineal de pares.
+    """
+    valid = np.flatnonzero(~(signatures == _EMPTY).all(axis=1))
+    pairs = set()
+    for b in range(BANDS):
+        band = np.ascontiguousarray(signatures[valid, b * ROWS:(b + 1) * ROWS])
+        buckets = {}
+        for i, key in zip(valid.tolist(), map(bytes, band)):
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            if len(members) < 2 or members[-1] < nuevos_desde:
+                continue
+            if len(members) > MAX_BUCKET:
+                if titles is not None:
+                    members = sorted(members, key=lambda i: (titles[i], i))
+                pairs.update((min(i, j), max(i, j)) for i, j in zip(members, members[1:])
+                             if max(i, j) >= nuevos_desde)
+                continue
+            for j in members:
+                if j < nuevos_desde:
+                    continue
+                pairs.update((i, j) for i in members if i < j)
+    return pairs
+
+def cluster(signatures: np.ndarray, titles: list, canonical_prev: list, job_ids: list, nuevos_desde: int) -> list:
+    """
+    Une los pares candidatos con similitud estimada >= JACCARD_THRESHOLD (y títulos
+    parecidos, TITLE_MIN_JACCARD) y devuelve el id
+    canónico de cada oferta: el de la oferta indexada primero en su grupo, de modo que
+    los ids canónicos ya publicados se conservan.
+    """
+    n = len(job_ids)
+    parent = list(range(n))
+    # Los grupos previos se reconstruyen uniendo cada oferta con su canónica
+    pos = {jid: i for i, jid in enumerate(job_ids)}
+    for i, canon in enumerate(canonical_prev):
+        j = pos.get(canon, i)
+        ri, rj = _find(parent, i), _find(parent, j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    for i, j in candidate_pairs(signatures, nuevos_desde, titles):
+        if (np.mean(signatures[i] == signatures[j]) >= JACCARD_THRESHOLD
+                and title_similarity(titles[i], titles[j]) >= TITLE_MIN_JACCARD):
+            ri, rj = _find(parent, i), _find(parent, j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)   # la raíz es siempre la más antigua
+
+    return [job_ids[_find(parent, i)] for i in range(n)]
+
+# ---------------- Etapa sobre el corpus ----------------
+def _career_files(base_global: Path):
+    for d in sorted((p for p in base_global.iterdir() if p.is_dir()), key=lambda x: x.name.lower()):
+        target = d / f"{d.name}_Merged.csv"
+        if target.exists():
+            yield target
+
+def marcar_casi_duplicados(base_global=None, index_path=None) -> dict:
+    """
+    Actualiza el índice MinHash con las ofertas nuevas de todos los <Carrera>_Merged.csv
+    y escribe en cada uno la columna CANONICAL_COL (igual a job_id si la oferta no tiene
+    casi-duplicados). No elimina filas.
+
+    Args:
+        base_global: Carpeta 'todas_las_plataformas' (default: data/outputs/todas_las_plataformas)
+        index_path: Índice persistente (default: registro_global/near_dup_index.npz)
+
+    Returns:
+        dict: {"ofertas", "nuevas", "grupos", "casi_duplicados"}
+    """
+    base_global = Path(base_global or os.path.join("data", "outputs", "todas_las_plataformas"))
+    if index_path is None:
+        index_path = default_registry_dir(base_global) / INDEX_FILE
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+
+    index = load_index(index_path)
+    known = set(index["job_ids"].tolist())
+    job_ids = index["job_ids"].tolist()
+    titles = index["titles"].tolist()
+    canonical_prev = index["canonical"].tolist()
+    nuevas_firmas = []
+
+    files = list(_career_files(base_global))
+    for path in files:
+        df = read_csv_robust(path)
+        if df.empty or "job_id" not in df.columns:
+            continue
+        df = df[["job_id", *[c for c in TEXT_COLS if c in df.columns]]]
+        for row in df.drop_duplicates(subset="job_id").to_dict("records"):
+            jid = str(row["job_id"])
+            if jid in known:
+                continue
+            known.add(jid)
+            job_ids.append(jid)
+            titles.append("" if pd.isna(row.get("job_title")) else str(row["job_title"]))
+            canonical_prev.append(jid)
+            nuevas_firmas.append(minhash(_job_text(row)))
+
+    nuevos_desde = len(index["job_ids"])
+    signatures = np.vstack([index["signatures"], *nuevas_firmas]) if nuevas_firmas else index["signatures"]
+    canonical = cluster(signatures, titles, canonical_prev, job_ids, nuevos_desde) if job_ids else []
+
+    save_index({"job_ids": job_ids, "titles": titles, "signatures": signatures,
+                "canonical": canonical}, index_path)
+
+    mapping = dict(zip(job_ids, canonical))
+    for path in files:
+        df = read_csv_robust(path)
+        if df.empty or "job_id" not in df.columns:
+            continue
+        ids = df["job_id"].astype(str)
+        df[CANONICAL_COL] = ids.map(mapping).fillna(ids).to_numpy()
+        write_csv_robust(df, path)
+
+    grupos = pd.Series(canonical, dtype=object).value_counts() if canonical else pd.Series(dtype=int)
+    resumen = {
+        "ofertas": len(job_ids),
+        "nuevas": len(nuevas_firmas),
+        "grupos": int((grupos > 1).sum()),
+        "casi_duplicados": int((grupos[grupos > 1] - 1).sum()),
+    }
+    print(f"[INFO] Casi-duplicados: {resumen['ofertas']} ofertas ({resumen['nuevas']} nuevas) | "
+          f"{resumen['grupos']} grupos | {resumen['casi_duplicados']} casi-duplicados marcados en '{CANONICAL_COL}'")
+    return resumen
+
+
+if __name__ == "__main__":
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "outputs", "todas_las_plataformas")
+    marcar_casi_duplicados(os.path.normpath(base))
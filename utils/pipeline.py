@@ -0,0 +1,195 @@
+"""
+Pipeline fusionado posterior a la unión (ver diagrama.md):
+
+    Traductor_Descripcion → Normalizador_Independiente → Traductor_Skills
+    → Extract_Habilidades → Eliminar_Filas_Vacias
+
+Cada <Carrera>_Merged.csv se lee una sola vez, las etapas se aplican en memoria con su
+transform_df() y el archivo se escribe una sola vez al final (solo si alguna etapa lo
+modificó). Los scripts de cada etapa siguen funcionando por separado.
+"""
+
+from pathlib import Path
+
+try:
+    from .csv_loader import read_csv_robust, write_csv_robust
+    from .job_registry import run_stage_on_registry
+    from .fingerprints import save_fingerprints
+    from .streaming import stream_file
+    from . import translation_cache
+    from .translation_scheduler import print_all_metrics
+    from .translation_checkpoint import clear_checkpoint
+    from . import Traductor_Descripcion as traductor_descripcion
+    from . import Normalizador_Independiente as normalizador
+    from . import Traductor_Skills as traductor_skills
+    from . import Extract_Habilidades as extract_habilidades
+    from . import Eliminar_Filas_Vacias as eliminar_filas_vacias
+except ImportError:
+    from csv_loader import read_csv_robust, write_csv_robust
+    from job_registry import run_stage_on_registry
+    from fingerprints import save_fingerprints
+    from streaming import stream_file
+    import translation_cache
+    from translation_scheduler import print_all_metrics
+    from translation_checkpoint import clear_checkpoint
+    import Traductor_Descripcion as traductor_descripcion
+    import Normalizador_Independiente as normalizador
+    import Traductor_Skills as traductor_skills
+    import Extract_Habilidades as extract_habilidades
+    import Eliminar_Filas_Vacias as eliminar_filas_vacias
+
+# ===================== CONFIGURACIÓN =====================
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASE_GLOBAL = REPO_ROOT / "data" / "outputs" / "todas_las_plataformas"
+DICT_PATH = REPO_ROOT / "config" / "skills.yml"    # diccionario EURACE de Extract_Habilidades
+ONLY_THIS_CAREER = None          # p.ej. "Administración_de_Empresas" o None para todas
+USE_GLOBAL_REGISTRY = False      # True: una pasada sobre las ofertas únicas (ver job_registry.py)
+STREAMING = False                # True: cada bloque de CHUNK_ROWS filas pasa por todas las etapas (ver streaming.py)
+CHUNK_ROWS = 2000
+
+# Etapas a ejecutar, en orden (quitar una para saltarla)
+STAGES = [
+    "traductor_descripcion",
+    "normalizador",
+    "traductor_skills",
+    "extract_habilidades",
+    "eliminar_filas_vacias",
+]
+# ==========================================================
+
+_MODULES = {
+    "traductor_descripcion": traductor_descripcion,
+    "normalizador": normalizador,
+    "traductor_skills": traductor_skills,
+    "extract_habilidades": extract_habilidades,
+    "eliminar_filas_vacias": eliminar_filas_vacias,
+}
+
+def _stage_columns(stages) -> list[str]:
+    """Columnas de salida que el registro global debe propagar a cada carrera."""
+    cols = {
+        "traductor_descripcion": [traductor_descripcion.NEW_COL, traductor_descripcion.LANG_COL],
+        "normalizador": [normalizador.FINAL_COL],
+        "traductor_skills": [traductor_skills.SKILLS_COL],
+        "extract_habilidades": [extract_habilidades.EURACE_COL, extract_habilidades.INIT_COL],
+        "eliminar_filas_vacias": [],
+    }
+    return list(dict.fromkeys(c for s in stages for c in cols[s]))
+
+def _transforms(path: Path, stages, dictionary, queue=None) -> list:
+    """(STAGE_NAME, fn(df) -> (df, huellas, cambió)) de cada etapa, en orden."""
+    out = []
+    for name in stages:
+        module = _MODULES[name]
+        if name == "extract_habilidades":
+            fn = lambda df, m=module: m.transform_df(df, path, dictionary, DICT_PATH)
+        elif name == "traductor_descripcion":
+            fn = lambda df, m=module: m.transform_df(df, path, queue)
+        else:
+            fn = lambda df, m=module: m.transform_df(df, path)
+        out.append((module.STAGE_NAME, fn))
+    return out
+
+def process_file(path: Path, stages=None, dictionary=None, queue=None) -> None:
+    """
+    Lee el CSV una vez, aplica las etapas en memoria y lo escribe una vez.
+    Las huellas de cada etapa (ver fingerprints.py) se guardan después de escribir.
+    Con STREAMING lo mismo se hace bloque a bloque (ver streaming.py).
+    """
+    path = Path(path)
+    stages = stages or STAGES
+    if "extract_habilidades" in stages and dictionary is None:
+        dictionary = extract_habilidades.load_dictionary(DICT_PATH)
+    transforms = _transforms(path, stages, dictionary, queue)
+
+    if STREAMING:
+        try:
+            stream_file(path, transforms, CHUNK_ROWS)
+        except Exception as e:
+            print(f"[ERROR] {path.name}: {e}")
+            return
+        _clear_checkpoints(path, stages)
+        return
+
+    try:
+        df = read_csv_robust(path)
+    except Exception as e:
+        print(f"[ERROR] Leyendo {path.name}: {e}")
+        return
+
+    pendientes, changed = [], False
+    for stage_name, fn in transforms:
+        df, fps, stage_changed = fn(df)
+        changed |= stage_changed
+        if fps is not None:
+            pendientes.append((stage_name, fps))
+
+    if changed:
+        write_csv_robust(df, path)
+        print(f"[OK] {path.name}: {len(df)} filas escritas tras {len(stages)} etapas")
+    else:
+        print(f"[OK] {path.name}: sin cambios")
+    for stage_name, fps in pendientes:
+        save_fingerprints(path, stage_name, df, fps)
+    _clear_checkpoints(path, stages)
+
+def _clear_checkpoints(path: Path, stages) -> None:
+    """Las traducciones ya están en el CSV: se borra el punto de control (ver translation_checkpoint.py)."""
+    if "traductor_descripcion" in stages:
+        clear_checkpoint(path, traductor_descripcion.STAGE_NAME)
+        traductor_descripcion.forget_prepared(path)
+
+def _print_translation_stats(stages) -> None:
+    """Caché de traducciones y planificadores AIMD (compartidos por ambos traductores)."""
+    if {"traductor_descripcion", "traductor_skills"} & set(stages):
+        if translation_cache.ENABLED:
+            translation_cache.print_stats()
+        print_all_metrics()
+
+def run_all(stages=None) -> None:
+    stages = stages or STAGES
+    base = Path(BASE_GLOBAL)
+    if not base.exists():
+        raise FileNotFoundError(f"No existe la ruta base: {base}")
+
+    # El diccionario EURACE se carga una sola vez para todas las carreras
+    dictionary = None
+    if "extract_habilidades" in stages:
+        dictionary = extract_habilidades.load_dictionary(DICT_PATH)
+
+    if run_stage_on_registry(
+        USE_GLOBAL_REGISTRY,
+        lambda p: process_file(p, stages, dictionary),
+        base, _stage_columns(stages), ONLY_THIS_CAREER,
+    ):
+        _print_translation_stats(stages)
+        return
+
+    dirs = [p for p in base.iterdir() if p.is_dir()]
+    if ONLY_THIS_CAREER:
+        dirs = [d for d in dirs if d.name == ONLY_THIS_CAREER]
+    if not dirs:
+        print("[WARN] No se encontraron carpetas de carrera para procesar.")
+        return
+
+    targets = []
+    for d in sorted(dirs, key=lambda x: x.name.lower()):
+        target = d / f"{d.name}_Merged.csv"
+        if not target.exists():
+            print(f"[SKIP] No existe {target.name} en {d.name}")
+            continue
+        targets.append(target)
+
+    # Las descripciones pendientes de todas las carreras se traducen una vez antes de empezar
+    queue = None
+    if "traductor_descripcion" in stages and traductor_descripcion.GLOBAL_QUEUE:
+        queue = traductor_descripcion.build_global_queue(targets)
+    for target in targets:
+        process_file(target, stages, dictionary, queue)
+    if queue is not None:
+        queue.finish()
+    _print_translation_stats(stages)
+
+
+if __name__ == "__main__":
+    run_all()
@@ -13,10 +13,12 @@ try:
     # Importación relativa (cuando se usa como módulo)
     from .location_extractor import clean_text, title_case_no_accents, bucket_from_country
     from .chart_generator import generate_all_charts
+    from .csv_loader import read_csv_robust
 except ImportError:
     # Importación absoluta (cuando se ejecuta directamente)
     from location_extractor import clean_text, title_case_no_accents, bucket_from_country
     from chart_generator import generate_all_charts
+    from csv_loader import read_csv_robust
 
 # ===================== CONFIGURACIÓN =====================
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -30,7 +32,7 @@ TOP_N_COUNTRIES = 15
 
 def read_csv_with_fallback(filepath: str) -> pd.DataFrame:
     """
-    Lee un archivo CSV con fallback de encoding.
+    Lee un archivo CSV detectando encoding y separador en una sola pasada.
     
     Args:
         filepath: Ruta al archivo CSV
@@ -39,21 +41,9 @@ def read_csv_with_fallback(filepath: str) -> pd.DataFrame:
         pd.DataFrame: DataFrame leído
         
     Raises:
-        Exception: Si no se puede leer con ningún encoding
+        Exception: Si no se puede leer el archivo
     """
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-    
-    for encoding in encodings:
-        try:
-            return pd.read_csv(filepath, encoding=encoding)
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            # Si es otro error que no sea de encoding, re-lanzar
-            if encoding == encodings[0]:  # Solo en el primer intento
-                raise e
-    
-    raise Exception(f"No se pudo leer el archivo con ningún encoding: {filepath}")
+    return read_csv_robust(filepath, low_memory=True)
 
 def load_all_from_tree(base_dir: str) -> pd.DataFrame:
     """
@@ -263,7 +253,7 @@ def process_job_data(base_dir: str = None, output_dir: str = None) -> None:
         print("🌍 Procesando ubicaciones geográficas...")
         if "location_final" in df.columns and df["location_final"].notna().sum() > 0:
             print(f"   ✅ Usando {df['location_final'].notna().sum():,} ubicaciones pre-procesadas")
-            df["country"] = df["location_final"].fillna("").astype(str)
+            df["country"] = df["location_final"].astype(object).fillna("").astype(str)
             df["country_show"] = df["country"].apply(lambda x: title_case_no_accents(x) if x else "")
             df["region_bucket"] = df["country"].apply(lambda x: bucket_from_country(x) if x else "")
         else:
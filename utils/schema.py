@@ -0,0 +1,86 @@
+"""
+Esquema central de tipos para el corpus (columna -> dtype).
+Las columnas de baja cardinalidad se cargan como 'category' y los textos largos
+como 'string[pyarrow]' para reducir memoria frente al dtype 'object' por defecto.
+"""
+
+import os
+import pandas as pd
+try:
+    import pyarrow  # noqa: F401  (requerido por 'string[pyarrow]')
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    TEXT_DTYPE = "string"
+
+# ===================== CONFIGURACIÓN =====================
+CATEGORY_COLS = [
+    "source", "careers_required", "career_tag", "extraction_date",
+    "date_posted_norm", "location_final", "EURACE_skills", "description_lang",
+]
+TEXT_COLS = [
+    "job_id", "job_title", "company", "location", "url",
+    "description", "description_final",
+]
+SCHEMA = {
+    **{c: "category" for c in CATEGORY_COLS},
+    **{c: TEXT_DTYPE for c in TEXT_COLS},
+}
+# ==========================================================
+
+def apply_schema(df: pd.DataFrame, schema: dict | None = None) -> pd.DataFrame:
+    """
+    Convierte in-place las columnas presentes en el DataFrame al dtype del esquema.
+    Columnas ausentes o que no admiten la conversión se dejan como están.
+
+    Args:
+        df: DataFrame recién leído
+        schema: Mapeo columna -> dtype (default: SCHEMA)
+
+    Returns:
+        pd.DataFrame: El mismo DataFrame con los dtypes aplicados
+    """
+    for col, dtype in (schema or SCHEMA).items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+    return df
+
+def memory_report(base_dir: str) -> pd.DataFrame:
+    """
+    Compara la memoria de cada <Carrera>_Merged.csv con dtypes por defecto y con el esquema.
+
+    Args:
+        base_dir: Carpeta 'todas_las_plataformas'
+
+    Returns:
+        pd.DataFrame: MB por carrera antes/después y porcentaje de reducción (fila TOTAL al final)
+    """
+    try:
+        from .csv_loader import read_csv_robust
+    except ImportError:
+        from csv_loader import read_csv_robust
+
+    rows = []
+    for carrera in sorted(os.listdir(base_dir)):
+        fpath = os.path.join(base_dir, carrera, f"{carrera}_Merged.csv")
+        if not os.path.isfile(fpath):
+            continue
+        df = read_csv_robust(fpath, schema=False)
+        before = df.memory_usage(deep=True).sum()
+        after = apply_schema(df).memory_usage(deep=True).sum()
+        rows.append({"carrera": carrera, "filas": len(df), "mb_object": before / 1e6, "mb_schema": after / 1e6})
+
+    report = pd.DataFrame(rows, columns=["carrera", "filas", "mb_object", "mb_schema"])
+    total = {"carrera": "TOTAL", "filas": report["filas"].sum(),
+             "mb_object": report["mb_object"].sum(), "mb_schema": report["mb_schema"].sum()}
+    report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    report["reduccion_%"] = (100 * (1 - report["mb_schema"] / report["mb_object"])).round(1)
+    return report.round({"mb_object": 2, "mb_schema": 2})
+
+
+if __name__ == "__main__":
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "outputs", "todas_las_plataformas")
+    print(memory_report(os.path.normpath(base)).to_string(index=False))
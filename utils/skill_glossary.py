@@ -0,0 +1,103 @@
+"""
+Glosario de skills para Traductor_Skills: resuelve sin llamar al backend de traducción
+los términos que no deben traducirse (SQL, Excel, Scrum...) y los que tienen una
+traducción fija (teamwork -> trabajo en equipo).
+
+- Fuentes: config/skills_glossary.yml (no_translate + glossary) y las frases canónicas
+  de config/skills.yml, que ya están en español (igual que las traducciones del glosario).
+- Búsqueda: diccionario por clave normalizada (sin mayúsculas, tildes ni guiones).
+- write_suggestions() deja las skills traducidas más frecuentes de la ejecución en un
+  YAML de sugerencias para revisarlas y pasarlas al glosario.
+"""
+
+import re
+import unicodedata
+from pathlib import Path
+import yaml
+
+# ===================== CONFIGURACIÓN =====================
+REPO_ROOT = Path(__file__).resolve().parent.parent
+GLOSSARY_PATH = REPO_ROOT / "config" / "skills_glossary.yml"
+SKILLS_YML = REPO_ROOT / "config" / "skills.yml"       # frases canónicas (se conservan)
+SUGGESTIONS_PATH = REPO_ROOT / "data" / "cache" / "skills_glossary_suggestions.yml"
+SUGGEST_TOP = 200            # skills traducidas más frecuentes que se proponen
+SUGGEST_MIN_COUNT = 3        # apariciones mínimas para proponer una skill
+# ==========================================================
+
+_SEP_RE = re.compile(r"[\s\-_]+")
+_GLOSSARY = None             # {clave normalizada: salida}; se carga una vez por proceso
+
+def normalize_key(text: str) -> str:
+    """Clave de búsqueda: minúsculas, sin tildes y con espacios/guiones colapsados."""
+    s = unicodedata.normalize("NFKD", str(text))
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return _SEP_RE.sub(" ", s.casefold()).strip()
+
+def _read_yaml(path: Path) -> dict:
+    if not Path(path).exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+def load_glossary(reload: bool = False) -> dict:
+    """
+    {clave normalizada: salida}. Prioridad (la última gana): frases de skills.yml y
+    traducciones del glosario (ya en español), no_translate (salida = el término tal cual)
+    y glossary.
+    """
+    global _GLOSSARY
+    if _GLOSSARY is not None and not reload:
+        return _GLOSSARY
+    table = {}
+    for cat in (_read_yaml(SKILLS_YML).get("categories") or {}).values():
+        for phrase in (cat or {}).get("canonical") or []:
+            table[normalize_key(phrase)] = str(phrase)
+    cfg = _read_yaml(GLOSSARY_PATH)
+    glossary = cfg.get("glossary") or {}
+    for tgt in glossary.values():
+        table[normalize_key(tgt)] = str(tgt)
+    for term in cfg.get("no_translate") or []:
+        table[normalize_key(term)] = None        # None: se devuelve el ítem original
+    for src, tgt in glossary.items():
+        table[normalize_key(src)] = str(tgt)
+    _GLOSSARY = table
+    return table
+
+def lookup(item: str) -> str | None:
+    """Salida del glosario para la skill o None si no está (hay que traducirla)."""
+    table = load_glossary()
+    key = normalize_key(item)
+    if key not in table:
+        return None
+    out = table[key]
+    return item if out is None else out
+
+def write_suggestions(counts, translations: dict, path: Path | None = None) -> int:
+    """
+    Guarda en YAML las skills traducidas más frecuentes que aún no están en el glosario
+    (origen -> traducción), para revisarlas y copiarlas a GLOSSARY_PATH.
+
+    Args:
+        counts: collections.Counter de apariciones de cada skill enviada a traducir
+        translations: {skill: traducción} (la caché de sesión del traductor)
+
+    Returns:
+        int: número de sugerencias escritas
+    """
+    table = load_glossary()
+    out = {}
+    for item, n in counts.most_common():
+        if len(out) >= SUGGEST_TOP or n < SUGGEST_MIN_COUNT:
+            break
+        tr = translations.get(item)
+        if isinstance(tr, str) and tr and normalize_key(item) not in table:
+            out[item] = tr
+    if not out:
+        return 0
+    path = Path(path or SUGGESTIONS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Skills traducidas más frecuentes: revisar y copiar a config/skills_glossary.yml\n")
+        yaml.safe_dump({"glossary": out}, f, allow_unicode=True, sort_keys=False)
+    print(f"[INFO] {len(out)} sugerencias de glosario en {path}")
+    return len(out)
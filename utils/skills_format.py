@@ -0,0 +1,73 @@
+"""
+Formato compartido de la columna 'skills' (y demás columnas de listas).
+
+Los extractores escriben las listas como JSON ('["Python", "SQL"]'). Para los CSV
+antiguos, escritos con el repr de Python ("['Python', 'SQL']") o como texto plano
+('Python, SQL'), hay un único parser que se evalúa una vez por valor distinto de la
+columna y no una vez por fila.
+"""
+
+import ast
+import json
+import pandas as pd
+
+# ===================== CONFIGURACIÓN =====================
+LIST_COLS = ["skills", "soft_skills_detected"]   # columnas con listas en los extractores
+# ==========================================================
+
+def _clean(items) -> list[str] | None:
+    out = [str(x).strip() for x in items if x is not None]
+    out = [x for x in out if x]
+    return out or None
+
+def parse_skills_cell(cell) -> list[str] | None:
+    """
+    Devuelve lista de strings o None si la celda está vacía.
+    Trata como vacío: NaN, "", "[]", "[   ]".
+    Acepta listas, JSON, listas Python en string (CSV antiguos) o 'a, b, c'.
+    """
+    if isinstance(cell, (list, tuple)):
+        return _clean(cell)
+    if cell is None or pd.isna(cell):
+        return None
+    s = str(cell).strip()
+    if not s:
+        return None
+
+    if s.startswith("[") and s.endswith("]"):
+        if not s[1:-1].strip():
+            return None
+        try:
+            obj = json.loads(s)
+        except ValueError:
+            try:
+                obj = ast.literal_eval(s)   # solo CSV escritos antes del formato JSON
+            except Exception:
+                obj = None
+        if isinstance(obj, list):
+            return _clean(obj)
+
+    return _clean(s.split(","))
+
+def parse_skills_series(series: pd.Series) -> pd.Series:
+    """Aplica parse_skills_cell una vez por valor distinto y lo expande a todas las filas."""
+    if series.empty:
+        return pd.Series([], index=series.index, dtype=object)
+    if series.map(lambda v: isinstance(v, (list, tuple))).any():
+        return series.map(parse_skills_cell)   # listas en memoria: no se pueden factorizar
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+    parsed = [parse_skills_cell(u) for u in uniques] + [None]   # código -1 -> NaN -> None
+    return pd.Series([parsed[c] for c in codes], index=series.index, dtype=object)
+
+def skills_empty_mask(series: pd.Series) -> pd.Series:
+    """True donde la celda no tiene ninguna skill (NaN, '', '[]', '[ ]', ...)."""
+    return parse_skills_series(series).isna()
+
+def skills_to_json(df: pd.DataFrame, cols=None) -> pd.DataFrame:
+    """Serializa como JSON las celdas con listas de las columnas indicadas (default: LIST_COLS)."""
+    for col in cols or LIST_COLS:
+        if col in df.columns:
+            df[col] = df[col].map(
+                lambda v: json.dumps(list(v), ensure_ascii=False) if isinstance(v, (list, tuple)) else v
+            )
+    return df
@@ -0,0 +1,116 @@
+"""
+Modo streaming para las etapas de utils.
+
+El <Carrera>_Merged.csv se recorre en bloques de CHUNK_ROWS filas. Cada bloque pasa por
+el transform_df de las etapas y se añade a un temporal junto al CSV, que al final
+reemplaza al original con un rename atómico. La memoria pico depende del tamaño del
+bloque y no del corpus. Si ninguna etapa modifica nada, el temporal se descarta y el
+CSV queda intacto.
+
+Las huellas de cada etapa (ver fingerprints.py) también se escriben por bloques. En los
+bloques en que una etapa no devuelve huellas (nada que hacer), se conservan las que ya
+estaban guardadas para esas filas.
+
+Una etapa puede crear una columna recién en un bloque posterior al primero (p. ej.
+description_lang cuando el primer bloque no tenía nada que traducir). En ese caso el
+temporal ya escrito se reescribe con la unión de columnas antes de seguir.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from .csv_loader import iter_csv_chunks, record_dialect
+    from .fingerprints import saved_fingerprints, fingerprints_tmp, append_fingerprints, commit_fingerprints
+except ImportError:
+    from csv_loader import iter_csv_chunks, record_dialect
+    from fingerprints import saved_fingerprints, fingerprints_tmp, append_fingerprints, commit_fingerprints
+
+# ===================== CONFIGURACIÓN =====================
+CHUNK_ROWS = 2000      # filas por bloque (default de stream_file)
+# ==========================================================
+
+def _widen(tmp_csv: Path, columns: list, chunk_rows: int) -> None:
+    """Reescribe el temporal con las columnas ``columns`` (las nuevas quedan vacías)."""
+    wide = tmp_csv.with_name(f"{tmp_csv.name}.wide")
+    wide.unlink(missing_ok=True)
+    try:
+        # como texto: lo ya escrito se copia tal cual
+        for part in pd.read_csv(tmp_csv, encoding="utf-8", dtype=str, keep_default_na=False,
+                                chunksize=chunk_rows):
+            part.reindex(columns=columns, fill_value="").to_csv(
+                wide, mode="a", header=not wide.exists(), index=False, encoding="utf-8")
+        os.replace(wide, tmp_csv)
+    finally:
+        wide.unlink(missing_ok=True)
+
+
+def stream_file(path, transforms, chunk_rows: int | None = None) -> bool:
+    """
+    Aplica las etapas al CSV bloque a bloque y lo reescribe de forma atómica.
+
+    Args:
+        path: <Carrera>_Merged.csv
+        transforms: Lista de (STAGE_NAME, fn) con fn(bloque) -> (bloque, huellas o None, cambió)
+        chunk_rows: Filas por bloque (default: CHUNK_ROWS)
+
+    Returns:
+        bool: True si el CSV se reescribió
+    """
+    path = Path(path)
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    tmp_csv = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_fps = {stage: fingerprints_tmp(path, stage) for stage, _ in transforms}
+    with_fps = set()            # etapas que devolvieron huellas en algún bloque
+    columns = None
+    written, changed = 0, False
+
+    for tmp in (tmp_csv, *tmp_fps.values()):
+        tmp.unlink(missing_ok=True)   # restos de una ejecución interrumpida
+    try:
+        for chunk in iter_csv_chunks(path, chunk_rows):
+            stage_fps = {}
+            for stage, fn in transforms:
+                chunk, fps, stage_changed = fn(chunk)
+                changed |= stage_changed
+                stage_fps[stage] = fps
+                if fps is not None:
+                    with_fps.add(stage)
+
+            if columns is None:
+                columns = list(chunk.columns)
+            elif list(chunk.columns) != columns:
+                nuevas = [c for c in chunk.columns if c not in columns]
+                if nuevas:
+                    columns += nuevas
+                    if tmp_csv.exists():
+                        _widen(tmp_csv, columns, chunk_rows)
+                chunk = chunk.reindex(columns=columns)
+            chunk.to_csv(tmp_csv, mode="a", header=not tmp_csv.exists(), index=False, encoding="utf-8")
+
+            for stage, fps in stage_fps.items():
+                if fps is None:
+                    prev = saved_fingerprints(path, stage, chunk).dropna()
+                    append_fingerprints(tmp_fps[stage], chunk.loc[prev.index], prev)
+                else:
+                    append_fingerprints(tmp_fps[stage], chunk, fps)
+            written += len(chunk)
+
+        if changed:
+            os.replace(tmp_csv, path)
+            try:
+                record_dialect(path, {"encoding": "utf-8", "sep": ","})
+            except OSError:
+                pass
+        for stage, tmp in tmp_fps.items():
+            if stage in with_fps and tmp.exists():
+                commit_fingerprints(tmp, path, stage)
+    finally:
+        for tmp in (tmp_csv, *tmp_fps.values()):
+            tmp.unlink(missing_ok=True)
+
+    msg = f"{written} filas reescritas" if changed else "sin cambios"
+    print(f"[OK] {path.name}: {msg} (streaming, bloques de {chunk_rows} filas)")
+    return changed
@@ -0,0 +1,255 @@
+"""
+Backends de traducción intercambiables para Traductor_Descripcion y Traductor_Skills.
+
+Cada backend expone:
+    translate(texto) -> str                   una petición / una frase
+    translate_batch([textos]) -> [str]        inferencia por lotes (native_batch=True)
+    remote                                    True si depende de una API externa limitada
+    batch_size                                textos por lote en translate_batch
+
+Backends:
+    "google"      deep_translator.GoogleTranslator (red, gratis, con límite de peticiones)
+    "marian_ct2"  MarianMT cuantizado con CTranslate2, local en CPU (ctranslate2 + sentencepiece)
+    "argos"       Argos Translate, local en CPU (argostranslate)
+
+Los backends locales traducen por pares de idioma: el origen de cada texto se detecta
+con language_id y, si no hay modelo para ese idioma, se usa DEFAULT_SOURCE_LANG. MarianMT
+admite como máximo 512 tokens de entrada: los textos más largos se parten (por oraciones
+y, si no basta, por palabras) en trozos de MAX_INPUT_TOKENS tokens medidos con el
+tokenizador del modelo, se traducen por separado y se vuelven a unir.
+
+Modelo MarianMT para "marian_ct2" (una vez por par, p.ej. en -> es; CT2_MODELS indica
+la carpeta de cada par origen/destino):
+    ct2-transformers-converter --model Helsinki-NLP/opus-mt-en-es --quantization int8 \\
+        --output_dir models/opus-mt-en-es-ct2 --copy_files source.spm target.spm
+"""
+
+import re
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+try:
+    from .language_id import detect_lang
+except ImportError:
+    from language_id import detect_lang
+
+# ===================== CONFIGURACIÓN =====================
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = REPO_ROOT / "models"
+CT2_MODELS = {                    # (idioma origen, idioma destino) -> carpeta del modelo convertido
+    ("en", "es"): MODELS_DIR / "opus-mt-en-es-ct2",
+    ("pt", "es"): MODELS_DIR / "opus-mt-pt-es-ct2",
+    ("fr", "es"): MODELS_DIR / "opus-mt-fr-es-ct2",
+    ("it", "es"): MODELS_DIR / "opus-mt-it-es-ct2",
+    ("de", "es"): MODELS_DIR / "opus-mt-de-es-ct2",
+}
+CT2_COMPUTE_TYPE = "int8"         # modelo cuantizado: ~4x menos memoria y más rápido en CPU
+CT2_INTRA_THREADS = 0             # 0 = todos los núcleos
+CT2_BEAM_SIZE = 2
+LOCAL_BATCH_SIZE = 32             # frases por llamada a translate_batch
+MAX_INPUT_TOKENS = 400            # tokens por trozo en los backends locales (MarianMT: 512 como máximo)
+DEFAULT_SOURCE_LANG = "en"        # idioma supuesto si no se detecta o no hay modelo
+# ==========================================================
+
+# ---------------- Google (deep_translator) ----------------
+class GoogleBackend:
+    name = "google"
+    remote = True
+    native_batch = False
+    batch_size = 1
+
+    def __init__(self, src: str, tgt: str):
+        from deep_translator import GoogleTranslator
+        self._cls, self.src, self.tgt = GoogleTranslator, src, tgt
+        self._local = threading.local()
+
+    def _gt(self):
+        gt = getattr(self._local, "gt", None)
+        if gt is None:
+            gt = self._local.gt = self._cls(source=self.src, target=self.tgt)
+        return gt
+
+    def translate(self, text: str) -> str:
+        return self._gt().translate(text)
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        return [self.translate(t) for t in texts]
+
+# ---------------- Backends locales (CPU) ----------------
+_SENTENCE_RE = re.compile(r"(?<=[.!?;:。])\s+")
+
+class _LocalBackend(ABC):
+    """Agrupa cada lote por idioma de origen y lo traduce con el modelo de ese par."""
+    remote = False
+    native_batch = True
+    batch_size = LOCAL_BATCH_SIZE
+
+    def __init__(self, src: str, tgt: str):
+        self.src, self.tgt = src, tgt
+        self._lock = threading.Lock()   # un lote a la vez: el paralelismo es interno (núcleos)
+
+    @abstractmethod
+    def _available(self) -> list[str]:
+        """Idiomas de origen con modelo instalado hacia self.tgt (al menos uno)."""
+
+    @abstractmethod
+    def _translate_pair(self, src: str, texts: list[str]) -> list[str]:
+        """Traduce textos de a lo sumo MAX_INPUT_TOKENS tokens con el modelo src -> tgt."""
+
+    @abstractmethod
+    def _count_tokens(self, src: str, text: str) -> int:
+        """Tokens de entrada del texto según el tokenizador del modelo src -> tgt."""
+
+    def _source_of(self, text: str, available) -> str:
+        lang = self.src if self.src != "auto" else detect_lang(text)
+        if lang in available:
+            return lang
+        return DEFAULT_SOURCE_LANG if DEFAULT_SOURCE_LANG in available else available[0]
+
+    def _pieces(self, src: str, text: str) -> list[str]:
+        """Trozos del texto de hasta MAX_INPUT_TOKENS tokens: por oraciones, por palabras y, si no basta, por caracteres."""
+        if self._count_tokens(src, text) <= MAX_INPUT_TOKENS:
+            return [text]
+        units = []
+        for sent in _SENTENCE_RE.split(text):
+            if self._count_tokens(src, sent) <= MAX_INPUT_TOKENS:
+                units.append(sent)
+            else:
+                for word in sent.split():
+                    n = self._count_tokens(src, word)
+                    step = max(1, len(word) * MAX_INPUT_TOKENS // (2 * n)) if n > MAX_INPUT_TOKENS else len(word)
+                    units.extend(word[i:i + step] for i in range(0, len(word), step))   # corte duro
+        pieces, cur, cur_tokens = [], [], 0
+        for unit in units:
+            n = self._count_tokens(src, unit)
+            if cur and cur_tokens + n > MAX_INPUT_TOKENS:
+                pieces.append(" ".join(cur))
+                cur, cur_tokens = [], 0
+            cur.append(unit)
+            cur_tokens += n
+        if cur:
+            pieces.append(" ".join(cur))
+        return pieces
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        groups: dict[str, list[int]] = {}
+        available = self._available()
+        for i, t in enumerate(texts):
+            groups.setdefault(self._source_of(t, available), []).append(i)
+        out = [""] * len(texts)
+        with self._lock:
+            for src, idx in groups.items():
+                owners, pieces = [], []
+                for i in idx:
+                    for piece in self._pieces(src, texts[i]):
+                        owners.append(i)
+                        pieces.append(piece)
+                parts: dict[int, list[str]] = {}
+                for i, res in zip(owners, self._translate_pair(src, pieces)):
+                    parts.setdefault(i, []).append(res)
+                for i, res in parts.items():
+                    out[i] = " ".join(res)
+        return out
+
+    def translate(self, text: str) -> str:
+        return self.translate_batch([text])[0]
+
+class CTranslate2Backend(_LocalBackend):
+    name = "marian_ct2"
+
+    def __init__(self, src: str, tgt: str):
+        super().__init__(src, tgt)
+        try:
+            import ctranslate2
+            import sentencepiece
+        except ImportError as e:
+            raise ImportError("El backend 'marian_ct2' requiere ctranslate2 y sentencepiece") from e
+        self._ct2, self._spm = ctranslate2, sentencepiece
+        self._models = {}
+        if not self._available():
+            raise FileNotFoundError(f"No hay modelos CTranslate2 hacia '{tgt}' en {MODELS_DIR} "
+                                    f"(ver CT2_MODELS y el docstring de translation_backends.py)")
+
+    def _available(self):
+        return [s for (s, t), p in CT2_MODELS.items() if t == self.tgt and Path(p).exists()]
+
+    def _model(self, src: str):
+        if src not in self._models:
+            path = Path(CT2_MODELS[(src, self.tgt)])
+            translator = self._ct2.Translator(str(path), device="cpu", compute_type=CT2_COMPUTE_TYPE,
+                                              intra_threads=CT2_INTRA_THREADS)
+            sp_src = self._spm.SentencePieceProcessor(model_file=str(path / "source.spm"))
+            sp_tgt = self._spm.SentencePieceProcessor(model_file=str(path / "target.spm"))
+            self._models[src] = (translator, sp_src, sp_tgt)
+        return self._models[src]
+
+    def _count_tokens(self, src: str, text: str) -> int:
+        return len(self._model(src)[1].encode(text)) + 1    # + '</s>'
+
+    def _translate_pair(self, src: str, texts: list[str]) -> list[str]:
+        translator, sp_src, sp_tgt = self._model(src)
+        tokens = [sp_src.encode(t, out_type=str) + ["</s>"] for t in texts]
+        results = translator.translate_batch(tokens, max_batch_size=LOCAL_BATCH_SIZE, beam_size=CT2_BEAM_SIZE)
+        return [sp_tgt.decode([tok for tok in r.hypotheses[0] if tok != "</s>"]) for r in results]
+
+class ArgosBackend(_LocalBackend):
+    name = "argos"
+
+    def __init__(self, src: str, tgt: str):
+        super().__init__(src, tgt)
+        try:
+            import argostranslate.translate as argos
+        except ImportError as e:
+            raise ImportError("El backend 'argos' requiere argostranslate") from e
+        self._argos = argos
+        langs = {l.code: l for l in argos.get_installed_languages()}
+        if tgt not in langs:
+            raise FileNotFoundError(f"Argos no tiene instalado el idioma destino '{tgt}'")
+        self._pairs = {code: l.get_translation(langs[tgt]) for code, l in langs.items()
+                       if code != tgt and l.get_translation(langs[tgt]) is not None}
+        if not self._pairs:
+            raise FileNotFoundError(f"Argos no tiene instalado ningún paquete de traducción hacia '{tgt}'")
+        self._tokenizers = {}
+
+    def _available(self):
+        return list(self._pairs)
+
+    def _tokenizer(self, src: str):
+        """SentencePiece del paquete Argos del par (None si no se encuentra: se cuentan palabras)."""
+        if src not in self._tokenizers:
+            sp = None
+            pkg = getattr(self._pairs[src], "pkg", None)
+            model = Path(getattr(pkg, "package_path", "")) / "sentencepiece.model"
+            if pkg is not None and model.exists():
+                import sentencepiece
+                sp = sentencepiece.SentencePieceProcessor(model_file=str(model))
+            self._tokenizers[src] = sp
+        return self._tokenizers[src]
+
+    def _count_tokens(self, src: str, text: str) -> int:
+        sp = self._tokenizer(src)
+        # sin tokenizador: ~2 subpalabras por palabra, una cota holgada para MarianMT
+        return len(sp.encode(text)) + 1 if sp is not None else 2 * len(text.split()) + 1
+
+    def _translate_pair(self, src: str, texts: list[str]) -> list[str]:
+        return [self._pairs[src].translate(t) for t in texts]
+
+# ---------------- Registro ----------------
+BACKENDS = {
+    "google": GoogleBackend,
+    "marian_ct2": CTranslate2Backend,
+    "argos": ArgosBackend,
+}
+_INSTANCES: dict = {}
+_INSTANCES_LOCK = threading.Lock()
+
+def get_backend(name: str = "google", src: str = "auto", tgt: str = "es"):
+    """Instancia compartida del backend (los modelos locales se cargan una sola vez)."""
+    key = (name, src, tgt)
+    with _INSTANCES_LOCK:
+        if key not in _INSTANCES:
+            if name not in BACKENDS:
+                raise ValueError(f"Backend de traducción desconocido: {name!r} (opciones: {sorted(BACKENDS)})")
+            _INSTANCES[key] = BACKENDS[name](src, tgt)
+        return _INSTANCES[key]
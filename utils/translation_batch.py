@@ -0,0 +1,100 @@
+"""
+Traducción empaquetada de ítems cortos (skills, oraciones).
+
+En vez de una petición por skill, varios ítems se unen con DELIMITER en un solo texto
+de hasta BATCH_CHAR_LIMIT caracteres. La respuesta se vuelve a partir por el
+delimitador y, si el número de partes no coincide con el de ítems (el backend fusionó
+o partió líneas), ese lote se traduce ítem a ítem con la función de respaldo.
+
+Los backends con inferencia por lotes propia (native_batch, ver translation_backends.py)
+no necesitan el delimitador: reciben la lista tal cual con translate_batch_native.
+"""
+
+import time
+
+# ===================== CONFIGURACIÓN =====================
+DELIMITER = "\n"             # Google conserva los saltos de línea de la entrada
+BATCH_CHAR_LIMIT = 4500      # deep_translator/Google rechaza textos de 5000+ caracteres
+BATCH_MAX_ITEMS = 100        # lotes más grandes fallan el alineado con más frecuencia
+RETRIES_PER_BATCH = 3
+RETRY_SLEEP_BASE = 1.5       # 1.5s, 3s, 4.5s ...
+# ==========================================================
+
+def pack_batches(items, char_limit: int | None = None, max_items: int | None = None) -> list[list[str]]:
+    """
+    Agrupa los ítems en lotes cuyo texto unido no supera char_limit.
+    Los ítems que contienen el delimitador o que solos superan el límite van en un lote propio.
+    """
+    char_limit = char_limit or BATCH_CHAR_LIMIT
+    max_items = max_items or BATCH_MAX_ITEMS
+    batches, cur, cur_len = [], [], 0
+    for it in items:
+        if DELIMITER in it or len(it) >= char_limit:
+            batches.append([it])
+            continue
+        add = len(it) + (len(DELIMITER) if cur else 0)
+        if cur and (cur_len + add > char_limit or len(cur) >= max_items):
+            batches.append(cur)
+            cur, cur_len, add = [], 0, len(it)
+        cur.append(it)
+        cur_len += add
+    if cur:
+        batches.append(cur)
+    return batches
+
+def _split_response(out, n: int) -> list[str] | None:
+    """Parte la respuesta en n ítems; None si no se alinea con la entrada."""
+    if not isinstance(out, str):
+        return None
+    parts = [p.strip() for p in out.strip().split(DELIMITER)]
+    if len(parts) != n or any(not p for p in parts):
+        return None
+    return parts
+
+def translate_batch(batch: list[str], translate_text, translate_item,
+                    retry_sleep: bool = True) -> tuple[list[tuple[str, str]], bool]:
+    """
+    Traduce un lote con una sola petición.
+
+    Args:
+        batch: Ítems del lote (de pack_batches)
+        translate_text: fn(texto) -> traducción (una petición al backend)
+        translate_item: Respaldo fn(ítem) -> traducción, usado si el lote no se alinea
+        retry_sleep: False si translate_text ya espera tras un error (planificador AIMD)
+
+    Returns:
+        tuple: ([(ítem, traducción)], True si salió del lote empaquetado y False si del respaldo)
+    """
+    if len(batch) == 1:
+        return [(batch[0], translate_item(batch[0]))], False
+
+    delay = RETRY_SLEEP_BASE
+    for attempt in range(RETRIES_PER_BATCH):
+        try:
+            parts = _split_response(translate_text(DELIMITER.join(batch)), len(batch))
+            if parts is not None:
+                return list(zip(batch, parts)), True
+            break   # respuesta correcta pero desalineada: reintentar no ayuda
+        except Exception:
+            if retry_sleep and attempt < RETRIES_PER_BATCH - 1:
+                time.sleep(delay)
+                delay += RETRY_SLEEP_BASE
+    return [(it, translate_item(it)) for it in batch], False
+
+def split_batches(items, size: int) -> list[list[str]]:
+    """Lotes de 'size' ítems para backends con translate_batch nativo."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def translate_batch_native(batch: list[str], translate_many, translate_item) -> tuple[list[tuple[str, str]], bool]:
+    """
+    Traduce un lote con la inferencia por lotes del backend (una lista -> una lista).
+    Si falla o devuelve otro número de resultados, se usa el respaldo ítem a ítem.
+    """
+    try:
+        outs = translate_many(batch)
+        if len(outs) == len(batch) and all(isinstance(o, str) and o.strip() for o in outs):
+            return [(it, o.strip()) for it, o in zip(batch, outs)], True
+    except Exception:
+        pass
+    return [(it, translate_item(it)) for it in batch], False
@@ -0,0 +1,205 @@
+"""
+Caché persistente de traducciones compartida por Traductor_Descripcion y Traductor_Skills.
+
+Guarda en SQLite (data/cache/translations.sqlite3) cada traducción correcta con clave
+(hash del texto normalizado, idioma origen, idioma destino, backend), de modo que una
+nueva ejecución o el otro script no vuelven a pagar por un texto ya traducido.
+
+- Concurrencia: modo WAL + busy_timeout y una conexión por hilo y por proceso.
+- Tamaño acotado: al superar MAX_ENTRIES se borran las entradas usadas hace más tiempo (LRU).
+- Estadísticas: aciertos / fallos / escrituras / desalojos de la sesión con stats().
+- Los fallos de traducción no se guardan: se reintentan en la siguiente ejecución.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+
+# ===================== CONFIGURACIÓN =====================
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = REPO_ROOT / "data" / "cache" / "translations.sqlite3"
+ENABLED = True
+MAX_ENTRIES = 500_000        # al superarlo se desaloja EVICT_FRACTION de las más antiguas
+EVICT_FRACTION = 0.1
+EVICT_CHECK_EVERY = 1_000    # escrituras entre comprobaciones de tamaño (por proceso)
+BUSY_TIMEOUT_MS = 30_000     # espera máxima por el bloqueo de otro proceso
+SQL_BATCH = 500              # parámetros por consulta en get_many
+# ==========================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    text_hash   TEXT NOT NULL,
+    src         TEXT NOT NULL,
+    tgt         TEXT NOT NULL,
+    backend     TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    last_used   INTEGER NOT NULL,
+    PRIMARY KEY (text_hash, src, tgt, backend)
+);
+CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used);
+"""
+
+_WS_RE = re.compile(r"\s+")
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+_writes_since_check = 0
+
+# ---------------- Claves ----------------
+def normalize_text(text: str) -> str:
+    """Forma canónica para la clave: NFC, espacios colapsados y sin bordes."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", str(text))).strip()
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+# ---------------- Conexión ----------------
+def _connect() -> sqlite3.Connection | None:
+    """Conexión del hilo actual (se reabre tras un fork o si cambia CACHE_PATH)."""
+    if not ENABLED:
+        return None
+    path = Path(CACHE_PATH)
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.pid == os.getpid() and _local.path == path:
+        return conn
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(_SCHEMA)
+    _local.conn, _local.pid, _local.path = conn, os.getpid(), path
+    return conn
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+# ---------------- Lectura ----------------
+def get_many(texts, src: str = "auto", tgt: str = "es", backend: str = "google") -> dict:
+    """
+    Traducciones guardadas para los textos dados: {texto: traducción} (solo aciertos).
+    Los aciertos se marcan como usados ahora (orden LRU).
+    """
+    texts = [t for t in dict.fromkeys(texts) if isinstance(t, str) and t.strip()]
+    conn = _connect()
+    if conn is None or not texts:
+        return {}
+    by_hash = {}
+    for t in texts:
+        by_hash.setdefault(text_hash(t), []).append(t)
+
+    found = {}
+    hashes = list(by_hash)
+    now = time.time_ns()
+    try:
+        for i in range(0, len(hashes), SQL_BATCH):
+            batch = hashes[i:i + SQL_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT text_hash, translation FROM translations "
+                f"WHERE src = ? AND tgt = ? AND backend = ? AND text_hash IN ({marks})",
+                (src, tgt, backend, *batch),
+            ).fetchall()
+            for h, translation in rows:
+                for t in by_hash[h]:
+                    found[t] = translation
+            if rows:
+                hit = [h for h, _ in rows]
+                conn.execute(
+                    f"UPDATE translations SET last_used = ? "
+                    f"WHERE src = ? AND tgt = ? AND backend = ? AND text_hash IN ({','.join('?' * len(hit))})",
+                    (now, src, tgt, backend, *hit),
+                )
+    except sqlite3.Error as e:
+        print(f"[WARN] Caché de traducciones no disponible: {e}")
+        return found
+    _count("hits", len(found))
+    _count("misses", len(texts) - len(found))
+    return found
+
+def get(text: str, src: str = "auto", tgt: str = "es", backend: str = "google") -> str | None:
+    """Traducción guardada para un texto o None."""
+    return get_many([text], src, tgt, backend).get(text)
+
+# ---------------- Escritura ----------------
+def put_many(pairs, src: str = "auto", tgt: str = "es", backend: str = "google") -> None:
+    """Guarda (texto, traducción) correctos; reemplaza la traducción previa si existía."""
+    global _writes_since_check
+    conn = _connect()
+    if conn is None:
+        return
+    now = time.time_ns()
+    rows = [(text_hash(t), src, tgt, backend, out, now)
+            for t, out in pairs if isinstance(t, str) and t.strip() and isinstance(out, str)]
+    if not rows:
+        return
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"[WARN] No se pudo guardar en la caché de traducciones: {e}")
+        return
+    _count("writes", len(rows))
+
+    with _stats_lock:
+        _writes_since_check += len(rows)
+        check = _writes_since_check >= EVICT_CHECK_EVERY
+        if check:
+            _writes_since_check = 0
+    if check:
+        evict()
+
+def put(text: str, translation: str, src: str = "auto", tgt: str = "es", backend: str = "google") -> None:
+    put_many([(text, translation)], src, tgt, backend)
+
+def evict(max_entries: int | None = None) -> int:
+    """Si la caché supera max_entries, borra las entradas menos usadas recientemente."""
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    conn = _connect()
+    if conn is None:
+        return 0
+    try:
+        n = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if n <= max_entries:
+            return 0
+        target = int(max_entries * (1 - EVICT_FRACTION))
+        cur = conn.execute(
+            "DELETE FROM translations WHERE rowid IN "
+            "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+            (n - target,),
+        )
+    except sqlite3.Error as e:
+        print(f"[WARN] No se pudo podar la caché de traducciones: {e}")
+        return 0
+    _count("evictions", cur.rowcount)
+    return cur.rowcount
+
+# ---------------- Estadísticas ----------------
+def stats() -> dict:
+    """Contadores de la sesión (este proceso) y número de entradas en disco."""
+    with _stats_lock:
+        out = dict(_stats)
+    lookups = out["hits"] + out["misses"]
+    out["hit_rate"] = round(out["hits"] / lookups, 4) if lookups else 0.0
+    conn = _connect()
+    if conn is not None:
+        try:
+            out["entries"] = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        except sqlite3.Error:
+            pass
+    return out
+
+def print_stats(label: str = "Caché de traducciones") -> None:
+    s = stats()
+    print(f"[INFO] {label}: {s['hits']} aciertos / {s['misses']} fallos "
+          f"({s['hit_rate']:.1%}), {s['writes']} escritas, {s['evictions']} desalojadas, "
+          f"{s.get('entries', '?')} en disco")
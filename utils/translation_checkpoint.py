@@ -0,0 +1,140 @@
+"""
+Puntos de control de Traductor_Descripcion mientras traduce un archivo.
+
+Las traducciones terminadas se añaden cada EVERY_ITEMS textos o EVERY_SECONDS segundos a
+un archivo lateral '.checkpoints/<archivo>.<etapa>.jsonl' (una línea JSON por texto, con
+fsync), de modo que si el proceso se corta a mitad de una carrera lo ya traducido no se
+pierde: la siguiente ejecución lo restaura y solo traduce el resto. El archivo se borra
+cuando el CSV queda escrito.
+
+- Clave: hash del texto limpio (el mismo de translation_cache.py).
+- La primera línea guarda la configuración (versión de etapa, backend, idiomas); si no
+  coincide con la actual el punto de control se descarta.
+- Una línea cortada por una caída se ignora y el archivo se reescribe de forma atómica
+  (temporal + os.replace) sin ella.
+- Los fallos de traducción no se guardan: se reintentan igual que antes.
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+import pandas as pd
+
+try:
+    from .translation_cache import text_hash
+except ImportError:
+    from translation_cache import text_hash
+
+# ===================== CONFIGURACIÓN =====================
+SIDECAR_DIRNAME = ".checkpoints"
+EVERY_ITEMS = 200            # textos traducidos entre escrituras
+EVERY_SECONDS = 60.0         # o segundos desde la última escritura, lo que llegue antes
+# ==========================================================
+
+class TranslationCheckpoint:
+    """Traducciones terminadas de un archivo, persistidas por tandas."""
+
+    def __init__(self, path, stage: str, meta: dict):
+        path = Path(path)
+        self.path = path.parent / SIDECAR_DIRNAME / f"{path.name}.{stage}.jsonl"
+        self.meta = dict(meta)
+        self._done = None            # {hash: traducción} ya en disco
+        self._buffer = []            # [(hash, traducción)] pendientes de escribir
+        self._last_flush = time.monotonic()
+
+    # ---------------- Lectura ----------------
+    def _load(self) -> dict:
+        if self._done is not None:
+            return self._done
+        self._done = {}
+        if not self.path.exists():
+            return self._done
+        damaged = False
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        try:
+            header = json.loads(lines[0])
+        except (json.JSONDecodeError, IndexError):
+            header = None
+        if not isinstance(header, dict) or header.get("meta") != self.meta:
+            print(f"[INFO] Punto de control de otra configuración descartado: {self.path.name}")
+            self.path.unlink(missing_ok=True)
+            return self._done
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                self._done[rec["h"]] = rec["t"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                damaged = True       # línea a medio escribir al caerse el proceso
+        if damaged:
+            self._rewrite()
+        return self._done
+
+    def restore(self, texts: pd.Series) -> pd.Series:
+        """Traducción guardada de cada texto (NaN si no está en el punto de control)."""
+        done = self._load()
+        if not done:
+            return pd.Series(pd.NA, index=texts.index, dtype=object)
+        return texts.map(lambda t: done.get(text_hash(t), pd.NA)).astype(object)
+
+    # ---------------- Escritura ----------------
+    def add(self, text: str, translation: str) -> None:
+        """Anota una traducción terminada; escribe la tanda si toca (EVERY_ITEMS / EVERY_SECONDS)."""
+        self._buffer.append((text_hash(text), translation))
+        if len(self._buffer) >= EVERY_ITEMS or time.monotonic() - self._last_flush >= EVERY_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Añade la tanda pendiente al archivo lateral y fuerza su escritura a disco."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        done = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists()
+        with open(self.path, "a", encoding="utf-8") as f:
+            if new_file:
+                f.write(json.dumps({"meta": self.meta}) + "\n")
+            for h, t in self._buffer:
+                f.write(json.dumps({"h": h, "t": t}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        done.update(self._buffer)
+        self._buffer = []
+
+    def _rewrite(self) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"meta": self.meta}) + "\n")
+            for h, t in self._done.items():
+                f.write(json.dumps({"h": h, "t": t}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """El CSV ya contiene las traducciones: el punto de control sobra."""
+        self._buffer = []
+        self._done = {}
+        self.path.unlink(missing_ok=True)
+
+
+_OPEN: dict = {}
+
+def get_checkpoint(path, stage: str, meta: dict) -> TranslationCheckpoint:
+    """Punto de control compartido del archivo (en streaming se pide una vez por bloque)."""
+    key = (str(Path(path).resolve()), stage)
+    cp = _OPEN.get(key)
+    if cp is None or cp.meta != meta:
+        cp = _OPEN[key] = TranslationCheckpoint(path, stage, meta)
+    return cp
+
+def clear_checkpoint(path, stage: str) -> None:
+    cp = _OPEN.pop((str(Path(path).resolve()), stage), None)
+    if cp is not None:
+        cp.clear()
+    else:
+        (Path(path).parent / SIDECAR_DIRNAME / f"{Path(path).name}.{stage}.jsonl").unlink(missing_ok=True)
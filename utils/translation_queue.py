@@ -0,0 +1,132 @@
+"""
+Cola global de traducción entre carreras para Traductor_Descripcion.
+
+Antes de procesar los archivos, plan_global_queue reúne los textos pendientes de todos
+ellos, los deduplica y traduce cada texto único una sola vez (una descripción publicada
+en varias carreras se traduce una vez y no una por archivo). Después, cada transform_df
+recibe la cola y toma de ella la salida de esas filas sin volver a llamar al backend.
+
+- Punto de control: la cola tiene el suyo (ver translation_checkpoint.py), en
+  '<carpeta de carreras>/.checkpoints/cola_global.<etapa>.jsonl'; si el proceso se corta
+  durante la planificación, lo traducido se restaura en la siguiente ejecución.
+- finish() vacía la cola y borra su punto de control cuando todos los CSV están escritos.
+"""
+
+from pathlib import Path
+import pandas as pd
+
+try:
+    from .translation_checkpoint import get_checkpoint, clear_checkpoint
+except ImportError:
+    from translation_checkpoint import get_checkpoint, clear_checkpoint
+
+# ===================== CONFIGURACIÓN =====================
+QUEUE_NAME = "cola_global"   # nombre base del punto de control de la cola
+# ==========================================================
+
+class GlobalQueue:
+    """Salida ya traducida (texto limpio -> (traducción, idioma o None)) de una ejecución."""
+
+    def __init__(self, base_dir, stage: str, meta: dict | None = None):
+        self.path = Path(base_dir) / QUEUE_NAME
+        self.stage = stage
+        self.meta = meta             # None: sin punto de control
+        self.planned: dict = {}
+
+    def checkpoint(self):
+        return get_checkpoint(self.path, self.stage, self.meta) if self.meta is not None else None
+
+    def plan(self, pending: dict, translate, detect=None) -> None:
+        """
+        Traduce una vez los textos de la cola.
+
+        Args:
+            pending: {texto: número de archivos en los que está pendiente}
+            translate: fn(textos, punto de control) -> (salida, idiomas o None)
+            detect: fn(textos) -> idiomas, para los restaurados del punto de control (None: sin idioma)
+        """
+        if not pending:
+            return
+        queue = pd.Series(list(pending), dtype=object)
+        cp = self.checkpoint()
+        saved = cp.restore(queue) if cp is not None else pd.Series(pd.NA, index=queue.index, dtype=object)
+        hit = saved.notna()
+        if hit.any():
+            print(f"[INFO] Cola global: {int(hit.sum())} textos restaurados del punto de control")
+        out, langs = translate(queue[~hit], cp)
+
+        outs = saved.astype(object).copy()
+        outs[~hit] = out
+        lang_all = pd.Series(None, index=queue.index, dtype=object)
+        if detect is not None:
+            if hit.any():
+                lang_all[hit] = detect(queue[hit])
+            if langs is not None:
+                lang_all[~hit] = langs
+        self.planned.update(zip(queue, zip(outs, lang_all)))
+
+    def apply(self, texts: pd.Series, translate, with_langs: bool):
+        """
+        Salida de los textos: la de la cola si ya están en ella y translate(resto) para los demás.
+
+        Returns:
+            tuple: (salida, idiomas o None), alineados con texts
+        """
+        planned = texts.isin(self.planned.keys()) if self.planned else pd.Series(False, index=texts.index)
+        if not planned.any():
+            return translate(texts)
+        rest = texts[~planned]
+        out, langs = translate(rest) if not rest.empty else (rest, None)
+
+        hits = [self.planned[t] for t in texts[planned]]
+        full = texts.astype(object).copy()
+        full[planned] = [o for o, _ in hits]
+        full[~planned] = out
+        full_langs = None
+        if with_langs:
+            full_langs = pd.Series(None, index=texts.index, dtype=object)
+            full_langs[planned] = [lang for _, lang in hits]
+            if langs is not None:
+                full_langs[~planned] = langs
+        return full, full_langs
+
+    def finish(self) -> None:
+        """Con todos los archivos escritos: vacía la cola y borra su punto de control."""
+        self.planned.clear()
+        clear_checkpoint(self.path, self.stage)
+
+
+def plan_global_queue(target_files, pending_texts, translate, stage: str, meta: dict | None = None,
+                      detect=None) -> GlobalQueue | None:
+    """
+    Pasada de planificación: reúne los pendientes de todos los archivos y los traduce una vez.
+
+    Args:
+        target_files: '<carpeta de carreras>/<Carrera>/<Carrera>_Merged.csv' a procesar
+        pending_texts: fn(archivo) -> Series de textos pendientes (vacía si no hay)
+        translate, detect: ver GlobalQueue.plan
+        meta: configuración del punto de control (None: sin punto de control)
+
+    Returns:
+        GlobalQueue para pasar a transform_df, o None si no hay archivos
+    """
+    target_files = [Path(p) for p in target_files]
+    if not target_files:
+        return None
+    queue = GlobalQueue(target_files[0].parent.parent, stage, meta)
+    pending, n_rows, n_files = {}, 0, 0
+    for target_file in target_files:
+        texts = pending_texts(target_file)
+        if texts.empty:
+            continue
+        n_rows += len(texts)
+        n_files += 1
+        for t in texts.unique():
+            pending[t] = pending.get(t, 0) + 1
+
+    if pending:
+        n_shared = sum(1 for n in pending.values() if n > 1)
+        print(f"[INFO] Cola global: {n_rows} filas pendientes en {n_files} archivos -> "
+              f"{len(pending)} textos únicos ({n_shared} repetidos entre archivos)")
+        queue.plan(pending, translate, detect)
+    return queue
@@ -0,0 +1,74 @@
+"""
+Acceso al backend de traducción compartido por Traductor_Descripcion y Traductor_Skills.
+
+Cada etapa crea un StageRuntime con su propio módulo como configuración: BACKEND_NAME,
+SOURCE_LANG, TARGET_LANG, ADAPTIVE_CONCURRENCY y PERSISTENT_CACHE se leen en cada
+llamada, así que un cambio hecho en tiempo de ejecución (p.ej. en las pruebas) vale
+también aquí.
+
+- backend(): instancia del backend (ver translation_backends.py)
+- call(): una petición; los backends remotos pasan por el planificador AIMD
+  (ver translation_scheduler.py)
+- map() / batch_jobs(): reparto de ítems o lotes (ver translation_batch.py)
+- cache_key(): parte de la clave de la caché persistente (ver translation_cache.py)
+"""
+
+try:
+    from . import translation_cache
+    from .translation_batch import pack_batches, translate_batch, split_batches, translate_batch_native
+    from .translation_scheduler import get_scheduler, pool_map
+    from .translation_backends import get_backend
+except ImportError:
+    import translation_cache
+    from translation_batch import pack_batches, translate_batch, split_batches, translate_batch_native
+    from translation_scheduler import get_scheduler, pool_map
+    from translation_backends import get_backend
+
+
+class StageRuntime:
+    """Backend, planificador y clave de caché de una etapa de traducción."""
+
+    def __init__(self, config):
+        self.config = config         # módulo de la etapa (se lee en cada llamada)
+
+    def backend(self):
+        """Backend configurado en BACKEND_NAME (ver translation_backends.py)."""
+        c = self.config
+        return get_backend(c.BACKEND_NAME, c.SOURCE_LANG, c.TARGET_LANG)
+
+    def _adaptive(self, backend) -> bool:
+        return self.config.ADAPTIVE_CONCURRENCY and backend.remote
+
+    def call(self, text: str) -> str:
+        """Una petición al backend; si es remoto y ADAPTIVE_CONCURRENCY, pasa por el planificador AIMD."""
+        backend = self.backend()
+        if self._adaptive(backend):
+            return get_scheduler(self.config.BACKEND_NAME).run(backend.translate, text)
+        return backend.translate(text)
+
+    def map(self, fn, items, max_workers: int):
+        """pool_map: backends remotos con el planificador AIMD; los locales, un lote a la vez."""
+        backend = self.backend()
+        return pool_map(fn, items, max_workers if backend.remote else 1, self._adaptive(backend),
+                        self.config.BACKEND_NAME)
+
+    def batch_jobs(self, items: list[str], fallback):
+        """(lotes, fn(lote)): lotes con delimitador o translate_batch nativo según el backend."""
+        backend = self.backend()
+        if backend.native_batch:
+            return (split_batches(items, backend.batch_size),
+                    lambda batch: translate_batch_native(batch, backend.translate_batch, fallback))
+        return (pack_batches(items),
+                lambda batch: translate_batch(batch, self.call, fallback,
+                                              retry_sleep=not self.config.ADAPTIVE_CONCURRENCY))
+
+    def cache_key(self) -> dict:
+        c = self.config
+        return {"src": c.SOURCE_LANG, "tgt": c.TARGET_LANG, "backend": c.BACKEND_NAME}
+
+    def print_stats(self) -> None:
+        """Estadísticas de la caché persistente y del planificador al final de la ejecución."""
+        if self.config.PERSISTENT_CACHE:
+            translation_cache.print_stats()
+        if self.config.ADAPTIVE_CONCURRENCY and self.backend().remote:
+            get_scheduler(self.config.BACKEND_NAME).print_metrics()
@@ -0,0 +1,151 @@
+"""
+Planificador compartido de llamadas de traducción con concurrencia adaptativa (AIMD).
+
+Un único planificador por backend (get_scheduler) atiende a Traductor_Descripcion y
+Traductor_Skills durante toda la ejecución, carrera tras carrera:
+
+- Las llamadas a la API pasan por run(): espera un hueco libre y la llamada cuenta
+  como éxito o error.
+- Cada éxito sube el límite de llamadas simultáneas en ADDITIVE_INCREASE / límite,
+  es decir, unas +1 por ventana completa.
+- Cada error lo multiplica por MULTIPLICATIVE_DECREASE y pausa a todos los hilos
+  durante un enfriamiento que se duplica con errores seguidos. Así los reintentos de
+  un hilo ya no ignoran que los demás también están siendo limitados. Los errores de
+  llamadas que empezaron antes de la última reducción no vuelven a reducir: una ráfaga
+  de errores cuenta como un solo evento de congestión.
+- metrics() / print_metrics() muestran el rendimiento (llamadas/s), la tasa de error
+  y el límite actual.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ===================== CONFIGURACIÓN =====================
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16          # hilos del pool compartido (techo del límite adaptativo)
+START_CONCURRENCY = 2
+ADDITIVE_INCREASE = 1.0       # +1 de límite por ventana de llamadas exitosas
+MULTIPLICATIVE_DECREASE = 0.5
+COOLDOWN_BASE = 1.0           # segundos de pausa global tras un error
+COOLDOWN_MAX = 60.0
+# ==========================================================
+
+class TranslationScheduler:
+    """Limitador AIMD + pool de hilos compartido para las llamadas de un backend."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._cond = threading.Condition()
+        self._limit = float(START_CONCURRENCY)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._cooldown = COOLDOWN_BASE
+        self._epoch = 0               # sube en cada reducción del límite
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY,
+                                            thread_name_prefix=f"traduccion-{name}")
+        self._m = {"ok": 0, "errors": 0, "latency": 0.0, "peak_limit": self._limit, "t0": None}
+
+    # ---------------- Ejecución ----------------
+    def map(self, fn, items):
+        """Como ThreadPoolExecutor.map (resultados en orden) sobre el pool compartido."""
+        return self._executor.map(fn, items)
+
+    def run(self, fn, *args, **kwargs):
+        """Ejecuta una llamada al backend respetando el límite y la pausa global."""
+        epoch = self._acquire()
+        t = time.monotonic()
+        try:
+            out = fn(*args, **kwargs)
+        except Exception:
+            self._release(ok=False, latency=time.monotonic() - t, epoch=epoch)
+            raise
+        self._release(ok=True, latency=time.monotonic() - t, epoch=epoch)
+        return out
+
+    def _acquire(self) -> int:
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self._limit):
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self._in_flight += 1
+            if self._m["t0"] is None:
+                self._m["t0"] = time.monotonic()
+            return self._epoch
+
+    def _release(self, ok: bool, latency: float, epoch: int) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._m["latency"] += latency
+            if ok:
+                self._m["ok"] += 1
+                self._limit = min(MAX_CONCURRENCY, self._limit + ADDITIVE_INCREASE / self._limit)
+                self._m["peak_limit"] = max(self._m["peak_limit"], self._limit)
+                self._cooldown = COOLDOWN_BASE
+            else:
+                self._m["errors"] += 1
+                if epoch != self._epoch:
+                    self._cond.notify_all()
+                    return   # ya se redujo por esta misma ráfaga
+                self._epoch += 1
+                self._limit = max(MIN_CONCURRENCY, self._limit * MULTIPLICATIVE_DECREASE)
+                self._paused_until = max(self._paused_until, time.monotonic() + self._cooldown)
+                self._cooldown = min(COOLDOWN_MAX, self._cooldown * 2)
+            self._cond.notify_all()
+
+    # ---------------- Métricas ----------------
+    def metrics(self) -> dict:
+        with self._cond:
+            m = dict(self._m)
+            limit, in_flight = self._limit, self._in_flight
+        calls = m["ok"] + m["errors"]
+        elapsed = time.monotonic() - m["t0"] if m["t0"] is not None else 0.0
+        return {
+            "backend": self.name,
+            "calls": calls,
+            "ok": m["ok"],
+            "errors": m["errors"],
+            "error_rate": round(m["errors"] / calls, 4) if calls else 0.0,
+            "calls_per_s": round(m["ok"] / elapsed, 2) if elapsed else 0.0,
+            "avg_latency_s": round(m["latency"] / calls, 3) if calls else 0.0,
+            "limit": round(limit, 2),
+            "peak_limit": round(m["peak_limit"], 2),
+            "in_flight": in_flight,
+        }
+
+    def print_metrics(self) -> None:
+        m = self.metrics()
+        print(f"[INFO] Planificador '{m['backend']}': {m['ok']} llamadas ok, {m['errors']} errores "
+              f"({m['error_rate']:.1%}), {m['calls_per_s']} llamadas/s, latencia media "
+              f"{m['avg_latency_s']}s, concurrencia {m['limit']} (pico {m['peak_limit']})")
+
+
+_SCHEDULERS: dict[str, TranslationScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+def get_scheduler(name: str = "google") -> TranslationScheduler:
+    """Planificador compartido del backend (se crea la primera vez que se pide)."""
+    with _SCHEDULERS_LOCK:
+        if name not in _SCHEDULERS:
+            _SCHEDULERS[name] = TranslationScheduler(name)
+        return _SCHEDULERS[name]
+
+def print_all_metrics() -> None:
+    """Métricas de todos los planificadores usados en este proceso."""
+    with _SCHEDULERS_LOCK:
+        schedulers = list(_SCHEDULERS.values())
+    for sched in schedulers:
+        sched.print_metrics()
+
+def pool_map(fn, items, max_workers: int, adaptive: bool = True, name: str = "google"):
+    """
+    Resultados de fn sobre items, en orden. Con adaptive usa el pool compartido del backend
+    (la concurrencia real la fija run()); si no, un pool fijo de max_workers hilos como antes.
+    """
+    if adaptive:
+        yield from get_scheduler(name).map(fn, items)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        yield from ex.map(fn, items)